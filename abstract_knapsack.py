@@ -1,32 +1,83 @@
 from abc import ABCMeta, abstractmethod
+from typing import Generator, Iterator, Union
 
 import pandas as pd
 
+from estatisticas_knapsack import EstatisticasSolver
+from instancia_knapsack import InstanciaKnapsack, SolucaoKnapsack
+
 
 class AbstractKnapsackSolver(metaclass=ABCMeta):
     """
     Classe abstrata que descreve um algoritmo *solver* para o Problema da Mochila Binária (0-1 Knapsack Problem).
+
+    As estatísticas da última execução (tempos das fases e contadores próprios de cada algoritmo) ficam disponíveis no
+    atributo `estatisticas`.
     """
 
-    def __init__(self, valor_disponivel: float, itens: pd.DataFrame):
+    def __init__(self, valor_disponivel: float, itens: Union[pd.DataFrame, InstanciaKnapsack]):
         """
         Método construtor.
 
         :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
-        :param itens: Itens que serão avaliados para compor o orçamento.
+        :param itens: Itens que serão avaliados para compor o orçamento. Pode ser um DataFrame do Pandas, que será
+            compilado em uma instância, ou uma instância já compilada, que será compartilhada sem cópia.
         """
         self.valor_disponivel = valor_disponivel
-        self.itens = itens.copy()
+        if isinstance(itens, InstanciaKnapsack):
+            self.instancia = itens
+        else:
+            self.instancia = InstanciaKnapsack.de_dataframe(itens)
+        self.estatisticas = EstatisticasSolver()
+        """
+        Estatísticas da última execução do *solver*.
+        """
+
+    def adicionar_gancho(self, gancho):
+        """
+        Registra um gancho (*hook*) de instrumentação, chamado a cada evento da execução (veja `EstatisticasSolver`).
+
+        :param gancho: Função chamada com o nome do evento e o dicionário de dados do evento.
+        """
+        self.estatisticas.adicionar_gancho(gancho)
 
     @abstractmethod
     def __str__(self) -> str:
         pass
 
     @abstractmethod
-    def solucionar(self) -> pd.DataFrame:
+    def solucionar(self) -> SolucaoKnapsack:
         """
         Implementa o algoritmo que soluciona o Problema da Mochila Binária (0-1 Knapsack Problem).
 
-        :return: DataFrame do Pandas contendo os itens marcados ou não para compor o orçamento.
+        :return: Solução contendo os itens selecionados para compor o orçamento. O DataFrame do Pandas com os itens
+            marcados ou não (coluna "proporcao") é obtido através do atributo `itens` da solução.
         """
         pass
+
+    def solucionar_iterativo(self, **kwargs) -> Iterator[SolucaoKnapsack]:
+        """
+        Soluciona o problema produzindo cada nova melhor solução (incumbente) assim que encontrada, com o limitante
+        superior conhecido no momento (atributos `limitante_superior`, `gap` e `gap_relativo` da solução). A última
+        solução produzida é a solução final. O consumidor pode interromper a iteração a qualquer momento.
+
+        A implementação padrão produz apenas a solução final de `solucionar`.
+
+        :param kwargs: Parâmetros do método `solucionar` do *solver*.
+        :return: Iterador das soluções encontradas, em ordem crescente de importância.
+        """
+        yield self.solucionar(**kwargs)
+
+    @staticmethod
+    def _esgotar(gerador: Generator):
+        """
+        Consome um gerador até o fim, descartando os valores produzidos.
+
+        :param gerador: Gerador a ser consumido.
+        :return: Valor retornado pelo gerador.
+        """
+        while True:
+            try:
+                next(gerador)
+            except StopIteration as fim:
+                return fim.value
@@ -1,11 +1,19 @@
 """Classes base para os algoritmos aproximados."""
 
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from typing import Generator, Iterator
 
-import pandas as pd
+import numpy as np
 
 from abstract_knapsack import AbstractKnapsackSolver
+from instancia_knapsack import InstanciaKnapsack, SolucaoKnapsack
+from paralelismo_knapsack import IncumbenteCompartilhado, InstanciaCompartilhada
+
+# Estado de cada processo auxiliar da Busca Tabu paralela, preenchido uma única vez na inicialização do processo.
+_estado_processo = {}
 
 
 class GreedyKnapsackSolver(AbstractKnapsackSolver):
@@ -14,49 +22,249 @@ class GreedyKnapsackSolver(AbstractKnapsackSolver):
     uma heurística construtiva.
     """
 
-    # Sobrescrita do método construtor para que haja a ordenação dos itens orçamentários.
-    def __init__(self, valor_disponivel, itens):
+    def __str__(self):
+        return "Algoritmo Guloso"
+
+    def solucionar(self, fracional=False) -> SolucaoKnapsack:
         """
-        Método construtor.
+        Implementa o algoritmo que soluciona o Problema da Mochila Binária (0-1 Knapsack Problem).
 
-        :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
-        :param itens: Itens que serão avaliados para compor o orçamento.
+        Se a instância ainda não foi ordenada pela razão importância/valor, o item crítico e os itens anteriores a ele
+        são encontrados por seleção parcial, em tempo linear esperado, sem ordenar todos os itens (veja
+        `InstanciaKnapsack.particao_critica`). Na variante binária, apenas os itens seguintes ao item crítico que
+        ainda cabem no valor restante são ordenados.
+
+        :param fracional: Indica se deverá incluir fração para o item, que se somado, seu valor extrapolará o valor
+         disponível.
+        :return: Solução contendo os itens selecionados para compor o orçamento, com o limitante de Dantzig como
+            limitante superior.
         """
-        super().__init__(valor_disponivel, itens)
-        # O algoritmo guloso pressupõe a ordenação decrescente da razão importância/valor.
-        self.itens = itens.sort_values(by="importancia_por_valor", ascending=False)
+        if self.instancia.ordenada:
+            solucao = self.solucionar_lote([self.valor_disponivel], fracional)[0]
+            limitante = self.instancia.limitante_dantzig(self.valor_disponivel)
+        else:
+            solucao, limitante = self._solucionar_particao(fracional)
 
-    def __str__(self):
-        return "Algoritmo Guloso"
+        return self.estatisticas.concluir(solucao.certificar(limitante))
 
-    def solucionar(self, fracional=False) -> pd.DataFrame:
+    def _solucionar_particao(self, fracional: bool) -> tuple:
         """
-        Implementa o algoritmo que soluciona o Problema da Mochila Binária (0-1 Knapsack Problem).
+        Soluciona o problema a partir da partição dos itens pelo item crítico, sem a ordenação completa dos itens.
+
+        :return: Solução e limitante de Dantzig.
+        """
+        instancia = self.instancia
+        estatisticas = self.estatisticas
+        estatisticas.reiniciar()
+        with estatisticas.fase("preparacao"):
+            incluidos, critico, restante, limitante = instancia.particao_critica(self.valor_disponivel)
+
+        with estatisticas.fase("busca"):
+            selecionados, item_fracionado, fracao = incluidos, -1, 0.0
+            if fracional:
+                if critico > -1 and restante > 0:
+                    item_fracionado, fracao = critico, restante / instancia.valor[critico]
+            elif critico > -1:
+                # Apenas os itens seguintes ao item crítico que cabem no valor restante podem ser incluídos. Eles são
+                # ordenados (de forma estável, como na ordenação completa) e percorridos em blocos.
+                seguintes = instancia.valor <= restante
+                seguintes[incluidos] = False
+                seguintes[critico] = False
+                posicoes = np.flatnonzero(seguintes)
+                ordem = posicoes[np.argsort(-instancia.importancia_por_valor[posicoes], kind="stable")]
+                valores_ordenados = instancia.valor[ordem]
+                acumulado = np.zeros(len(ordem) + 1)
+                np.cumsum(valores_ordenados, out=acumulado[1:])
+                minimo_sufixo = np.minimum.accumulate(valores_ordenados[::-1])[::-1]
+                blocos = [incluidos] + [ordem[primeiro:fim] for primeiro, fim in
+                                        self._completar(valores_ordenados, acumulado, minimo_sufixo, 0, restante)]
+                selecionados = np.concatenate(blocos)
+        with estatisticas.fase("materializacao"):
+            solucao = SolucaoKnapsack(instancia, selecionados, item_fracionado, fracao)
+        estatisticas.registrar("capacidades", 1)
+        estatisticas.registrar("tempo_total", estatisticas.tempo_decorrido)
+
+        return solucao, limitante
+
+    @staticmethod
+    def _completar(valores_ordenados: np.ndarray, acumulado: np.ndarray, minimo_sufixo: np.ndarray, inicio: int,
+                   restante: float) -> list:
+        """
+        Percorre os itens de uma ordem a partir da posição inicial, incluindo os que ainda couberem no valor restante.
+
+        :param valores_ordenados: Valores dos itens na ordem.
+        :param acumulado: Soma acumulada dos valores na ordem, com uma posição a mais (a posição k contém a soma dos
+            k primeiros valores).
+        :param minimo_sufixo: Menor valor entre os itens a partir de cada posição da ordem.
+        :param inicio: Posição da ordem a partir da qual os itens são percorridos.
+        :param restante: Valor restante.
+        :return: Lista de blocos incluídos, cada um um par com a primeira e a posição seguinte à última da ordem.
+        """
+        blocos = []
+        n = len(valores_ordenados)
+        while inicio < n and minimo_sufixo[inicio] <= restante:
+            # Primeiro item, a partir do início, cujo valor ainda cabe no valor restante. Os itens anteriores a ele
+            # são descartados, tal como no percurso item a item.
+            primeiro = inicio + int(np.argmax(valores_ordenados[inicio:] <= restante))
+            # Todos os itens seguintes cuja soma acumulada caiba no valor restante formam um novo bloco.
+            fim = int(np.searchsorted(acumulado, acumulado[primeiro] + restante, side="right")) - 1
+            fim = max(fim, primeiro + 1)
+            blocos.append((primeiro, fim))
+            restante -= acumulado[fim] - acumulado[primeiro]
+            inicio = fim + 1
+
+        return blocos
+
+    def solucionar_lote(self, valores_disponiveis, fracional=False) -> list:
+        """
+        Soluciona o problema para vários valores disponíveis (capacidades da mochila) a partir de uma única ordenação
+        dos itens pela razão importância/valor.
+
+        Os itens são percorridos em blocos: a soma acumulada dos valores, combinada com busca binária, encontra de uma
+        só vez todos os itens que cabem até o item crítico (o primeiro que não cabe). Na variante binária, a busca
+        continua a partir do primeiro item seguinte que ainda caiba no valor restante.
 
+        :param valores_disponiveis: Valores do orçamento disponível para distribuição (capacidades da mochila).
         :param fracional: Indica se deverá incluir fração para o item, que se somado, seu valor extrapolará o valor
          disponível.
-        :return: itens: DataFrame do Pandas contendo os itens marcados ou não para compor o orçamento.
-        """
-        valor_disponivel_restante = self.valor_disponivel
-
-        # Interação sobre todos os itens orçamentários.
-        for indice, item in self.itens.iterrows():
-            # Se o valor (peso) do item não ultrapassar o valor disponível restante (capacidade da mochila restante)
-            # marca o item como selecionado (proporção = 1).
-            if item.valor <= valor_disponivel_restante:
-                valor_disponivel_restante -= item.valor
-                self.itens.at[indice, "proporcao"] = 1
-            else:
-                # Se o algoritmo guloso admitir fracionamento, adiciona a proporção do primeiro item cujo valor (peso)
-                # ultrapassar o valor disponível (capacidade) do orçamento (mochila).
-                if fracional:
-                    self.itens.at[indice, "proporcao"] = valor_disponivel_restante / item.valor
-                    break
+        :return: Lista de soluções, na mesma ordem dos valores disponíveis informados.
+        """
+        estatisticas = self.estatisticas
+        estatisticas.reiniciar()
+        with estatisticas.fase("preparacao"):
+            # A ordenação pela razão e as somas acumuladas são calculadas uma única vez por instância.
+            _ = self.instancia.valor_acumulado
+        with estatisticas.fase("busca"):
+            selecoes = self._solucionar_lote(valores_disponiveis, fracional)
+        with estatisticas.fase("materializacao"):
+            solucoes = [SolucaoKnapsack(self.instancia, *selecao) for selecao in selecoes]
+        estatisticas.registrar("capacidades", len(solucoes))
+        estatisticas.registrar("tempo_total", estatisticas.tempo_decorrido)
+
+        return solucoes
+
+    def _solucionar_lote(self, valores_disponiveis, fracional: bool) -> list:
+        """
+        :return: Lista com os itens selecionados, o item fracionado e a fração de cada valor disponível.
+        """
+        instancia = self.instancia
+        ordem = instancia.ordem
+        acumulado = instancia.valor_acumulado
+        valores_ordenados = instancia.valor[ordem]
+        n = len(ordem)
+        valores_disponiveis = np.atleast_1d(np.asarray(valores_disponiveis, dtype=np.float64))
+
+        # Quantidade de itens da ordem que cabem integralmente antes do item crítico, para todas as capacidades.
+        criticos = np.maximum(np.searchsorted(acumulado, valores_disponiveis, side="right") - 1, 0)
+        restantes = valores_disponiveis - acumulado[criticos]
+
+        if fracional:
+            solucoes = []
+            for critico, restante in zip(criticos.tolist(), restantes.tolist()):
+                # Adiciona a proporção do primeiro item cujo valor (peso) ultrapassar o valor disponível (capacidade)
+                # do orçamento (mochila).
+                if critico < n and restante > 0:
+                    solucoes.append((ordem[:critico], int(ordem[critico]), restante / valores_ordenados[critico]))
+                else:
+                    solucoes.append((ordem[:critico], -1, 0.0))
+            return solucoes
+
+        # Menor valor entre os itens a partir de cada posição da ordem. Se for maior que o valor restante, nenhum
+        # item seguinte cabe e a busca termina.
+        minimo_sufixo = np.minimum.accumulate(valores_ordenados[::-1])[::-1]
+
+        solucoes = []
+        for critico, restante in zip(criticos.tolist(), restantes.tolist()):
+            blocos = [ordem[:critico]] + [ordem[primeiro:fim] for primeiro, fim in
+                                          self._completar(valores_ordenados, acumulado, minimo_sufixo, critico + 1,
+                                                          restante)]
+            solucoes.append((np.concatenate(blocos), -1, 0.0))
+
+        return solucoes
 
-        # Reordena o dataset para a ordem original.
-        self.itens.sort_index(inplace=True)
 
-        return self.itens
+class FPTASKnapsackSolver(AbstractKnapsackSolver):
+    """
+    Classe que implementa a solução de um Problema da Mochila Binária (0-1 Knapsack Problem) por um esquema de
+    aproximação totalmente polinomial (FPTAS, *fully polynomial-time approximation scheme*) baseado na redução da escala
+    das importâncias.
+
+    As importâncias são divididas pelo fator de escala K = epsilon x LB / m e arredondadas para baixo, em que LB é um
+    limitante inferior da importância ótima (a maior entre a da solução gulosa e a do melhor item isolado) e m é a
+    maior quantidade de itens que cabem juntos no valor disponível. O problema com as importâncias reduzidas, inteiras,
+    é solucionado de forma exata pela Programação Dinâmica Adaptativa indexada pela importância, cuja tabela tem no
+    máximo (limitante de Dantzig / K) + 1 <= 2m / epsilon + 1 posições, o que resulta em tempo O(n x m / epsilon),
+    polinomial em n e em 1 / epsilon. Como cada item da solução ótima perde menos de K no arredondamento, a solução
+    obtida tem importância de pelo menos OPT - m x K >= (1 - epsilon) x OPT.
+    """
+
+    def __str__(self):
+        return "Esquema de Aproximação Totalmente Polinomial"
+
+    def solucionar(self, epsilon: float = 0.1, casas_decimais: int = 2, modo: str = None,
+                   limite_memoria: int = 256 * 2 ** 20) -> SolucaoKnapsack:
+        """
+        Implementa o algoritmo que soluciona o Problema da Mochila Binária (0-1 Knapsack Problem).
+
+        :param epsilon: Erro relativo máximo, entre 0 e 1 (exclusive): a importância da solução é de pelo menos
+            (1 - epsilon) vezes a ótima. Quanto menor, maiores a tabela e o tempo de execução.
+        :param casas_decimais: Quantidade de casas decimais consideradas nos valores. Padrão de 2 (centavos).
+        :param modo: Modo de reconstrução da solução da Programação Dinâmica Adaptativa (MODO_TABELA ou
+            MODO_DIVISAO). Se não informado, é escolhido conforme o limite de memória.
+        :param limite_memoria: Limite de memória, em bytes, para a tabela e a matriz de decisões. Padrão de 256 MiB.
+        :return: Solução contendo os itens selecionados para compor o orçamento, com o limitante superior garantido: o
+            menor entre o limitante de Dantzig e K x (q + m), em que q é a importância reduzida da solução. Com
+            importâncias inteiras e K <= 1, a escala não é reduzida e a solução é ótima.
+        :raises ValueError: Se o epsilon não estiver entre 0 e 1.
+        :raises MemoryError: Se a tabela não couber no limite de memória em nenhum dos modos.
+        """
+        if not 0 < epsilon < 1:
+            raise ValueError("O epsilon deve estar entre 0 e 1 (exclusive).")
+        # A Programação Dinâmica Adaptativa depende dos algoritmos aproximados e, por isso, é importada apenas quando
+        # utilizada.
+        from algoritmos_exatos import AdaptiveDynamicProgrammingKnapsackSolver
+
+        instancia = self.instancia
+        estatisticas = self.estatisticas
+        estatisticas.reiniciar()
+        with estatisticas.fase("preparacao"):
+            solucao_gulosa = GreedyKnapsackSolver(self.valor_disponivel, instancia).solucionar()
+            # Apenas itens com importância positiva que cabem sozinhos podem compor a solução ótima.
+            uteis = (instancia.importancia > 0) & (instancia.valor <= self.valor_disponivel)
+            limitante_inferior = max(solucao_gulosa.importancia, float(instancia.importancia[uteis].max(initial=0)))
+            # A maior quantidade de itens que cabem juntos é a dos itens de menor valor.
+            cardinalidade = int(np.searchsorted(np.cumsum(np.sort(instancia.valor[uteis])), self.valor_disponivel,
+                                                side="right"))
+            escala = 1.0
+            if limitante_inferior > 0 and cardinalidade > 0:
+                escala = epsilon * limitante_inferior / cardinalidade
+            exata = escala <= 1 and bool(np.all(np.mod(instancia.importancia, 1) == 0))
+            if exata:
+                escala = 1.0
+            reduzida = InstanciaKnapsack(np.floor(np.maximum(instancia.importancia, 0) / escala), instancia.valor)
+        estatisticas.registrar("epsilon", epsilon)
+        estatisticas.registrar("escala", escala)
+        estatisticas.registrar("cardinalidade_maxima", cardinalidade)
+
+        programacao_dinamica = AdaptiveDynamicProgrammingKnapsackSolver(self.valor_disponivel, reduzida)
+        with estatisticas.fase("busca"):
+            solucao_reduzida = programacao_dinamica.solucionar(programacao_dinamica.DIMENSAO_IMPORTANCIA,
+                                                               casas_decimais, modo, limite_memoria)
+        for nome in ("modo", "celulas_tabela", "bytes_decisoes"):
+            if nome in programacao_dinamica.estatisticas.contadores:
+                estatisticas.registrar(nome, programacao_dinamica.estatisticas.contadores[nome])
+
+        with estatisticas.fase("materializacao"):
+            solucao = SolucaoKnapsack(instancia, solucao_reduzida.selecionados)
+            limitante_superior = None
+            if not exata:
+                limitante_superior = min(solucao_gulosa.limitante_superior,
+                                         escala * (solucao_reduzida.importancia + cardinalidade))
+            # A solução gulosa, também viável, é retornada se for melhor.
+            if solucao_gulosa.importancia > solucao.importancia:
+                solucao = SolucaoKnapsack(instancia, solucao_gulosa.selecionados)
+
+        return estatisticas.concluir(solucao.certificar(limitante_superior))
 
 
 class TabuSearchKnapsackSolver(AbstractKnapsackSolver):
@@ -68,133 +276,378 @@ class TabuSearchKnapsackSolver(AbstractKnapsackSolver):
     def __str__(self):
         return "Busca Tabu"
 
-    def _fitness(self, solucao: list) -> int:
+    def _fitness(self, solucao: np.ndarray) -> float:
         """
         Método que implementa a função objetivo de determinada solução.
 
-        :param solucao: Lista contendo os itens de determinada solução. Os itens escolhidos estão marcados como 1 e os
+        :param solucao: Vetor contendo os itens de determinada solução. Os itens escolhidos estão marcados como 1 e os
             não escolhidos como 0.
         :return: O valor da importância máxima obtida pelo somatório das importâncias da solução. Caso o valor da
             solução ultrapasse o valor orçamentário disponível, retorna -1.
         """
-        importancia_maxima = 0
-        valor_maximo = 0
-        # Para cada item, verifica se está marcado como selecionado (igual a 1) e se cabe dentro do limite de valor
-        # disponível. Se couber, atualiza a importância máxima e o valor máximo da solução em análise.
-        for indice, item in self.itens.iterrows():
-            if solucao[indice] == 1 and self.valor_disponivel - valor_maximo >= 0:
-                importancia_maxima += item.importancia
-                valor_maximo += item.valor
+        # Se o valor somado dos itens marcados for maior que o valor disponível, retorna -1 indicando que a solução
+        # não é viável e deve ser ignorada.
+        if float(np.dot(solucao, self.instancia.valor)) > self.valor_disponivel:
+            return -1
 
-        # Se, ao fim do loop, o valor máximo for maior que o valor disponível, retorna -1 indicando que a solução não
-        # é viável e deve ser ignorada.
-        if self.valor_disponivel - valor_maximo < 0:
-            importancia_maxima = -1
+        return float(np.dot(solucao, self.instancia.importancia))
 
-        return importancia_maxima
+    def _reparar(self, solucao: np.ndarray) -> np.ndarray:
+        """
+        Torna viável uma solução cujo valor ultrapassa o valor disponível, retirando os itens selecionados de menor
+        razão importância/valor até que a solução caiba no orçamento.
 
-    def _busca_tabu(self, solucao_inicial: list, timeout: int, prazo_tabu: int, verbose: bool) -> pd.DataFrame:
+        :param solucao: Vetor de bytes com a solução, alterado no próprio vetor.
+        :return: O próprio vetor da solução.
         """
-        Método que implementa o algoritmo de Busca Tabu a partir de uma solução inicial.
+        excesso = float(np.dot(solucao, self.instancia.valor)) - self.valor_disponivel
+        if excesso > 0:
+            selecionados = np.flatnonzero(solucao)
+            selecionados = selecionados[np.argsort(self.instancia.importancia_por_valor[selecionados], kind="stable")]
+            retirados = int(np.searchsorted(np.cumsum(self.instancia.valor[selecionados]), excesso)) + 1
+            solucao[selecionados[:retirados]] = 0
+
+        return solucao
+
+    def _perturbar(self, solucao: np.ndarray, perturbacao: float, gerador: np.random.Generator) -> np.ndarray:
+        """
+        Gera uma nova solução viável invertendo aleatoriamente uma fração dos itens de uma solução.
+
+        :param solucao: Vetor de bytes com a solução de partida (não é alterado).
+        :param perturbacao: Fração dos itens que serão invertidos.
+        :param gerador: Gerador de números aleatórios.
+        :return: Vetor de bytes com a solução perturbada e viável.
+        """
+        solucao = np.array(solucao, dtype=np.uint8)
+        quantidade = int(round(perturbacao * len(solucao)))
+        if quantidade > 0:
+            solucao[gerador.choice(len(solucao), size=quantidade, replace=False)] ^= 1
+
+        return self._reparar(solucao)
+
+    def _iterar_busca_tabu(self, solucao_inicial: np.ndarray, timeout: int, prazo_tabu: int, verbose: bool,
+                           max_iteracoes: int = None, max_iteracoes_sem_melhora: int = None) -> Generator:
+        """
+        Método que implementa o algoritmo de Busca Tabu a partir de uma solução inicial. É um gerador que, a cada nova
+        melhor solução, produz sua importância e o vetor da melhor solução (reutilizado pela busca, que o altera nas
+        melhorias seguintes).
+
+        A vizinhança de uma solução é formada pelas n soluções obtidas com a inversão de um único item. Em vez de
+        recalcular a função objetivo de cada vizinho, a busca mantém os totais de valor e importância da solução
+        corrente e avalia todos os vizinhos de uma só vez com operações vetorizadas do NumPy.
+
+        A memória Tabu guarda, para cada item, a iteração até a qual sua inversão é proibida, de modo que a consulta é
+        O(1) qualquer que seja o prazo Tabu. Pelo critério de aspiração, um movimento Tabu é permitido se resultar em
+        solução melhor do que a melhor encontrada até o momento.
 
         :param solucao_inicial: Solução inicial que se quer melhorar com o algoritmo de Busca Tabu.
         :param timeout: Tempo de processamento que será gasto na busca de solução melhor em relação à inicial.
             Medido em segundos.
-        :param prazo_tabu: Tamanho da lista Tabu a ser utilizada na execução do algoritmo de Busca Tabu.
+        :param prazo_tabu: Quantidade de iterações durante as quais um item invertido permanece Tabu.
         :param verbose: Indica se deverá imprimir informações sobre as iterações em que as melhores soluções foram
             encontradas. Imprime o número da iteração e o timestamp.
-        :return: DataFrame do Pandas contendo os itens marcados ou não para compor o orçamento.
+        :param max_iteracoes: Quantidade máxima de iterações. Se não informada, a busca é limitada apenas pelo tempo.
+        :param max_iteracoes_sem_melhora: Quantidade máxima de iterações consecutivas sem melhora da melhor solução.
+            Se não informada, a busca não é interrompida por estagnação.
+        :return: Vetor de bytes com a melhor solução (valor de retorno do gerador).
         """
-        # Lista que guardará os índices Tabu, aqueles que não poderão figurar em possíveis soluções durante sua
-        # permanência na lista.
-        lista_tabu = []
+        importancias = self.instancia.importancia
+        valores = self.instancia.valor
+        # Iteração até a qual a inversão de cada item é Tabu (proibida). Um item é Tabu enquanto a iteração corrente
+        # não ultrapassar a sua marca.
+        tabu_ate = np.zeros(len(valores), dtype=np.int64)
         # Iteração corrente.
         iteracao = 0
         # Iteração onde foi encontrada a melhor solução.
         melhor_iteracao = 0
-        # Lista contendo a melhor solução de distribuição do orçamento pelos itens.
-        melhor_solucao = solucao_inicial.copy()
-        # Lista contendo a melhor solução dentro de uma iteração.
-        solucao_corrente = solucao_inicial.copy()
+        # Vetor de bytes contendo a solução corrente, a partir da qual a vizinhança é avaliada.
+        solucao_corrente = np.array(solucao_inicial, dtype=np.uint8)
+        # Vetor de bytes contendo a melhor solução de distribuição do orçamento pelos itens.
+        melhor_solucao = solucao_corrente.copy()
         # Importância máxima obtida da melhor solução até o momento.
         importancia_maxima = self._fitness(melhor_solucao)
+        # Totais de valor e importância da solução corrente, atualizados a cada movimento.
+        valor_corrente = float(np.dot(solucao_corrente, valores))
+        importancia_corrente = float(np.dot(solucao_corrente, importancias))
+        # Sentido da inversão de cada item: +1 se o item será incluído e -1 se será retirado da solução.
+        sentido = 1.0 - 2.0 * solucao_corrente
+        # Vetores reaproveitados a cada iteração para a avaliação da vizinhança.
+        valores_vizinhos = np.empty(len(valores))
+        importancias_vizinhas = np.empty(len(valores))
+        if len(valores) == 0:
+            return melhor_solucao
+
         tempo_inicio = time.time()
-        # Executa a busca enquanto o delta desde início for menor que o tempo configurado para o timeout.
+        # Executa a busca enquanto o delta desde início for menor que o tempo configurado para o timeout e enquanto não
+        # forem atingidos os limites de iterações e de iterações sem melhora, quando informados.
         while time.time() - tempo_inicio < timeout:
-            # A iteração acaba após serem testadas todas as soluções com índices invertidos das soluções parciais.
+            if max_iteracoes is not None and iteracao >= max_iteracoes:
+                break
+            if max_iteracoes_sem_melhora is not None and iteracao - melhor_iteracao >= max_iteracoes_sem_melhora:
+                break
             iteracao += 1
-            # Inicia a lista da solução parcial com a melhor solução corrente.
-            solucao_parcial = solucao_corrente.copy()
-            importancia_iteracao = -1
-            indice_tabu = -1
-            for indice in range(len(self.itens)):
-                # A solução parcial é a solução a ser testada e terá seus índices percorridos e invertidos (se era 1
-                # vira 0 e vice-versa).
-                if solucao_parcial[indice] == 1:
-                    solucao_parcial[indice] = 0
-                else:
-                    solucao_parcial[indice] = 1
-
-                # Calcula-se o valor da importância máxima obtida da solução parcial.
-                importancia_parcial = self._fitness(solucao_parcial)
-
-                # Se a importância da solução parcial for maior do que a maior importância obtida na iteração e
-                # se o índice trocado na solução parcial não estiver na lista Tabu, atualiza a solução corrente com a
-                # solução parcial e marca o índice trocado para inserção na lista Tabu.
-                if importancia_parcial > importancia_iteracao:
-                    importancia_iteracao = importancia_parcial
-                    if indice not in lista_tabu:
-                        solucao_corrente = solucao_parcial.copy()
-                        indice_tabu = indice
-                        # Se a importância da solução parcial for maior do que a melhor importância obtida até o
-                        # momento, adota e solução parcial como nova melhor solução e calcula a nova importância máxima.
-                        if importancia_parcial > importancia_maxima:
-                            melhor_solucao = solucao_parcial.copy()
-                            melhor_iteracao = iteracao
-                            if verbose:
-                                print("Melhor iteração:", melhor_iteracao)
-                                print("Data/Hora:", datetime.now())
-                            importancia_maxima = importancia_parcial
-
-                # Inverte a solução parcial ao estado anterior para análise do índice seguinte.
-                if solucao_parcial[indice] == 1:
-                    solucao_parcial[indice] = 0
-                else:
-                    solucao_parcial[indice] = 1
-
-            # Adiciona o índice com a melhor solução da iteração à lista Tabu.
-            if indice_tabu > -1:
-                # O prazo Tabu (Tabu tenure) está ajustado para o valor passado pelo parâmetro prazo_tabu. Após o
-                # tamanho máximo da lista Tabu, definido pelo prazo Tabu, ser atingido, o índice mais antigo
-                # (primeira posição) é retirado da lista.
-                if len(lista_tabu) == prazo_tabu:
-                    lista_tabu.pop(0)
-                # Insere o índice que compôs a melhor solução corrente na lista Tabu.
-                lista_tabu.append(indice_tabu)
-
-        # Atualiza o dataframe de itens para indicar os itens que foram selecionados (proporção = 1).
-        self.itens["proporcao"] = pd.Series(melhor_solucao)
+            # Valor e importância de todas as soluções vizinhas (cada uma com um único índice invertido). Vizinhos
+            # cujo valor ultrapassa o valor disponível são inviáveis e recebem importância -1.
+            np.multiply(sentido, valores, out=valores_vizinhos)
+            valores_vizinhos += valor_corrente
+            np.multiply(sentido, importancias, out=importancias_vizinhas)
+            importancias_vizinhas += importancia_corrente
+            importancias_vizinhas[valores_vizinhos > self.valor_disponivel] = -np.inf
+
+            # Vizinhos cujo índice é Tabu são descartados, exceto se superarem a melhor solução (critério de
+            # aspiração). Dentre os admissíveis, é adotado o de maior importância, ainda que pior que a corrente.
+            admissiveis = tabu_ate < iteracao
+            admissiveis |= importancias_vizinhas > importancia_maxima
+            importancias_vizinhas[~admissiveis] = -np.inf
+            indice_tabu = int(np.argmax(importancias_vizinhas))
+            # Sem vizinho admissível e viável, a solução corrente é mantida até que algum item deixe de ser Tabu.
+            if importancias_vizinhas[indice_tabu] == -np.inf:
+                continue
+
+            # Atualiza a solução corrente e seus totais com a inversão do índice escolhido.
+            valor_corrente = float(valores_vizinhos[indice_tabu])
+            importancia_corrente = float(importancias_vizinhas[indice_tabu])
+            solucao_corrente[indice_tabu] ^= 1
+            sentido[indice_tabu] = -sentido[indice_tabu]
+
+            # Se a importância da solução corrente for maior do que a melhor importância obtida até o momento, adota a
+            # solução corrente como nova melhor solução e atualiza a importância máxima.
+            if importancia_corrente > importancia_maxima:
+                melhor_solucao[:] = solucao_corrente
+                melhor_iteracao = iteracao
+                if verbose:
+                    print("Melhor iteração:", melhor_iteracao)
+                    print("Data/Hora:", datetime.now())
+                importancia_maxima = importancia_corrente
+                self.estatisticas.melhoria(importancia_maxima)
+                yield importancia_maxima, melhor_solucao
+
+            # O prazo Tabu (Tabu tenure) está ajustado para o valor passado pelo parâmetro prazo_tabu: o índice
+            # invertido permanece Tabu durante as próximas prazo_tabu iterações.
+            tabu_ate[indice_tabu] = iteracao + prazo_tabu
+
+        # Cada iteração avalia os n vizinhos da solução corrente.
+        duracao = time.time() - tempo_inicio
+        self.estatisticas.incrementar("iteracoes", iteracao)
+        self.estatisticas.incrementar("avaliacoes_movimentos", iteracao * len(valores))
+        self.estatisticas.registrar("iteracoes_por_segundo", iteracao / duracao if duracao > 0 else 0.0)
+        self.estatisticas.registrar("melhor_iteracao", melhor_iteracao)
+
+        return melhor_solucao
+
+    def _busca_tabu(self, solucao_inicial: np.ndarray, timeout: int, prazo_tabu: int, verbose: bool,
+                    max_iteracoes: int = None, max_iteracoes_sem_melhora: int = None) -> SolucaoKnapsack:
+        """
+        Executa a Busca Tabu a partir de uma solução inicial até o fim (veja `_iterar_busca_tabu`).
 
-        return self.itens
+        :return: Solução contendo os itens selecionados para compor o orçamento.
+        """
+        melhor_solucao = self._esgotar(self._iterar_busca_tabu(solucao_inicial, timeout, prazo_tabu, verbose,
+                                                               max_iteracoes, max_iteracoes_sem_melhora))
+        with self.estatisticas.fase("materializacao"):
+            # Retorna a solução com os itens que foram selecionados (proporção = 1).
+            return SolucaoKnapsack(self.instancia, np.flatnonzero(melhor_solucao))
 
     def solucionar(self, timeout: int = 60, prazo_tabu: int = 3, utilizar_solucao_algoritmo_guloso: bool = True,
-                   verbose: bool = False) -> pd.DataFrame:
+                   verbose: bool = False, max_iteracoes: int = None,
+                   max_iteracoes_sem_melhora: int = None) -> SolucaoKnapsack:
         """
         Implementa o algoritmo que soluciona o Problema da Mochila Binária (0-1 Knapsack Problem).
 
         :param timeout: Tempo de execução total do algoritmo em segundos. Padrão de 60 segundos.
-        :param prazo_tabu: Tamanho da lista Tabu a ser utilizada na execução do algoritmo de Busca Tabu.
+        :param prazo_tabu: Quantidade de iterações durante as quais um item invertido permanece Tabu (Tabu tenure).
+            Como a consulta à memória Tabu é O(1), prazos longos não encarecem as iterações.
         :param utilizar_solucao_algoritmo_guloso: Indica se o algoritmo de Busca Tabu deverá utilizar a solução
             encontrada com a execução prévia do algoritmo guloso.
         :param verbose: Indica se deverá imprimir informações sobre as iterações em que as melhores soluções foram
             encotradas. Imprime o número da iteração e o timestamp.
-        :return: DataFrame do Pandas contendo os itens marcados ou não para compor o orçamento.
+        :param max_iteracoes: Quantidade máxima de iterações. Se não informada, a busca é limitada apenas pelo tempo.
+        :param max_iteracoes_sem_melhora: Encerra a busca após essa quantidade de iterações consecutivas sem melhora
+            da melhor solução. Se não informada, a busca não é interrompida por estagnação.
+        :return: Solução contendo os itens selecionados para compor o orçamento, com o limitante de Dantzig como
+            limitante superior.
+        """
+        return self._esgotar(self._executar(timeout, prazo_tabu, utilizar_solucao_algoritmo_guloso, verbose,
+                                            max_iteracoes, max_iteracoes_sem_melhora))
+
+    def solucionar_iterativo(self, timeout: int = 60, prazo_tabu: int = 3,
+                             utilizar_solucao_algoritmo_guloso: bool = True, verbose: bool = False,
+                             max_iteracoes: int = None,
+                             max_iteracoes_sem_melhora: int = None) -> Iterator[SolucaoKnapsack]:
+        """
+        Soluciona o problema produzindo a solução inicial e cada nova melhor solução da Busca Tabu assim que
+        encontrada. Como a Busca Tabu não comprova otimalidade, o limitante superior de todas as soluções é o
+        limitante de Dantzig (relaxação linear) do problema. A última solução produzida é a solução final.
+
+        Os parâmetros são os mesmos do método `solucionar`.
+
+        :return: Iterador das soluções encontradas, em ordem crescente de importância.
+        """
+        execucao = self._executar(timeout, prazo_tabu, utilizar_solucao_algoritmo_guloso, verbose, max_iteracoes,
+                                  max_iteracoes_sem_melhora)
+        while True:
+            try:
+                melhor_solucao, limitante_superior = next(execucao)
+            except StopIteration as fim:
+                yield fim.value
+                return
+            yield SolucaoKnapsack(self.instancia, np.flatnonzero(melhor_solucao)).certificar(limitante_superior)
+
+    def _executar(self, timeout: int, prazo_tabu: int, utilizar_solucao_algoritmo_guloso: bool, verbose: bool,
+                  max_iteracoes: int, max_iteracoes_sem_melhora: int) -> Generator:
         """
+        Executa a Busca Tabu, com as estatísticas, produzindo o vetor de cada nova melhor solução (a começar pela
+        inicial) e o limitante de Dantzig do problema.
+
+        :return: Solução final, certificada pelo limitante de Dantzig (valor de retorno do gerador).
+        """
+        self.estatisticas.reiniciar()
+        with self.estatisticas.fase("preparacao"):
+            solucao_inicial = self._solucao_inicial(utilizar_solucao_algoritmo_guloso)
+            limitante_superior = self.instancia.limitante_dantzig(self.valor_disponivel)
+        if self._fitness(solucao_inicial) >= 0:
+            yield solucao_inicial, limitante_superior
+
+        with self.estatisticas.fase("busca"):
+            busca = self._iterar_busca_tabu(solucao_inicial, timeout, prazo_tabu, verbose, max_iteracoes,
+                                            max_iteracoes_sem_melhora)
+            while True:
+                try:
+                    _, melhor_solucao = next(busca)
+                except StopIteration as fim:
+                    melhor_solucao = fim.value
+                    break
+                yield melhor_solucao, limitante_superior
+        with self.estatisticas.fase("materializacao"):
+            # Retorna a solução com os itens que foram selecionados (proporção = 1).
+            solucao = SolucaoKnapsack(self.instancia, np.flatnonzero(melhor_solucao))
+
+        return self.estatisticas.concluir(solucao.certificar(limitante_superior))
+
+    def _solucao_inicial(self, utilizar_solucao_algoritmo_guloso: bool) -> np.ndarray:
+        """
+        Obtém a solução inicial da busca: a solução do algoritmo guloso ou a coluna "proporcao" dos itens.
+
+        :param utilizar_solucao_algoritmo_guloso: Indica se deverá ser utilizada a solução do algoritmo guloso.
+        :return: Vetor de bytes com a solução inicial.
+        """
+        # O algoritmo guloso compartilha a mesma instância compilada, sem cópia dos itens.
         if utilizar_solucao_algoritmo_guloso:
-            greedy_knapsack = GreedyKnapsackSolver(self.valor_disponivel, self.itens)
-            self.itens = greedy_knapsack.solucionar()
+            greedy_knapsack = GreedyKnapsackSolver(self.valor_disponivel, self.instancia)
+            solucao_inicial = greedy_knapsack.solucionar().vetor_binario()
+        else:
+            solucao_inicial = (self.instancia.proporcao == 1).astype(np.uint8)
 
-        solucao_inicial = self.itens.proporcao.tolist()
-        self.itens = self._busca_tabu(solucao_inicial, timeout, prazo_tabu, verbose)
+        return solucao_inicial
+
+    def solucionar_paralelo(self, timeout: int = 60, prazo_tabu: int = 3, utilizar_solucao_algoritmo_guloso: bool = True,
+                            trajetorias: int = None, processos: int = None, semente: int = None,
+                            perturbacao: float = 0.05, intervalo_publicacao: float = 1.0, prazos_tabu: list = None,
+                            max_iteracoes_sem_melhora: int = None) -> SolucaoKnapsack:
+        """
+        Executa várias trajetórias independentes de Busca Tabu (*multi-start*) em processos auxiliares.
 
-        return self.itens
+        Cada trajetória utiliza semente, solução inicial perturbada e prazo Tabu próprios. Os vetores da instância são
+        publicados uma única vez em memória compartilhada. A cada intervalo de publicação, as trajetórias publicam
+        sua melhor solução em um incumbente compartilhado e, se outra trajetória tiver encontrado solução melhor,
+        reiniciam a busca a partir de uma perturbação dessa solução.
+
+        :param timeout: Tempo de execução total do algoritmo em segundos. Padrão de 60 segundos.
+        :param prazo_tabu: Prazo Tabu base. Se prazos_tabu não for informado, a trajetória k utiliza o prazo
+            prazo_tabu * (k + 1).
+        :param utilizar_solucao_algoritmo_guloso: Indica se a solução inicial deverá ser a do algoritmo guloso.
+        :param trajetorias: Quantidade de trajetórias. Padrão igual à quantidade de processadores.
+        :param processos: Quantidade de processos auxiliares. Padrão igual à quantidade de trajetórias.
+        :param semente: Semente para geração das sementes de cada trajetória.
+        :param perturbacao: Fração dos itens invertidos nas soluções iniciais das trajetórias (exceto a primeira, que
+            parte da solução inicial sem perturbação) e nos reinícios a partir do incumbente.
+        :param intervalo_publicacao: Intervalo, em segundos, entre as publicações do incumbente.
+        :param prazos_tabu: Prazo Tabu de cada trajetória, utilizado de forma circular.
+        :param max_iteracoes_sem_melhora: Encerra cada ciclo da trajetória após essa quantidade de iterações sem
+            melhora. Os ciclos sem melhora são seguidos de um reinício a partir de uma perturbação da melhor solução
+            da trajetória, que só é encerrada pelo timeout.
+        :return: Solução contendo os itens selecionados para compor o orçamento, com o limitante de Dantzig como
+            limitante superior.
+        """
+        self.estatisticas.reiniciar()
+        if len(self.instancia) == 0:
+            # Sem itens, não há trajetória a executar: a solução vazia é ótima.
+            return self.estatisticas.concluir(SolucaoKnapsack(self.instancia, []).certificar())
+        trajetorias = trajetorias or os.cpu_count() or 1
+        if prazos_tabu is None:
+            # Prazos maiores que a quantidade de itens tornariam todos os movimentos Tabu.
+            prazos_tabu = [min(prazo_tabu * (k + 1), max(len(self.instancia) - 1, 1)) for k in range(trajetorias)]
+        sementes = np.random.SeedSequence(semente).spawn(trajetorias)
+        solucao_inicial = self._solucao_inicial(utilizar_solucao_algoritmo_guloso)
+
+        incumbente = IncumbenteCompartilhado(len(self.instancia))
+        incumbente.publicar(self._fitness(solucao_inicial), solucao_inicial)
+        with InstanciaCompartilhada(self.instancia) as instancia_compartilhada, self.estatisticas.fase("busca"):
+            with ProcessPoolExecutor(max_workers=processos or trajetorias, initializer=_inicializar_processo_tabu,
+                                     initargs=(instancia_compartilhada.descritor, incumbente)) as executor:
+                tarefas = [executor.submit(_executar_trajetoria_tabu, self.valor_disponivel, solucao_inicial,
+                                           sementes[k], prazos_tabu[k % len(prazos_tabu)],
+                                           perturbacao if k > 0 else 0.0, perturbacao, timeout,
+                                           intervalo_publicacao, max_iteracoes_sem_melhora)
+                           for k in range(trajetorias)]
+                for tarefa in tarefas:
+                    tarefa.result()
+
+        _, melhor_solucao, versao = incumbente.consultar()
+        self.estatisticas.registrar("trajetorias", trajetorias)
+        # A primeira versão do incumbente é a solução inicial; as demais são melhorias publicadas pelas trajetórias.
+        self.estatisticas.registrar("melhorias", versao - 1)
+
+        with self.estatisticas.fase("materializacao"):
+            solucao = SolucaoKnapsack(self.instancia, np.flatnonzero(melhor_solucao))
+
+        return self.estatisticas.concluir(solucao.certificar(self.instancia.limitante_dantzig(self.valor_disponivel)))
+
+
+def _inicializar_processo_tabu(descritor: tuple, incumbente: IncumbenteCompartilhado):
+    """
+    Inicializa um processo auxiliar da Busca Tabu paralela, anexando a instância compartilhada e o incumbente.
+    """
+    _estado_processo["instancia"], _estado_processo["memoria"] = InstanciaCompartilhada.anexar(descritor)
+    _estado_processo["incumbente"] = incumbente
+
+
+def _executar_trajetoria_tabu(valor_disponivel: float, solucao_inicial: np.ndarray, semente: np.random.SeedSequence,
+                              prazo_tabu: int, perturbacao_inicial: float, perturbacao: float, timeout: float,
+                              intervalo_publicacao: float, max_iteracoes_sem_melhora: int):
+    """
+    Executa, em um processo auxiliar, uma trajetória da Busca Tabu paralela em ciclos de duração igual ao intervalo de
+    publicação, publicando e consultando o incumbente compartilhado ao fim de cada ciclo.
+    """
+    incumbente = _estado_processo["incumbente"]
+    solver = TabuSearchKnapsackSolver(valor_disponivel, _estado_processo["instancia"])
+    gerador = np.random.default_rng(semente)
+
+    solucao = solver._perturbar(solucao_inicial, perturbacao_inicial, gerador)
+    melhor_importancia = solver._fitness(solucao)
+    melhor_solucao = solucao
+    tempo_inicio = time.time()
+    while (tempo_restante := timeout - (time.time() - tempo_inicio)) > 0:
+        duracao_ciclo = min(intervalo_publicacao, tempo_restante)
+        parcial = solver._busca_tabu(solucao, duracao_ciclo, prazo_tabu, False,
+                                     max_iteracoes_sem_melhora=max_iteracoes_sem_melhora)
+
+        melhorou = parcial.importancia > melhor_importancia
+        if melhorou:
+            melhor_importancia = parcial.importancia
+            melhor_solucao = parcial.vetor_binario()
+            incumbente.publicar(melhor_importancia, melhor_solucao)
+
+        importancia_global, solucao_global, _ = incumbente.consultar()
+        if importancia_global > melhor_importancia:
+            # Outra trajetória encontrou solução melhor: adota-a e reinicia a partir de uma perturbação dela.
+            melhor_importancia = importancia_global
+            melhor_solucao = solucao_global
+            solucao = solver._perturbar(solucao_global, perturbacao, gerador)
+        elif melhorou:
+            solucao = melhor_solucao
+        else:
+            # Sem melhora no ciclo, reiniciar da mesma solução repetiria a mesma trajetória (a escolha do movimento é
+            # determinística): a busca é diversificada por uma perturbação da melhor solução, com ao menos um item
+            # invertido.
+            solucao = solver._perturbar(melhor_solucao, max(perturbacao, 1 / len(melhor_solucao)), gerador)
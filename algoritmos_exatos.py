@@ -1,9 +1,22 @@
 """Classes base para os algoritmos exatos."""
 
-import pandas as pd
+import heapq
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Generator, Iterator
+
+import numpy as np
 from ortools.algorithms import pywrapknapsack_solver
 
 from abstract_knapsack import AbstractKnapsackSolver
+from algoritmos_aproximados import GreedyKnapsackSolver, TabuSearchKnapsackSolver
+from instancia_knapsack import InstanciaKnapsack, SolucaoKnapsack, FronteiraKnapsack
+from paralelismo_knapsack import DistribuicaoTrabalho, IncumbenteCompartilhado, InstanciaCompartilhada
+
+# Estado de cada processo auxiliar do Branch and Bound paralelo, preenchido uma única vez na inicialização do processo.
+_estado_processo = {}
 
 
 class DynamicProgrammingKnapsackSolver(AbstractKnapsackSolver):
@@ -16,312 +29,1762 @@ class DynamicProgrammingKnapsackSolver(AbstractKnapsackSolver):
     def __str__(self):
         return "Programação Dinâmica"
 
-    def solucionar(self):
-        # Cria uma cópia dos itens orçamentários para manipulação interna do método.
-        itens = self.itens.copy()
-
-        # Cria o solver com o parâmetro para programação dinâmica.
-        or_tools_solver = pywrapknapsack_solver.KnapsackSolver(
-            pywrapknapsack_solver.KnapsackSolver.
-            KNAPSACK_DYNAMIC_PROGRAMMING_SOLVER, 'KnapsackExample')
+    def solucionar(self) -> SolucaoKnapsack:
+        estatisticas = self.estatisticas
+        estatisticas.reiniciar()
+        with estatisticas.fase("preparacao"):
+            # Cria o solver com o parâmetro para programação dinâmica.
+            or_tools_solver = pywrapknapsack_solver.KnapsackSolver(
+                pywrapknapsack_solver.KnapsackSolver.
+                KNAPSACK_DYNAMIC_PROGRAMMING_SOLVER, 'KnapsackExample')
 
-        # Para que solver do OR-Tools funcione, é necessário que sejam passados valores sem casas decimais.
-        # Assim sendo, para incorporar os centavos aos cálculos, multiplicou-se o valor por 100.
-        itens["valor_multiplicado"] = itens.valor * 100
+            # Para que solver do OR-Tools funcione, é necessário que sejam passados valores sem casas decimais.
+            # Assim sendo, para incorporar os centavos aos cálculos, multiplicou-se o valor por 100.
+            valor_multiplicado = np.rint(self.instancia.valor * 100).astype(np.int64)
 
-        # Variáveis com os parametros aceitos pelo solver do OR-Tools
-        importancias = itens.importancia.tolist()  # Equivalente ao valor no problema da mochila.
-        valores = [itens.valor_multiplicado.tolist()]  # Equivalente ao peso no problema da mochila.
+            # Variáveis com os parametros aceitos pelo solver do OR-Tools
+            # Importância: valor no problema da mochila.
+            importancias = np.rint(self.instancia.importancia).astype(np.int64).tolist()
+            valores = [valor_multiplicado.tolist()]  # Equivalente ao peso no problema da mochila.
 
-        # O solver do OR-Tools implementa solução para o problema das mochilas múltiplas.
-        # Desta maneira, faz-se necessário passar uma lista de capacidades de mochilas que, para o estudo de caso,
-        # é apenas uma (valor de orçamento disponível para distribuição).
-        # Da mesma forma que os valores individuais foram multiplicados por 100, o valor disponível (capacidade) também
-        # precisa ser.
-        valores_disponiveis = [int(self.valor_disponivel * 100)]
+            # O solver do OR-Tools implementa solução para o problema das mochilas múltiplas.
+            # Desta maneira, faz-se necessário passar uma lista de capacidades de mochilas que, para o estudo de caso,
+            # é apenas uma (valor de orçamento disponível para distribuição).
+            # Da mesma forma que os valores individuais foram multiplicados por 100, o valor disponível (capacidade)
+            # também precisa ser.
+            valores_disponiveis = [int(self.valor_disponivel * 100)]
 
         # Inicia o solver com os parâmetros do problema e o executa. O método Solve retorna a solução ótima que não será
         # utilizada aqui dado que serão retornados os itens selecionados e suas importâncias e valores somados pelo
         # chamador do método.
-        or_tools_solver.Init(importancias, valores, valores_disponiveis)
-        or_tools_solver.Solve()
+        with estatisticas.fase("busca"):
+            or_tools_solver.Init(importancias, valores, valores_disponiveis)
+            or_tools_solver.Solve()
+        estatisticas.registrar("celulas_tabela", len(importancias) * (max(valores_disponiveis[0], 0) + 1))
 
-        # Verifica quais os índices selecionados e marca no dataset de retorno.
-        for i in range(len(importancias)):
-            if or_tools_solver.BestSolutionContains(i):
-                self.itens.at[i, "proporcao"] = 1
+        # Verifica quais os índices selecionados e os retorna na solução.
+        with estatisticas.fase("materializacao"):
+            selecionados = [i for i in range(len(importancias)) if or_tools_solver.BestSolutionContains(i)]
 
-        return self.itens
+        return estatisticas.concluir(SolucaoKnapsack(self.instancia, selecionados).certificar())
 
 
-class BranchAndBoundKnapsackSolver(AbstractKnapsackSolver):
+class EstadoProgramacaoDinamica:
     """
-    Classe que implementa a solução de um Problema da Mochila Binária (0-1 Knapsack Problem) utilizando algoritmo
-    Branch and Bound.
+    Classe que guarda a tabela da Programação Dinâmica Adaptativa entre execuções, para que uma nova execução sobre os
+    mesmos itens, com alterações a partir de uma posição, recalcule apenas as linhas dos itens alterados.
+
+    São guardadas a matriz de decisões compactada em bits de todos os itens processados e, a cada `intervalo` itens,
+    uma cópia da linha da tabela (ponto de controle), a partir da qual o cálculo é retomado.
     """
 
-    # Sobrescrita do método construtor para que haja a ordenação dos itens orçamentários.
-    def __init__(self, valor_disponivel, itens):
+    def __init__(self, dimensao: str, casas_decimais: int, divisor: int, capacidade: int, tamanho: int,
+                 intervalo: int):
         """
         Método construtor.
 
-        :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
-        :param itens: Itens que serão avaliados para compor o orçamento.
+        :param dimensao: Dimensão da tabela.
+        :param casas_decimais: Quantidade de casas decimais consideradas nos valores.
+        :param divisor: Divisor dos valores (em unidades da última casa decimal) com que a tabela foi calculada.
+        :param capacidade: Maior capacidade, em unidades reduzidas, atendida pela tabela.
+        :param tamanho: Quantidade de posições da tabela.
+        :param intervalo: Quantidade de itens entre dois pontos de controle.
+        """
+        self.dimensao = dimensao
+        self.casas_decimais = casas_decimais
+        self.divisor = divisor
+        self.capacidade = capacidade
+        self.tamanho = tamanho
+        self.intervalo = max(intervalo, 1)
+        self.quantidade = 0
+        """
+        Quantidade de itens já processados pela tabela.
+        """
+        self.tabela = None
+        """
+        Linha da tabela após o último item processado.
+        """
+        self.decisoes = np.zeros((0, (tamanho + 7) // 8), dtype=np.uint8)
+        self.pontos_controle = {}
+
+    def retomar(self, posicao: int, iniciar) -> int:
+        """
+        Descarta o que foi calculado a partir da posição informada e restaura a linha do último ponto de controle
+        anterior a ela.
+
+        :param posicao: Posição do primeiro item alterado.
+        :param iniciar: Função que cria a linha inicial da tabela (sem nenhum item).
+        :return: Posição do item a partir do qual o cálculo deve ser retomado.
         """
-        super().__init__(valor_disponivel, itens)
-        # O algoritmo Branch and Bound pressupõe a ordenação decrescente da razão importância/valor.
-        self.itens = itens.sort_values(by="importancia_por_valor", ascending=False)
+        inicio = min(posicao, self.quantidade) // self.intervalo * self.intervalo
+        while inicio > 0 and inicio not in self.pontos_controle:
+            inicio -= self.intervalo
+        self.tabela = self.pontos_controle[inicio].copy() if inicio > 0 else iniciar()
+        self.pontos_controle = {k: linha for k, linha in self.pontos_controle.items() if k <= inicio}
+        self.quantidade = inicio
+
+        return inicio
+
+
+class AdaptiveDynamicProgrammingKnapsackSolver(AbstractKnapsackSolver):
+    """
+    Classe que implementa a solução de um Problema da Mochila Binária (0-1 Knapsack Problem) usando Programação
+    Dinâmica vetorizada com NumPy, cuja dimensão da tabela é escolhida pelo custo:
+
+    - por importância: para cada nível de importância total, o menor valor que o atinge. Exige importâncias inteiras
+      e tem custo proporcional a n vezes o limitante dual (de Dantzig) da importância;
+    - por valor: para cada valor total, a maior importância. Os valores são convertidos em centavos e, junto com o
+      valor disponível, divididos pelo seu máximo divisor comum, com custo proporcional a n vezes a capacidade
+      reduzida.
+
+    A solução é reconstruída a partir de uma matriz de decisões compactada em bits ou, quando esta não couber no
+    limite de memória, por divisão e conquista, com memória proporcional a uma linha da tabela.
+    """
+
+    DIMENSAO_IMPORTANCIA = "importancia"
+    """
+    Tabela indexada pela importância total.
+    """
+    DIMENSAO_VALOR = "valor"
+    """
+    Tabela indexada pelo valor total (capacidade).
+    """
+    MODO_TABELA = "tabela"
+    """
+    Reconstrução da solução a partir de uma matriz de decisões n x tamanho da tabela, com 1 bit por célula.
+    """
+    MODO_DIVISAO = "divisao"
+    """
+    Reconstrução da solução por divisão e conquista (Hirschberg), com memória proporcional ao tamanho da tabela.
+    """
+
+    _INFINITO = np.iinfo(np.int64).max // 4
+
+    def __str__(self):
+        return "Programação Dinâmica Adaptativa"
+
+    def _preparar(self, casas_decimais: int) -> tuple:
+        """
+        Converte os valores e o valor disponível em inteiros e reduz ambos pelo máximo divisor comum dos valores.
+
+        :param casas_decimais: Quantidade de casas decimais dos valores (2 para centavos).
+        :return: Valores inteiros reduzidos, capacidade inteira reduzida e máximo divisor comum utilizado.
+        """
+        escala = 10 ** casas_decimais
+        valores = np.rint(self.instancia.valor * escala).astype(np.int64)
+        capacidade = int(np.floor(self.valor_disponivel * escala + 1e-6))
+        # Toda soma de valores é múltipla do máximo divisor comum, de modo que a capacidade pode ser arredondada para
+        # baixo após a divisão.
+        divisor = int(np.gcd.reduce(valores[valores > 0])) if np.any(valores > 0) else 1
+        if capacidade < 0:
+            return valores // divisor, -1, divisor
+
+        return valores // divisor, capacidade // divisor, divisor
+
+    def _limitante_importancia(self) -> int:
+        """
+        Limitante dual (de Dantzig) da importância, que limita os níveis de importância da tabela. Não exige a
+        ordenação dos itens.
+        """
+        return int(np.floor(self.instancia.limitante_dantzig(self.valor_disponivel) + 1e-6))
+
+    def escolher_dimensao(self, casas_decimais: int = 2) -> tuple:
+        """
+        Escolhe a dimensão da tabela pelo custo estimado (quantidade de células).
+
+        :param casas_decimais: Quantidade de casas decimais dos valores.
+        :return: Dimensão escolhida e quantidade de células da tabela.
+        """
+        n = len(self.instancia)
+        _, capacidade, _ = self._preparar(casas_decimais)
+        celulas_valor = n * (max(capacidade, 0) + 1)
+        if not np.all(np.mod(self.instancia.importancia, 1) == 0):
+            return self.DIMENSAO_VALOR, celulas_valor
+
+        celulas_importancia = n * (max(self._limitante_importancia(), 0) + 1)
+        if celulas_importancia <= celulas_valor:
+            return self.DIMENSAO_IMPORTANCIA, celulas_importancia
+
+        return self.DIMENSAO_VALOR, celulas_valor
+
+    def _iniciar_tabela(self, dimensao: str, tamanho: int) -> np.ndarray:
+        """
+        Cria a linha inicial da tabela, sem nenhum item: na dimensão por importância, apenas o nível zero é atingível
+        (com valor zero); na dimensão por valor, a importância é nula para qualquer capacidade.
+        """
+        if dimensao == self.DIMENSAO_IMPORTANCIA:
+            tabela = np.full(tamanho, self._INFINITO, dtype=np.int64)
+            tabela[0] = 0
+            return tabela
+
+        return np.zeros(tamanho)
+
+    def _incluir_item(self, dimensao: str, tabela: np.ndarray, i: int, valores: np.ndarray, capacidade: int) -> tuple:
+        """
+        Atualiza a tabela (no próprio vetor) considerando o item i.
+
+        :return: Deslocamento do item na tabela e máscara das posições, a partir do deslocamento, em que o item passou a
+            compor a melhor solução. Se o item não puder melhorar nenhuma posição, retorna (0, None).
+        """
+        tamanho = len(tabela)
+        if dimensao == self.DIMENSAO_IMPORTANCIA:
+            deslocamento, valor = int(self._importancias[i]), int(valores[i])
+            if deslocamento <= 0 or deslocamento >= tamanho or valor > capacidade:
+                return 0, None
+            # Os candidatos são calculados a partir da linha anterior antes da atualização (cada item uma única vez).
+            candidatos = tabela[:tamanho - deslocamento] + valor
+            melhores = candidatos < tabela[deslocamento:]
+        else:
+            deslocamento, importancia = int(valores[i]), self.instancia.importancia[i]
+            if deslocamento <= 0 or deslocamento >= tamanho or importancia <= 0:
+                return 0, None
+            candidatos = tabela[:tamanho - deslocamento] + importancia
+            melhores = candidatos > tabela[deslocamento:]
+        tabela[deslocamento:][melhores] = candidatos[melhores]
+
+        return deslocamento, melhores
+
+    def _tabela(self, dimensao: str, indices: np.ndarray, tamanho: int, valores: np.ndarray,
+                capacidade: int) -> np.ndarray:
+        """
+        Calcula apenas a última linha da tabela para os itens informados, em memória O(tamanho).
+        """
+        tabela = self._iniciar_tabela(dimensao, tamanho)
+        for i in indices:
+            self._incluir_item(dimensao, tabela, i, valores, capacidade)
+
+        return tabela
+
+    def _posicao_final(self, dimensao: str, tabela: np.ndarray, capacidade: int) -> int:
+        """
+        Posição da tabela que contém a solução ótima: o maior nível de importância que cabe no valor disponível ou a
+        própria capacidade.
+        """
+        if dimensao == self.DIMENSAO_IMPORTANCIA:
+            return int(np.flatnonzero(tabela <= capacidade)[-1])
+
+        return capacidade
+
+    def _construir_tabela(self, dimensao: str, tamanho: int, valores: np.ndarray, capacidade: int) -> tuple:
+        """
+        Programação Dinâmica que guarda as decisões (item incluído ou não em cada posição) em uma matriz de bits n x
+        tamanho, compactada com `np.packbits` (1 bit por célula).
+
+        :return: Última linha da tabela e matriz de decisões compactada.
+        """
+        n = len(valores)
+        tabela = self._iniciar_tabela(dimensao, tamanho)
+        decisoes = np.zeros((n, (tamanho + 7) // 8), dtype=np.uint8)
+        linha = np.zeros(tamanho, dtype=bool)
+        for i in range(n):
+            deslocamento, melhores = self._incluir_item(dimensao, tabela, i, valores, capacidade)
+            if melhores is not None:
+                linha[:deslocamento] = False
+                linha[deslocamento:] = melhores
+                decisoes[i] = np.packbits(linha, bitorder="little")
+
+        return tabela, decisoes
+
+    def _reconstruir(self, dimensao: str, decisoes: np.ndarray, posicao: int, valores: np.ndarray) -> list:
+        """
+        Reconstrói a solução de uma posição da tabela percorrendo a matriz de decisões de trás para frente.
+        """
+        selecionados = []
+        for i in range(len(valores) - 1, -1, -1):
+            if posicao > 0 and (decisoes[i, posicao >> 3] >> (posicao & 7)) & 1:
+                selecionados.append(i)
+                posicao -= int(self._importancias[i] if dimensao == self.DIMENSAO_IMPORTANCIA else valores[i])
+
+        return selecionados
+
+    def _solucionar_por_divisao(self, dimensao: str, indices: np.ndarray, alvo: int, valores: np.ndarray,
+                                capacidade: int, selecionados: list):
+        """
+        Reconstrução por divisão e conquista (à maneira de Hirschberg): os itens são divididos ao meio, a última linha
+        da tabela de cada metade é calculada e o alvo (nível de importância ou capacidade) é repartido entre as metades
+        pela melhor combinação das duas linhas. Cada metade é resolvida recursivamente com a sua parte do alvo. Usa
+        memória O(alvo), ao custo de recalcular as tabelas em cada nível da recursão (O(n * alvo * log n) no pior caso).
+
+        :param alvo: Na dimensão por importância, o nível de importância exato a ser atingido com o menor valor; na
+            dimensão por valor, a capacidade disponível para os itens.
+        :param selecionados: Lista em que os itens selecionados são acumulados.
+        """
+        self._solucionar_pontos_por_divisao(dimensao, indices, np.array([alvo], dtype=np.int64), valores, capacidade,
+                                            [selecionados])
+
+    def _solucionar_pontos_por_divisao(self, dimensao: str, indices: np.ndarray, alvos: np.ndarray,
+                                       valores: np.ndarray, capacidade: int, selecoes: list):
+        """
+        Reconstrução por divisão e conquista de vários alvos em uma única recursão (veja `_solucionar_por_divisao`).
+        Em cada nível, as linhas das duas metades são calculadas uma única vez, até o maior dos alvos, e cada alvo
+        distinto é repartido pela melhor combinação das linhas até ele. O custo das tabelas, O(n * alvo * log n), é o
+        de um único alvo; cada alvo acrescenta apenas as combinações das linhas, O(alvo) por divisão.
+
+        :param alvos: Vetor com os alvos (níveis de importância ou capacidades). Alvos repetidos são combinados uma
+            única vez.
+        :param selecoes: Lista com uma lista por alvo, em que os itens selecionados para o alvo são acumulados.
+        """
+        ativos = np.flatnonzero(alvos > 0)
+        if len(ativos) == 0 or len(indices) == 0:
+            return
+        if len(indices) == 1:
+            i = int(indices[0])
+            if dimensao == self.DIMENSAO_IMPORTANCIA:
+                atingidos = (alvos == int(self._importancias[i])) & (alvos > 0)
+            elif valores[i] > 0 and self.instancia.importancia[i] > 0:
+                atingidos = alvos >= valores[i]
+            else:
+                return
+            for j in np.flatnonzero(atingidos):
+                selecoes[j].append(i)
+            return
+
+        distintos, posicoes = np.unique(alvos[ativos], return_inverse=True)
+        meio = len(indices) // 2
+        primeira = self._tabela(dimensao, indices[:meio], int(distintos[-1]) + 1, valores, capacidade)
+        segunda = self._tabela(dimensao, indices[meio:], int(distintos[-1]) + 1, valores, capacidade)
+        particoes = np.empty(len(distintos), dtype=np.int64)
+        for k, alvo in enumerate(distintos.tolist()):
+            combinacao = primeira[:alvo + 1] + segunda[alvo::-1]
+            if dimensao == self.DIMENSAO_IMPORTANCIA:
+                particoes[k] = int(np.argmin(combinacao))
+            else:
+                particoes[k] = int(np.argmax(combinacao))
+        del primeira, segunda
+
+        particao = np.zeros(len(alvos), dtype=np.int64)
+        particao[ativos] = particoes[posicoes]
+        self._solucionar_pontos_por_divisao(dimensao, indices[:meio], particao, valores, capacidade, selecoes)
+        self._solucionar_pontos_por_divisao(dimensao, indices[meio:], np.where(alvos > 0, alvos - particao, 0), valores,
+                                            capacidade, selecoes)
+
+    def escolher_modo(self, dimensao: str, tamanho: int, limite_memoria: int) -> str:
+        """
+        Escolhe o modo de reconstrução da solução conforme o limite de memória: a matriz de bits, quando couber, ou a
+        divisão e conquista.
+
+        :param dimensao: Dimensão da tabela.
+        :param tamanho: Quantidade de posições da tabela.
+        :param limite_memoria: Limite de memória, em bytes, para a tabela e a matriz de decisões.
+        :return: Modo escolhido.
+        :raises MemoryError: Se nem a divisão e conquista, que precisa de três linhas da tabela, couber no limite.
+        """
+        bytes_linha = 8 * tamanho
+        if len(self.instancia) * ((tamanho + 7) // 8) + 2 * bytes_linha <= limite_memoria:
+            return self.MODO_TABELA
+        if 3 * bytes_linha <= limite_memoria:
+            return self.MODO_DIVISAO
+
+        raise MemoryError("A tabela de Programação Dinâmica ({} posições) não cabe no limite de {} bytes."
+                          .format(tamanho, limite_memoria))
+
+    def _configurar(self, dimensao: str, valores: np.ndarray, capacidade: int, casas_decimais: int) -> tuple:
+        """
+        Escolhe a dimensão da tabela, quando não informada, e calcula o seu tamanho.
+
+        :return: Dimensão, quantidade de posições da tabela e itens que sempre compõem a solução.
+        :raises ValueError: Se for solicitada a dimensão por importância com importâncias não inteiras.
+        """
+        if dimensao is None:
+            dimensao, _ = self.escolher_dimensao(casas_decimais)
+
+        if dimensao == self.DIMENSAO_IMPORTANCIA:
+            if not np.all(np.mod(self.instancia.importancia, 1) == 0):
+                raise ValueError("A dimensão por importância exige importâncias inteiras.")
+            self._importancias = np.rint(self.instancia.importancia).astype(np.int64)
+            return dimensao, max(self._limitante_importancia(), 0) + 1, []
+
+        # Itens sem valor e com importância positiva sempre compõem a solução.
+        return dimensao, capacidade + 1, np.flatnonzero((valores == 0) & (self.instancia.importancia > 0)).tolist()
+
+    def solucionar(self, dimensao: str = None, casas_decimais: int = 2, modo: str = None,
+                   limite_memoria: int = 256 * 2 ** 20) -> SolucaoKnapsack:
+        """
+        Implementa o algoritmo que soluciona o Problema da Mochila Binária (0-1 Knapsack Problem).
+
+        :param dimensao: Dimensão da tabela (DIMENSAO_IMPORTANCIA ou DIMENSAO_VALOR). Se não informada, é escolhida
+            a de menor custo.
+        :param casas_decimais: Quantidade de casas decimais consideradas nos valores. Padrão de 2 (centavos).
+        :param modo: Modo de reconstrução da solução (MODO_TABELA ou MODO_DIVISAO). Se não informado, é escolhido
+            conforme o limite de memória.
+        :param limite_memoria: Limite de memória, em bytes, para a tabela e a matriz de decisões. Padrão de 256 MiB.
+        :return: Solução contendo os itens selecionados para compor o orçamento.
+        :raises ValueError: Se for solicitada a dimensão por importância com importâncias não inteiras.
+        :raises MemoryError: Se a tabela não couber no limite de memória em nenhum dos modos.
+        """
+        estatisticas = self.estatisticas
+        estatisticas.reiniciar()
+        with estatisticas.fase("preparacao"):
+            valores, capacidade, _ = self._preparar(casas_decimais)
+            if capacidade < 0 or len(valores) == 0:
+                return estatisticas.concluir(SolucaoKnapsack(self.instancia, []).certificar())
+
+            dimensao, tamanho, selecionados = self._configurar(dimensao, valores, capacidade, casas_decimais)
+            if modo is None:
+                modo = self.escolher_modo(dimensao, tamanho, limite_memoria)
+        self._registrar_tabela(dimensao, modo, tamanho)
+
+        if modo == self.MODO_TABELA:
+            with estatisticas.fase("busca"):
+                tabela, decisoes = self._construir_tabela(dimensao, tamanho, valores, capacidade)
+            with estatisticas.fase("materializacao"):
+                posicao = self._posicao_final(dimensao, tabela, capacidade)
+                selecionados += self._reconstruir(dimensao, decisoes, posicao, valores)
+        else:
+            # Na divisão e conquista, a reconstrução da solução se confunde com o cálculo das tabelas.
+            with estatisticas.fase("busca"):
+                alvo = capacidade
+                if dimensao == self.DIMENSAO_IMPORTANCIA:
+                    tabela = self._tabela(dimensao, np.arange(len(valores)), tamanho, valores, capacidade)
+                    alvo = self._posicao_final(dimensao, tabela, capacidade)
+                    del tabela
+                self._solucionar_por_divisao(dimensao, np.arange(len(valores)), alvo, valores, capacidade,
+                                             selecionados)
+
+        return estatisticas.concluir(SolucaoKnapsack(self.instancia, selecionados).certificar())
+
+    def _registrar_tabela(self, dimensao: str, modo: str, tamanho: int):
+        """
+        Registra nas estatísticas a dimensão, o modo e o tamanho da tabela.
+        """
+        self.estatisticas.registrar("dimensao", dimensao)
+        self.estatisticas.registrar("modo", modo)
+        self.estatisticas.registrar("celulas_tabela", len(self.instancia) * tamanho)
+        if modo == self.MODO_TABELA:
+            self.estatisticas.registrar("bytes_decisoes", len(self.instancia) * ((tamanho + 7) // 8))
+
+    def fronteira(self, orcamentos=None, valor_minimo: float = 0.0, dimensao: str = None, casas_decimais: int = 2,
+                  limite_memoria: int = 256 * 2 ** 20) -> FronteiraKnapsack:
+        """
+        Calcula, com uma única passagem da Programação Dinâmica, a fronteira eficiente orçamento → (importância máxima,
+        itens selecionados) para todos os orçamentos entre `valor_minimo` e o valor disponível ou, se informados,
+        apenas nos orçamentos (pontos de quebra) desejados.
+
+        A última linha da tabela já contém a resposta para todos os orçamentos menores que o valor disponível: na
+        dimensão por valor, a maior importância de cada capacidade; na dimensão por importância, o menor valor de cada
+        nível de importância. Os itens de cada ponto são reconstruídos a partir da mesma matriz de decisões (ou, se
+        esta não couber no limite de memória, por uma única divisão e conquista para todos os pontos, em que as tabelas
+        são calculadas uma vez para o maior ponto e cada ponto acrescenta apenas as combinações de suas partições).
+
+        :param orcamentos: Orçamentos em que a fronteira deve ser avaliada. Se não informados, a fronteira contém todos
+            os pontos em que a importância máxima aumenta, do `valor_minimo` até o valor disponível.
+        :param valor_minimo: Menor orçamento de interesse, quando não são informados os orçamentos.
+        :param dimensao: Dimensão da tabela (DIMENSAO_IMPORTANCIA ou DIMENSAO_VALOR). Se não informada, é escolhida
+            a de menor custo.
+        :param casas_decimais: Quantidade de casas decimais consideradas nos valores. Padrão de 2 (centavos).
+        :param limite_memoria: Limite de memória, em bytes, para a tabela e a matriz de decisões. Padrão de 256 MiB.
+        :return: Fronteira eficiente.
+        :raises ValueError: Se for solicitada a dimensão por importância com importâncias não inteiras.
+        :raises MemoryError: Se a tabela não couber no limite de memória em nenhum dos modos.
+        """
+        if orcamentos is not None:
+            orcamentos = np.sort(np.asarray(orcamentos, dtype=np.float64))
+            # A tabela é calculada uma única vez, para o maior dos orçamentos solicitados.
+            maior_orcamento = float(orcamentos[-1]) if len(orcamentos) else -1.0
+            if maior_orcamento != self.valor_disponivel:
+                return AdaptiveDynamicProgrammingKnapsackSolver(maior_orcamento, self.instancia).fronteira(
+                    orcamentos, valor_minimo, dimensao, casas_decimais, limite_memoria)
+
+        n = len(self.instancia)
+        valores, capacidade, divisor = self._preparar(casas_decimais)
+        escala = 10 ** casas_decimais
+        if capacidade < 0:
+            if orcamentos is None:
+                orcamentos = np.zeros(0)
+            return FronteiraKnapsack(self.instancia, orcamentos, np.zeros(len(orcamentos)),
+                                     np.zeros((len(orcamentos), n), dtype=bool))
+
+        dimensao, tamanho, gratuitos = self._configurar(dimensao, valores, capacidade, casas_decimais)
+        modo = self.escolher_modo(dimensao, tamanho, limite_memoria)
+        self.estatisticas.reiniciar()
+        self._registrar_tabela(dimensao, modo, tamanho)
+        if modo == self.MODO_TABELA:
+            tabela, decisoes = self._construir_tabela(dimensao, tamanho, valores, capacidade)
+        else:
+            tabela, decisoes = self._tabela(dimensao, np.arange(n), tamanho, valores, capacidade), None
+
+        # Pontos de quebra: posição da tabela, custo mínimo (em unidades reduzidas) e importância máxima.
+        if dimensao == self.DIMENSAO_IMPORTANCIA:
+            # Um nível é eficiente quando cabe na capacidade e custa menos que qualquer nível superior.
+            custo_superior = np.append(np.minimum.accumulate(tabela[::-1])[::-1][1:], self._INFINITO)
+            posicoes = np.flatnonzero((tabela <= capacidade) & (tabela < custo_superior))
+            custos = tabela[posicoes]
+            importancias = posicoes.astype(np.float64)
+        else:
+            # Uma capacidade é um ponto de quebra quando a importância máxima aumenta em relação à anterior.
+            posicoes = np.flatnonzero(np.diff(tabela, prepend=-np.inf) > 0)
+            custos = posicoes
+            importancias = tabela[posicoes] + self.instancia.importancia[gratuitos].sum()
+
+        if orcamentos is None:
+            unidades = int(np.floor(valor_minimo * escala + 1e-6)) // divisor
+            inicio = max(int(np.searchsorted(custos, unidades, side="right")) - 1, 0)
+            pontos = np.arange(inicio, len(posicoes))
+            orcamentos = custos[pontos] * divisor / escala
+        else:
+            unidades = np.floor(orcamentos * escala + 1e-6).astype(np.int64) // divisor
+            pontos = np.searchsorted(custos, unidades, side="right") - 1
+
+        selecoes = np.zeros((len(pontos), n), dtype=bool)
+        if decisoes is not None:
+            for j, ponto in enumerate(pontos):
+                if ponto > -1:
+                    selecoes[j, self._reconstruir(dimensao, decisoes, int(posicoes[ponto]), valores)] = True
+        else:
+            # Sem a matriz de decisões, todos os pontos são reconstruídos em uma única divisão e conquista.
+            selecionados = [[] for _ in pontos]
+            alvos = np.where(pontos > -1, posicoes[np.maximum(pontos, 0)], 0).astype(np.int64)
+            self._solucionar_pontos_por_divisao(dimensao, np.arange(n), alvos, valores, capacidade, selecionados)
+            for j, itens in enumerate(selecionados):
+                selecoes[j, itens] = True
+        selecoes[np.flatnonzero(pontos > -1)[:, None], gratuitos] = True
+
+        return FronteiraKnapsack(self.instancia, orcamentos, np.where(pontos >= 0, importancias[pontos], 0.0), selecoes)
+
+    def _estado_compativel(self, estado: EstadoProgramacaoDinamica, dimensao: str, casas_decimais: int) -> bool:
+        """
+        Verifica se a tabela guardada pode ser reaproveitada: mesma dimensão e casas decimais, valores múltiplos do
+        divisor com que foi calculada e capacidade (e, na dimensão por importância, níveis) suficientes.
+        """
+        if estado is None or estado.casas_decimais != casas_decimais:
+            return False
+        if dimensao is not None and dimensao != estado.dimensao:
+            return False
+
+        escala = 10 ** casas_decimais
+        centavos = np.rint(self.instancia.valor * escala).astype(np.int64)
+        capacidade = int(np.floor(self.valor_disponivel * escala + 1e-6)) // estado.divisor
+        if np.any(centavos % estado.divisor) or capacidade > estado.capacidade:
+            return False
+        if estado.dimensao == self.DIMENSAO_IMPORTANCIA:
+            return bool(np.all(np.mod(self.instancia.importancia, 1) == 0)) and \
+                self._limitante_importancia() < estado.tamanho
+
+        return True
+
+    def solucionar_incremental(self, estado: EstadoProgramacaoDinamica = None, primeiro_alterado: int = 0,
+                               dimensao: str = None, casas_decimais: int = 2,
+                               limite_memoria: int = 256 * 2 ** 20) -> tuple:
+        """
+        Soluciona o problema reaproveitando a tabela de uma execução anterior sobre os mesmos itens. As linhas dos
+        itens anteriores ao primeiro item alterado (incluído, removido ou modificado) não são recalculadas: o cálculo
+        é retomado do último ponto de controle anterior a ele. A redução do valor disponível também reaproveita a
+        tabela inteira, pois a última linha já contém a resposta para todas as capacidades menores.
+
+        A tabela é recalculada desde o início se não puder ser reaproveitada (dimensão diferente, valor disponível ou
+        níveis de importância maiores que os atendidos, ou valores que não são múltiplos do divisor utilizado).
+
+        :param estado: Estado devolvido pela execução anterior. Se não informado, a tabela é calculada do início.
+        :param primeiro_alterado: Posição, na instância, do primeiro item alterado desde a execução anterior.
+        :param dimensao: Dimensão da tabela (DIMENSAO_IMPORTANCIA ou DIMENSAO_VALOR). Se não informada, é escolhida
+            a de menor custo.
+        :param casas_decimais: Quantidade de casas decimais consideradas nos valores. Padrão de 2 (centavos).
+        :param limite_memoria: Limite de memória, em bytes, para a tabela e a matriz de decisões. Padrão de 256 MiB.
+            Se a matriz de decisões não couber no limite, o problema é solucionado sem reaproveitamento.
+        :return: Solução e estado a ser repassado à próxima execução (None se não houver tabela a reaproveitar).
+        """
+        self.estatisticas.reiniciar()
+        valores, capacidade, divisor = self._preparar(casas_decimais)
+        if capacidade < 0 or len(valores) == 0:
+            return self.estatisticas.concluir(SolucaoKnapsack(self.instancia, []).certificar()), estado
+
+        if self._estado_compativel(estado, dimensao, casas_decimais):
+            escala = 10 ** casas_decimais
+            valores = np.rint(self.instancia.valor * escala).astype(np.int64) // estado.divisor
+            capacidade = int(np.floor(self.valor_disponivel * escala + 1e-6)) // estado.divisor
+            dimensao = estado.dimensao
+            if dimensao == self.DIMENSAO_IMPORTANCIA:
+                self._importancias = np.rint(self.instancia.importancia).astype(np.int64)
+                selecionados = []
+            else:
+                selecionados = np.flatnonzero((valores == 0) & (self.instancia.importancia > 0)).tolist()
+        else:
+            dimensao, tamanho, selecionados = self._configurar(dimensao, valores, capacidade, casas_decimais)
+            if self.escolher_modo(dimensao, tamanho, limite_memoria) != self.MODO_TABELA:
+                return self.solucionar(dimensao, casas_decimais, limite_memoria=limite_memoria), None
+            estado = EstadoProgramacaoDinamica(dimensao, casas_decimais, divisor, capacidade, tamanho,
+                                               int(np.ceil(np.sqrt(len(valores)))))
+            primeiro_alterado = 0
+
+        # Retoma o cálculo do último ponto de controle anterior ao primeiro item alterado.
+        n = len(valores)
+        inicio = estado.retomar(primeiro_alterado, lambda: self._iniciar_tabela(dimensao, estado.tamanho))
+        if len(estado.decisoes) < n:
+            decisoes = np.zeros((max(n, 2 * len(estado.decisoes)), estado.decisoes.shape[1]), dtype=np.uint8)
+            decisoes[:inicio] = estado.decisoes[:inicio]
+            estado.decisoes = decisoes
+        linha = np.zeros(estado.tamanho, dtype=bool)
+        with self.estatisticas.fase("busca"):
+            for i in range(inicio, n):
+                deslocamento, melhores = self._incluir_item(dimensao, estado.tabela, i, valores, estado.capacidade)
+                if melhores is None:
+                    estado.decisoes[i] = 0
+                else:
+                    linha[:deslocamento] = False
+                    linha[deslocamento:] = melhores
+                    estado.decisoes[i] = np.packbits(linha, bitorder="little")
+                if (i + 1) % estado.intervalo == 0:
+                    estado.pontos_controle[i + 1] = estado.tabela.copy()
+        estado.quantidade = n
+        self._registrar_tabela(dimensao, self.MODO_TABELA, estado.tamanho)
+        self.estatisticas.registrar("itens_recalculados", n - inicio)
+
+        with self.estatisticas.fase("materializacao"):
+            posicao = self._posicao_final(dimensao, estado.tabela, capacidade)
+            selecionados += self._reconstruir(dimensao, estado.decisoes, posicao, valores)
+
+        return self.estatisticas.concluir(SolucaoKnapsack(self.instancia, selecionados).certificar()), estado
+
+
+class CriteriosParada:
+    """
+    Classe que reúne os critérios de parada antecipada da busca Branch and Bound (tolerâncias de *gap*, limite de
+    nós expandidos e tempo limite) e o menor limitante superior global calculado durante a busca, que certifica a
+    qualidade da melhor solução encontrada quando a busca é interrompida.
+    """
+
+    def __init__(self, tolerancia_gap: float = 0.0, tolerancia_gap_absoluta: float = 0.0,
+                 limite_expansoes: int = None, timeout: float = None):
+        """
+        Método construtor.
+
+        :param tolerancia_gap: A busca é interrompida quando a distância entre o limitante superior e a importância
+            da melhor solução não ultrapassar essa fração da importância (por exemplo, 0.001 para 0,1%).
+        :param tolerancia_gap_absoluta: A busca é interrompida quando a distância entre o limitante superior e a
+            importância da melhor solução não ultrapassar esse valor.
+        :param limite_expansoes: Quantidade máxima de nós expandidos (ramificados), somados todos os núcleos.
+        :param timeout: Tempo máximo de busca, em segundos, a partir da criação dos critérios.
+        """
+        self.tolerancia_gap = tolerancia_gap
+        self.tolerancia_gap_absoluta = tolerancia_gap_absoluta
+        self.limite_expansoes = limite_expansoes
+        self.prazo = None if timeout is None else time.perf_counter() + timeout
+        self.expansoes = 0
+        """
+        Quantidade de nós expandidos pelas buscas já concluídas.
+        """
+        self.limitante_superior = np.inf
+        """
+        Menor limitante superior global calculado até o momento.
+        """
+        self.motivo = None
+        """
+        Motivo da interrupção da busca ("otimalidade", "gap", "limite_expansoes" ou "timeout"), ou None se não foi
+        interrompida.
+        """
+
+    @property
+    def interrompida(self) -> bool:
+        """
+        Indica se algum critério de parada foi atingido.
+        """
+        return self.motivo is not None
+
+    def verificar(self, importancia: float, limitante_superior: float, expansoes: int = 0) -> bool:
+        """
+        Verifica os critérios de parada.
+
+        :param importancia: Importância da melhor solução conhecida.
+        :param limitante_superior: Limitante superior global corrente.
+        :param expansoes: Quantidade de nós expandidos pela busca em andamento.
+        :return: Verdadeiro se a busca deve ser interrompida.
+        """
+        self.limitante_superior = min(self.limitante_superior, limitante_superior)
+        gap = self.limitante_superior - importancia
+        if gap <= 0:
+            # Nenhum nó ativo pode superar a melhor solução: a otimalidade está comprovada.
+            self.motivo = "otimalidade"
+        elif gap <= self.tolerancia_gap_absoluta or gap <= self.tolerancia_gap * abs(importancia):
+            self.motivo = "gap"
+        elif self.limite_expansoes is not None and self.expansoes + expansoes >= self.limite_expansoes:
+            self.motivo = "limite_expansoes"
+        elif self.prazo is not None and time.perf_counter() >= self.prazo:
+            self.motivo = "timeout"
+
+        return self.interrompida
+
+
+class BranchAndBoundKnapsackSolver(AbstractKnapsackSolver):
+    """
+    Classe que implementa a solução de um Problema da Mochila Binária (0-1 Knapsack Problem) utilizando algoritmo
+    Branch and Bound.
+    """
+
+    INTERVALO_VERIFICACAO = 1024
+    """
+    Quantidade de nós expandidos entre duas verificações dos critérios de parada.
+    """
+    INTERVALO_DOACAO = 64
+    """
+    Quantidade de nós retirados da fila, na busca paralela, entre duas verificações do encerramento e dos processos
+    ociosos.
+    """
+    TAMANHO_MAXIMO_DOACAO = 1024
+    """
+    Quantidade máxima de nós enviados de uma só vez a um processo ocioso na busca paralela.
+    """
+    INTERVALO_ACOMPANHAMENTO = 0.05
+    """
+    Intervalo, em segundos, entre duas verificações dos critérios de parada pelo processo principal na busca paralela.
+    """
 
     def __str__(self):
         return "Branch and Bound"
 
     class PriorityQueue:
         """
-        A classe interna PriorityQueue implementa uma fila onde os nós ativos da busca são enfileirados em ordem crescente.
-        O nó retornado será sempre o que pussui o maior limitante dual.
+        A classe interna PriorityQueue implementa uma fila de prioridade, baseada em *heap* binário, onde os nós ativos
+        da busca são enfileirados. O nó retornado será sempre o que possui o maior limitante dual; entre nós de mesmo
+        limitante dual, o enfileirado mais recentemente.
         """
 
         def __init__(self):
             self.pqueue = []
             self.tamanho = 0
+            self.tamanho_maximo = 0
+            """
+            Maior quantidade de nós simultaneamente na fila (pico da fila).
+            """
+            self._contador = 0
 
         def enqueue(self, node):
             """
-            Insere na fila um nó de forma ordenada.
+            Insere um nó na fila em O(log n).
 
             :param node: Nó ativo a ser enfileirado.
             """
-            # Caso seja informado algum nó e o valor dos itens que o compõem esteja acima do valor disponível,
-            # o nó não será adicionado na fila de prioridade (poda por inviabilidade).
-            if node is not None and not node.is_valor_acima_do_disponivel:
-                i = 0
-                # Ordenação em ordem crescente da fila de acordo com limitante dual.
-                while i < len(self.pqueue):
-                    if self.pqueue[i].limitante_dual > node.limitante_dual:
-                        break
-                    i += 1
-                # Insere na nó na fila e incrementa o contador de tamanho.
-                self.pqueue.insert(i, node)
+            # Nós cujo valor dos itens fixados esteja acima do valor disponível não são criados (poda por
+            # inviabilidade) e, portanto, não são adicionados na fila de prioridade.
+            if node is not None:
+                # O heapq retorna o menor elemento; por isso o limitante dual e o contador de inserção são negados.
+                self._contador += 1
+                heapq.heappush(self.pqueue, (-node.limitante_dual, -self._contador, node))
                 self.tamanho += 1
+                self.tamanho_maximo = max(self.tamanho_maximo, self.tamanho)
 
         def dequeue(self):
             """
-            Retira da fila o nó que estiver na última posição (com maior limitante dual).
+            Retira da fila o nó com maior limitante dual em O(log n).
 
             :return: Nó retirado da fila.
             """
             try:
-                # Será retornado o último nó que correponde àquele com maior limitante dual encontrado.
-                node = self.pqueue.pop()
+                node = heapq.heappop(self.pqueue)[2]
                 self.tamanho -= 1
-            except:
+            except IndexError:
                 print("Não foi possível remover node da fila: fila de prioridade vazia.")
             else:
                 return node
 
+        def podar(self, limitante_primal: float):
+            """
+            Retira da fila, em O(n), todos os nós cujo limitante dual não supera o limitante primal (poda por
+            limitante).
+
+            :param limitante_primal: Importância da melhor solução inteira encontrada até o momento.
+            :return: Quantidade de nós podados.
+            """
+            self.pqueue = [entrada for entrada in self.pqueue if -entrada[0] > limitante_primal]
+            heapq.heapify(self.pqueue)
+            podados = self.tamanho - len(self.pqueue)
+            self.tamanho = len(self.pqueue)
+
+            return podados
+
+        def dividir(self, quantidade_maxima: int) -> list:
+            """
+            Retira da fila, em O(n log n), metade dos nós de maior limitante dual (no máximo quantidade_maxima),
+            alternadamente, de modo que os nós retirados e os que permanecem sejam igualmente promissores.
+
+            :param quantidade_maxima: Quantidade máxima de nós retirados.
+            :return: Nós retirados da fila.
+            """
+            # Uma lista ordenada é um heap válido: as entradas que permanecem não precisam ser reorganizadas.
+            entradas = sorted(self.pqueue)
+            limite = min(2 * quantidade_maxima, len(entradas))
+            retiradas = entradas[1:limite:2]
+            self.pqueue = entradas[0:limite:2] + entradas[limite:]
+            self.tamanho = len(self.pqueue)
+
+            return [entrada[2] for entrada in retiradas]
+
     class Node:
         """
         A classe interna Node implementa a estrutura de dados que armazenará os nós da árvore utilizada pelo algoritmo
         Branch and Bound.
+
+        O nó é compacto: guarda apenas o nó pai e o item fixado na ramificação que o originou. O caminho completo de
+        itens fixados é obtido percorrendo os nós pais, o que só é necessário quando o nó é ramificado. Os itens são
+        identificados pela sua posição na ordem decrescente da razão importância/valor da instância.
         """
 
-        def __init__(self, valor_disponivel: float, itens: pd.DataFrame):
+        __slots__ = ("pai", "posicao", "fixado", "limitante_dual", "importancia", "valor", "indice_fracionado",
+                     "limite_livres")
+
+        def __init__(self, pai, posicao: int, fixado: int, limitante_dual: float, importancia: float, valor: float,
+                     indice_fracionado: int, limite_livres: int):
             """
             Método construtor.
 
-            :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
-            :param itens: Itens que serão avaliados para compor o orçamento.
-            """
-            self.valor_disponivel = valor_disponivel
-            """
-            Valor do orçamento disponível para distribuição (capacidade da mochila).
+            :param pai: Nó pai (None para o nó raiz).
+            :param posicao: Posição do item fixado na ramificação que originou o nó (-1 para o nó raiz).
+            :param fixado: 1 se o item foi fixado na solução (xi >= 1) e 0 se foi excluído (xi <= 0).
+            :param limitante_dual: Valor máximo de todos os itens que compõe o nó, incluindo o item fracionado que não
+                coube inteiramente na solução.
+            :param importancia: Importância somada da parte inteira da solução contida no nó.
+            :param valor: Valor somado da parte inteira da solução contida no nó.
+            :param indice_fracionado: Posição do item fracionado usado para se obter o limitante dual (-1 se não
+                houver).
+            :param limite_livres: Os itens não fixados com posição anterior a esse limite compõem a solução do nó.
             """
-            self.itens = itens
-            """
-            Itens que serão avaliados para compor o orçamento.
-            """
-            self.indice_fracionado = -1
-            """
-            Índice do elemento fracionado usado para se obter o valor fracionado do presente nó.Dicionário contendo o caminho de índices dos itens usados para ramificação até o presente nó, no
-            formato: {x: 0 ou 1, ..., y: 0 ou 1}, onde x = índice inicial, y = índice final.
-            """
-            self.caminho = {}
-            """
-            Dicionário contendo o caminho de índices dos itens usados para ramificação até o presente nó, no
-            formato: {x: 0 ou 1, ..., y: 0 ou 1}, onde x = índice inicial, y = índice final.
-            """
-            self._limitante_dual = -1
-            self._importancia = 0
-            self._valor = 0
-            self._itens_selecionados = []
+            self.pai = pai
+            self.posicao = posicao
+            self.fixado = fixado
+            self.limitante_dual = limitante_dual
+            self.importancia = importancia
+            self.valor = valor
+            self.indice_fracionado = indice_fracionado
+            self.limite_livres = limite_livres
 
-        @property
-        def limitante_dual(self) -> float:
+        def caminho(self) -> tuple:
             """
-            Atributo da classe interna Node que implementa a função objetivo da solução representada pelo nó. O
-            limitante dual representa o valor máximo de todos os itens que compõe o nó, incluindo o item fracionado que
-            não coube inteiramente na solução.
+            Percorre os nós pais para obter o caminho de itens fixados até o presente nó.
+
+            :return: Vetor com as posições dos itens fixados, em ordem crescente, e vetor com a fixação de cada um
+                (1 se incluído, 0 se excluído).
             """
-            # Se o limitante dual for igual -1, indica que se trata de um nó novo e executa a função objetivo para se
-            # obter o limitante dual e demais atributos do nó.
-            if self._limitante_dual == -1:
-                self._limitante_dual = 0
-                valor_disponivel_restante = self.valor_disponivel
-                # Cria cópia dos itens orçamentários para utilização dentro do método. Em cima da cópia, cria um campo
-                # chamado "obrigatorio" que indicará se o índice deverá compor ou não o cálculo do limitante dual.
-                itens = self.itens.copy()
-                itens["obrigatorio"] = 0
-
-                # Bloco que seleciona, a partir do caminho de índices que foi usado até chegar no nó corrente, quais
-                # itens serão obrigatoriamente excluídos da solução e quais serão mantidos.
-                # Se o índice dentro do caminho estiver marcado como 1, deve ser incluído, caso contrário (0), excluído.
-                if len(self.caminho) > 0:
-                    # Cria lista de índices a serem mantidos.
-                    indices_mantidos = itens.index.values.tolist()
-                    # Cria lista de índices a serem excluídos.
-                    indices_excluidos = []
-                    for chave, valor in self.caminho.items():
-                        if valor <= 0:
-                            indices_excluidos.append(chave)
-                        elif valor >= 1:
-                            itens.at[chave, "obrigatorio"] = 1
-                            # Reordena a lista de índices mantidos retirando o item corrente de sua posição atual e o
-                            # incluíndo na primeira posição da lista (índice 0).
-                            indices_mantidos.insert(0, indices_mantidos.pop(indices_mantidos.index(chave)))
-                    # Reindexa os itens do dataset com base na lista de índices mantidos que foram inseridos nas
-                    # primeiras posições.
-                    itens = itens.reindex(indices_mantidos)
-                    # Exclui os índices marcados como não obrigatórios.
-                    itens = itens.drop(indices_excluidos)
-
-                # Aqui serão calculados: limitante dual, importância e valor. Também são adicionados os itens
-                # selecionados que compõem o cálculo do limitante dual e, caso exista, será armazenado o índice do item
-                # que foi fracionado para compor o valor do limitante dual.
-                for indice, item in itens.iterrows():
-                    # Adiciona os itens até estourar o valor disponível restante. Caso o item seja obrigatorio,
-                    if item.valor <= valor_disponivel_restante or item.obrigatorio:
-                        valor_disponivel_restante -= item.valor
-                        self._importancia += item.importancia
-                        self._valor += item.valor
-                        self._itens_selecionados.append(indice)
-                    # Se não couber o item inteiro, adiciona a fração do valor.
-                    else:
-                        if valor_disponivel_restante > 0:
-                            # Marcação de qual o índice do item fracionário para ramificação das folhas deste nó.
-                            self.indice_fracionado = indice
-                            self._limitante_dual = valor_disponivel_restante * item.importancia_por_valor
-                        break
+            posicoes = []
+            fixados = []
+            node = self
+            while node.pai is not None:
+                posicoes.append(node.posicao)
+                fixados.append(node.fixado)
+                node = node.pai
+            posicoes = np.array(posicoes, dtype=np.intp)
+            ordem = np.argsort(posicoes)
 
-                # Atualiza o valor do limitante com o valor existe mais o valor somado das importâncias.
-                self._limitante_dual += self._importancia
+            return posicoes[ordem], np.array(fixados, dtype=np.uint8)[ordem]
 
-            return self._limitante_dual
+    def _criar_no(self, pai, posicao: int, fixado: int, posicoes: np.ndarray, fixados: np.ndarray):
+        """
+        Cria um nó e calcula seu limitante dual (limitante de Dantzig) a partir das somas acumuladas dos valores e
+        importâncias na ordem da razão importância/valor.
 
-        @property
-        def importancia(self) -> int:
-            """
-            Importância somada da solução contida no nó.
-            """
-            _ = self.limitante_dual
+        Os itens livres (não fixados) são preenchidos em ordem até o item crítico. Os itens fixados dividem a ordem em
+        segmentos de itens livres; uma busca binária sobre o valor livre acumulado ao fim de cada segmento encontra o
+        segmento do item crítico e outra, dentro do segmento, encontra o item crítico. O custo é O(log n) mais
+        operações vetorizadas sobre os itens fixados, sem percorrer os itens livres.
 
-            return self._importancia
+        :param pai: Nó pai (None para o nó raiz).
+        :param posicao: Posição do item fixado na ramificação que originou o nó.
+        :param fixado: Fixação do item (1 se incluído, 0 se excluído).
+        :param posicoes: Posições de todos os itens fixados até o nó, em ordem crescente.
+        :param fixados: Fixação de cada item fixado até o nó.
+        :return: Nó criado ou None caso o valor dos itens fixados ultrapasse o valor disponível (poda por
+            inviabilidade).
+        """
+        valor_acumulado = self.instancia.valor_acumulado
+        importancia_acumulada = self.instancia.importancia_acumulada
+        n = len(self.instancia)
 
-        @property
-        def valor(self) -> float:
-            """
-            Valor somado dos itens da solução contida no nó.
-            """
-            _ = self.limitante_dual
+        valores_fixados = self._valores_ordenados[posicoes]
+        importancias_fixadas = self._importancias_ordenadas[posicoes]
+        incluidos = fixados == 1
+        valor_incluido = float(valores_fixados[incluidos].sum())
+        importancia_incluida = float(importancias_fixadas[incluidos].sum())
+        capacidade = self.valor_disponivel - valor_incluido
+        if capacidade < 0:
+            return None
 
-            return self._valor
+        # Soma acumulada dos valores e importâncias dos itens fixados, que são descontados das somas acumuladas de
+        # todos os itens para se obter as somas dos itens livres.
+        valor_fixado_acumulado = np.zeros(len(posicoes) + 1)
+        np.cumsum(valores_fixados, out=valor_fixado_acumulado[1:])
+        importancia_fixada_acumulada = np.zeros(len(posicoes) + 1)
+        np.cumsum(importancias_fixadas, out=importancia_fixada_acumulada[1:])
 
-        @property
-        def itens_selecionados(self) -> list:
-            """
-            Itens que compõem a solução contida no nó.
-            """
-            _ = self.limitante_dual
+        # Valor livre acumulado ao fim de cada segmento. O primeiro segmento que ultrapassa a capacidade contém o item
+        # crítico.
+        fim_segmentos = np.append(posicoes, n)
+        segmento = int(np.searchsorted(valor_acumulado[fim_segmentos] - valor_fixado_acumulado, capacidade,
+                                       side="right"))
+        indice_fracionado = -1
+        if segmento > len(posicoes):
+            # Todos os itens livres cabem na capacidade restante.
+            limite_livres = n
+            segmento = len(posicoes)
+        else:
+            inicio_segmento = posicoes[segmento - 1] + 1 if segmento > 0 else 0
+            limite_livres = int(np.searchsorted(valor_acumulado, capacidade + valor_fixado_acumulado[segmento],
+                                                side="right")) - 1
+            limite_livres = min(max(limite_livres, inicio_segmento), fim_segmentos[segmento] - 1)
 
-            return self._itens_selecionados
+        valor = valor_incluido + valor_acumulado[limite_livres] - valor_fixado_acumulado[segmento]
+        importancia = importancia_incluida + importancia_acumulada[limite_livres] - importancia_fixada_acumulada[segmento]
+        limitante_dual = importancia
+        valor_disponivel_restante = self.valor_disponivel - valor
+        # Se não couber o item crítico inteiro, adiciona a fração do valor.
+        if limite_livres < n and valor_disponivel_restante > 0:
+            indice_fracionado = limite_livres
+            limitante_dual += valor_disponivel_restante * self._razoes_ordenadas[limite_livres]
 
-        @property
-        def is_valor_acima_do_disponivel(self) -> bool:
-            """
-            Índica se o valor somado da solução contida no nó é maior do que o valor disponível (capacidade da mochila).
-            """
-            return self.valor > self.valor_disponivel
+        return self.Node(pai, posicao, fixado, float(limitante_dual), float(importancia), float(valor),
+                         indice_fracionado, limite_livres)
 
-        def ramificar(self):
-            """
-            Ramifica o nó em dois nós folhas caso o limitante dual seja composto por valor fracionado de determinado
-            item, correspondente ao índice armazenado no atributo indice_fracionado.
+    def _ramificar(self, node) -> tuple:
+        """
+        Ramifica o nó em dois nós folhas caso o limitante dual seja composto por valor fracionado de determinado
+        item, correspondente ao índice armazenado no atributo indice_fracionado.
 
-            :return: Nó Folha 1, Nó Folha 2
-            """
-            # Se, dentre os índices que compõem a solução armazenada pelo nó, existir índice de item cujo valor
-            # tenha sido fracionado, ainda não se chegou em uma solução inteira (limitante dual composto apenas por
-            # valores que não são frações de um valor inteiro de item) e, portanto, o nó será ramificado em
-            # busca de uma solução inteira.
-            if self.indice_fracionado > -1:
-                # Ramo xi <= 0.
-                folha1 = BranchAndBoundKnapsackSolver.Node(self.valor_disponivel, self.itens)
-                # Uma das folhas deverá desprezar o item com valor fracionado.
-                folha1.caminho[self.indice_fracionado] = 0  # xi <= 0
-                # Atualiza os caminho do nó pra incluir o caminho percorrido nos níveis superiores.
-                folha1.caminho.update(self.caminho)
-
-                # Ramo xi >= 1
-                folha2 = BranchAndBoundKnapsackSolver.Node(self.valor_disponivel, self.itens)
-                # A outra folha deverá obrigatoriamente incluir o item com valor fracionado.
-                folha2.caminho[self.indice_fracionado] = 1  # xi >= 1
-                # Atualiza os caminho do nó pra incluir o caminho percorrido nos níveis superiores.
-                folha2.caminho.update(self.caminho)
-
-                return folha1, folha2
-
-            return None, None
-
-    def solucionar(self):
+        :param node: Nó a ser ramificado.
+        :return: Nó Folha 1, Nó Folha 2 (None para folhas inviáveis).
+        """
+        # Se, dentre os índices que compõem a solução armazenada pelo nó, existir índice de item cujo valor
+        # tenha sido fracionado, ainda não se chegou em uma solução inteira (limitante dual composto apenas por
+        # valores que não são frações de um valor inteiro de item) e, portanto, o nó será ramificado em
+        # busca de uma solução inteira.
+        if node.indice_fracionado > -1:
+            posicoes, fixados = node.caminho()
+            i = int(np.searchsorted(posicoes, node.indice_fracionado))
+            posicoes = np.insert(posicoes, i, node.indice_fracionado)
+            # Ramo xi <= 0: uma das folhas deverá desprezar o item com valor fracionado.
+            folha1 = self._criar_no(node, node.indice_fracionado, 0, posicoes, np.insert(fixados, i, 0))
+            # Ramo xi >= 1: a outra folha deverá obrigatoriamente incluir o item com valor fracionado.
+            folha2 = self._criar_no(node, node.indice_fracionado, 1, posicoes, np.insert(fixados, i, 1))
+
+            return folha1, folha2
+
+        return None, None
+
+    def _itens_selecionados(self, node) -> np.ndarray:
+        """
+        Obtém os itens que compõem a parte inteira da solução contida no nó.
+
+        :param node: Nó cuja solução se quer obter.
+        :return: Posições dos itens na instância.
+        """
+        posicoes, fixados = node.caminho()
+        livres = np.ones(node.limite_livres, dtype=bool)
+        livres[posicoes[posicoes < node.limite_livres]] = False
+        selecionados = np.concatenate((np.flatnonzero(livres), posicoes[fixados == 1]))
+
+        return self.instancia.ordem[selecionados]
+
+    def _codificar(self, nodes: list) -> tuple:
+        """
+        Codifica nós de forma compacta para transmissão entre processos. Cada nó é representado apenas pelo conjunto
+        de itens fixados: a posição p de um item incluído é codificada como p e a de um item excluído, como -p - 1.
+
+        :param nodes: Nós a serem codificados.
+        :return: Vetor com os códigos de todos os nós, concatenados, e vetor com a posição final dos códigos de cada
+            nó.
+        """
+        codigos = []
+        for node in nodes:
+            posicoes, fixados = node.caminho()
+            codigos.append(np.where(fixados == 1, posicoes, ~posicoes).astype(np.int32))
+
+        return np.concatenate(codigos), np.cumsum([len(codigo) for codigo in codigos])
+
+    def _decodificar(self, codificados: tuple) -> list:
+        """
+        Reconstrói os nós codificados pelo método `_codificar`, recalculando seus limitantes.
+
+        :param codificados: Vetor com os códigos dos nós e vetor com a posição final dos códigos de cada nó.
+        :return: Nós reconstruídos.
+        """
+        codigos, fins = codificados
+        nodes = []
+        for codigo in np.split(codigos, fins[:-1]):
+            fixados = (codigo >= 0).astype(np.uint8)
+            posicoes = np.where(codigo >= 0, codigo, ~codigo).astype(np.intp)
+            if len(codigo) == 0:
+                nodes.append(self._criar_no(None, -1, 0, posicoes, fixados))
+                continue
+            # O caminho até o nó é refeito, a partir de uma raiz, com nós sem limitantes, utilizados apenas para se
+            # obter os itens fixados.
+            pai = self.Node(None, -1, 0, 0.0, 0.0, 0.0, -1, 0)
+            for posicao, fixado in zip(posicoes[:-1].tolist(), fixados[:-1].tolist()):
+                pai = self.Node(pai, posicao, fixado, 0.0, 0.0, 0.0, -1, 0)
+            nodes.append(self._criar_no(pai, int(posicoes[-1]), int(fixados[-1]), posicoes, fixados))
+
+        return nodes
+
+    def _preparar(self, ordenar: bool = True):
+        """
+        Prepara os vetores da instância na ordem decrescente da razão importância/valor, utilizados no cálculo dos
+        limitantes.
+
+        :param ordenar: Indica se os vetores ordenados devem ser preparados. Com o pré-processamento, a ordenação é
+            adiada até que a busca seja de fato necessária (veja `_ordenar`).
+        """
+        if ordenar:
+            self._ordenar()
+        # Com importâncias inteiras, toda solução tem importância inteira: um ramo só pode conter solução melhor que
+        # a atual se seu limitante dual alcançar o próximo inteiro.
+        self._importancias_inteiras = bool(np.all(np.mod(self.instancia.importancia, 1) == 0))
+        self.tamanho_maximo_fila = 0
+        # Importância dos itens fixados fora da instância (nos subproblemas do núcleo), somada às melhorias registradas
+        # nas estatísticas.
+        self._importancia_base = 0.0
+        # Limitante das soluções que diferem da solução base fora do núcleo, que compõe o limitante superior global.
+        self._limitante_externo = -np.inf
+        self._criterios = CriteriosParada()
+
+    def _ordenar(self):
+        """
+        Ordena os itens pela razão importância/valor e prepara os vetores ordenados.
+        """
+        ordem = self.instancia.ordem
+        self._valores_ordenados = self.instancia.valor[ordem]
+        self._importancias_ordenadas = self.instancia.importancia[ordem]
+        self._razoes_ordenadas = self.instancia.importancia_por_valor[ordem]
+
+    def _pode_superar(self, limitante_dual, limitante_primal: float):
+        """
+        Indica se um ramo com o limitante dual informado pode conter solução melhor do que o limitante primal.
+
+        :param limitante_dual: Limitante dual (ou vetor de limitantes) do ramo.
+        :param limitante_primal: Importância da melhor solução conhecida.
+        :return: Verdadeiro (ou vetor de booleanos) se o ramo não puder ser podado.
+        """
+        if self._importancias_inteiras:
+            return limitante_dual >= limitante_primal + 1 - 1e-6
+
+        return limitante_dual > limitante_primal
+
+    def _limitante_superior(self, pq, pilha: list, limitante_primal: float) -> float:
+        """
+        Calcula o limitante superior global durante a busca: o maior limitante dual entre os nós ativos (na fila e na
+        pilha do mergulho), a importância da melhor solução e o limitante das soluções fora do núcleo.
+
+        :return: Limitante superior, já acrescido da importância base do núcleo.
+        """
+        limitante = limitante_primal
+        if pq.tamanho:
+            limitante = max(limitante, -pq.pqueue[0][0])
+        if pilha:
+            limitante = max(limitante, max(node.limitante_dual for node in pilha))
+
+        return max(self._arredondar_limitante(limitante + self._importancia_base), self._limitante_externo)
+
+    def _buscar(self, limite_nos: int, fracao_mergulho: float, limitante_primal: float = 0) -> Generator:
+        """
+        Executa a busca Branch and Bound sobre a instância do solver.
+
+        É um gerador que, a cada nova melhor solução, produz sua importância e o limitante superior global (ambos
+        acrescidos da importância base do núcleo) e uma função que materializa as posições, na instância, dos itens
+        da solução. A busca é interrompida quando algum dos critérios de parada é atingido; eles são verificados a
+        cada nova solução e a cada INTERVALO_VERIFICACAO nós expandidos.
+
+        :param limite_nos: Quantidade máxima de nós na fila de nós ativos (None para fila ilimitada).
+        :param fracao_mergulho: Fração do limite de nós a partir da qual a busca mergulha em profundidade.
+        :param limitante_primal: Importância de uma solução já conhecida. Só são retornadas soluções melhores.
+        :return: Importância e posições, na instância, dos itens da melhor solução encontrada; ou o limitante primal
+            informado e None, se nenhuma solução melhor for encontrada (valor de retorno do gerador).
+        """
+        criterios = self._criterios
         # Cria a fila de prioridade que armazenará os nós ativos.
         pq = self.PriorityQueue()
 
         # Cria o nó raiz que será ramificado até se encontrar a solução ótima.
-        node = self.Node(self.valor_disponivel, self.itens)
+        sem_fixacao = np.empty(0, dtype=np.intp)
+        node = self._criar_no(None, -1, 0, sem_fixacao, np.empty(0, dtype=np.uint8))
+
+        # Tamanho da fila a partir do qual a busca mergulha em profundidade e pilha de nós do mergulho.
+        limite_mergulho = None if limite_nos is None else max(int(limite_nos * fracao_mergulho), 1)
+        pilha = []
+
+        # Contadores das estatísticas, acumulados em variáveis locais durante a busca.
+        criados, inviaveis, expandidos, podados = int(node is not None), int(node is None), 0, 0
+
+        melhor_node = None
+        try:
+            with self.estatisticas.fase("busca"):
+                if node is not None and node.limitante_dual > 0:
+                    # Enfileira o nó raiz.
+                    pq.enqueue(node)
+
+                while pq.tamanho != 0 or pilha:
+                    # Durante um mergulho, o próximo nó é o do topo da pilha. Caso contrário, remove o nó ativo com o
+                    # melhor limitante dual.
+                    node = pilha.pop() if pilha else pq.dequeue()
+
+                    # Antes de ramificar, verifica se existe elemento com limitante dual composto por valor fracionado.
+                    # Se existir e o limitante dual puder superar o limitante primal, continua a ramificação da árvore,
+                    # caso contrário, despreza o nó ativo dado que solução melhor já existe (poda por limitante).
+                    if node.indice_fracionado > -1 and self._pode_superar(node.limitante_dual, limitante_primal):
+                        # Ramifica o nó corrente.
+                        folha1, folha2 = self._ramificar(node)
+                        expandidos += 1
+                        folhas_viaveis = (folha1 is not None) + (folha2 is not None)
+                        criados += folhas_viaveis
+                        inviaveis += 2 - folhas_viaveis
+
+                        if pilha or (limite_mergulho is not None and pq.tamanho >= limite_mergulho):
+                            # Empilha os nós folhas, o de maior limitante dual por último para ser explorado primeiro.
+                            for folha in sorted((folha for folha in (folha1, folha2) if folha is not None),
+                                                key=lambda folha: folha.limitante_dual):
+                                pilha.append(folha)
+                        else:
+                            # Enfileira os nós folhas.
+                            pq.enqueue(folha1)
+                            pq.enqueue(folha2)
+
+                        if expandidos % self.INTERVALO_VERIFICACAO == 0 and criterios.verificar(
+                                self._importancia_base + limitante_primal,
+                                self._limitante_superior(pq, pilha, limitante_primal), expandidos):
+                            break
+                    # Se o valor for inteiro (índice_fracionado == -1) e se sua importância for maior que o limitante
+                    # primal, indica que uma melhor solução foi encontrada e atualiza o limitante primal e o nó com os
+                    # itens selecionados.
+                    elif node.importancia > limitante_primal:
+                        limitante_primal = node.importancia
+                        melhor_node = node
+                        self.estatisticas.melhoria(self._importancia_base + limitante_primal)
+                        # Próximo do limite de nós, a nova solução é usada para podar a fila.
+                        if limite_mergulho is not None and pq.tamanho >= limite_mergulho:
+                            podados += pq.podar(limitante_primal)
+
+                        limitante_superior = self._limitante_superior(pq, pilha, limitante_primal)
+                        yield (self._importancia_base + limitante_primal, limitante_superior,
+                               lambda node=node: self._itens_selecionados(node))
+                        if criterios.verificar(self._importancia_base + limitante_primal, limitante_superior,
+                                               expandidos):
+                            break
+                    else:
+                        podados += 1
+        finally:
+            # As estatísticas são registradas mesmo que o consumidor da busca a interrompa.
+            criterios.expansoes += expandidos
+            self.tamanho_maximo_fila = max(self.tamanho_maximo_fila, pq.tamanho_maximo)
+            self.estatisticas.incrementar("nos_criados", criados)
+            self.estatisticas.incrementar("nos_expandidos", expandidos)
+            self.estatisticas.incrementar("nos_podados_limitante", podados)
+            self.estatisticas.incrementar("nos_podados_inviabilidade", inviaveis)
+            self.estatisticas.registrar_maximo("tamanho_maximo_fila", self.tamanho_maximo_fila)
+
+        if melhor_node is None:
+            return limitante_primal, None
+
+        with self.estatisticas.fase("materializacao"):
+            return limitante_primal, self._itens_selecionados(melhor_node)
+
+    def _limitantes_opostos(self) -> np.ndarray:
+        """
+        Calcula, para cada item, o limitante dual (de Dantzig) do problema com o item fixado no valor oposto ao que
+        possui na solução gulosa da raiz: itens anteriores ao item crítico são excluídos e os demais, incluídos. Os
+        limitantes de todos os itens são obtidos de uma só vez, com buscas binárias vetorizadas sobre as somas
+        acumuladas.
+
+        :return: Vetor com o limitante de cada item, na ordem da razão importância/valor (-inf se a inclusão do item
+            for inviável).
+        """
+        valor_acumulado = self.instancia.valor_acumulado
+        importancia_acumulada = self.instancia.importancia_acumulada
+        valores = self._valores_ordenados
+        importancias = self._importancias_ordenadas
+        n = len(valores)
+        critico = int(np.searchsorted(valor_acumulado, self.valor_disponivel, side="right")) - 1
+        limitantes = np.empty(n)
+
+        def limitante_dantzig(capacidades, deslocamentos, importancias_base):
+            # Limitante de Dantzig para as capacidades informadas, considerando que a soma acumulada dos itens livres
+            # é a soma acumulada de todos os itens menos o deslocamento (valor do item excluído, se houver).
+            limites = np.searchsorted(valor_acumulado, capacidades + deslocamentos, side="right") - 1
+            restantes = capacidades - (valor_acumulado[limites] - deslocamentos)
+            fracionados = np.where(limites < n, restantes * self._razoes_ordenadas[np.minimum(limites, n - 1)], 0)
+            return importancias_base + importancia_acumulada[limites] + fracionados
+
+        # Itens anteriores ao item crítico, fixados fora da solução: o item crítico se desloca para frente.
+        anteriores = np.arange(critico)
+        limitantes[anteriores] = limitante_dantzig(np.full(critico, self.valor_disponivel), valores[anteriores],
+                                                   -importancias[anteriores])
+        # Item crítico e posteriores, fixados na solução: a capacidade se reduz e o item crítico se desloca para trás,
+        # de modo que o próprio item nunca é contado entre os livres.
+        posteriores = np.arange(critico, n)
+        capacidades = self.valor_disponivel - valores[posteriores]
+        viaveis = capacidades >= 0
+        limitantes[posteriores] = -np.inf
+        limitantes[posteriores[viaveis]] = limitante_dantzig(capacidades[viaveis], 0.0,
+                                                             importancias[posteriores[viaveis]])
+
+        return limitantes
+
+    @staticmethod
+    def _itens_dominados(importancias: np.ndarray, valores: np.ndarray, capacidade: float) -> np.ndarray:
+        """
+        Identifica itens dominados que podem ser excluídos. Um item é dominado por outro de valor menor ou igual e
+        importância maior ou igual. Existe solução ótima em que, se o item estiver incluído, todos os que o dominam
+        também estão; logo, se o item não couber junto com os que o dominam, pode ser excluído.
+
+        :param importancias: Importâncias dos itens.
+        :param valores: Valores dos itens.
+        :param capacidade: Capacidade disponível para os itens.
+        :return: Vetor de booleanos indicando os itens que podem ser excluídos.
+        """
+        m = len(valores)
+        # Ordena por valor crescente e, em caso de empate, por importância decrescente (e pela posição), de modo que
+        # os itens que dominam cada item sejam sempre anteriores a ele.
+        ordem = np.lexsort((np.arange(m), -importancias, valores))
+        # Classificação das importâncias em ordem decrescente (0 para a maior), base da árvore de Fenwick que soma os
+        # valores dos itens já percorridos com importância maior ou igual à do item corrente.
+        _, classificacao = np.unique(-importancias, return_inverse=True)
+        arvore = [0.0] * (int(classificacao.max(initial=0)) + 2)
+        dominados = np.zeros(m, dtype=bool)
+        for item in ordem.tolist():
+            i = int(classificacao[item]) + 1
+            soma = 0.0
+            while i > 0:
+                soma += arvore[i]
+                i -= i & -i
+            if soma + valores[item] > capacidade:
+                dominados[item] = True
+            i = int(classificacao[item]) + 1
+            while i < len(arvore):
+                arvore[i] += valores[item]
+                i += i & -i
+
+        return dominados
+
+    def _resolver_nucleo(self, nucleo: np.ndarray, solucao_base: np.ndarray, limitante_primal: float,
+                         limite_nos: int, fracao_mergulho: float, limitante_externo: float = -np.inf) -> Generator:
+        """
+        Resolve o problema restrito ao núcleo: os itens fora do núcleo permanecem como na solução base e os do núcleo
+        são decididos por uma busca Branch and Bound sobre uma instância apenas com eles.
+
+        É um gerador que, a cada nova melhor solução, produz sua importância, o limitante superior global e uma função
+        que materializa o vetor de bytes (na ordem da razão) da solução.
+
+        :param nucleo: Posições (na ordem da razão importância/valor) dos itens do núcleo.
+        :param solucao_base: Vetor de bytes, na ordem da razão, com a fixação dos itens fora do núcleo.
+        :param limitante_primal: Importância da melhor solução conhecida.
+        :param limite_nos: Quantidade máxima de nós na fila de nós ativos.
+        :param fracao_mergulho: Fração do limite de nós a partir da qual a busca mergulha em profundidade.
+        :param limitante_externo: Limitante das soluções que diferem da solução base fora do núcleo.
+        :return: Importância e vetor de bytes (na ordem da razão) da melhor solução, ou o limitante primal informado e
+            None se o núcleo não contiver solução melhor (valor de retorno do gerador).
+        """
+        subproblema, incluidos, nucleo = self._subproblema_nucleo(nucleo, solucao_base)
+        subproblema._limitante_externo = limitante_externo
+        busca = subproblema._buscar(limite_nos, fracao_mergulho, limitante_primal - subproblema._importancia_base)
+        while True:
+            try:
+                importancia, limitante_superior, materializar = next(busca)
+            except StopIteration as fim:
+                importancia, selecionados = fim.value
+                break
+            yield (importancia, limitante_superior,
+                   lambda materializar=materializar: self._solucao_nucleo(incluidos, nucleo, materializar()))
+        self.tamanho_maximo_fila = max(self.tamanho_maximo_fila, subproblema.tamanho_maximo_fila)
+        if selecionados is None:
+            return limitante_primal, None
+
+        return subproblema._importancia_base + importancia, self._solucao_nucleo(incluidos, nucleo, selecionados)
+
+    def _subproblema_nucleo(self, nucleo: np.ndarray, solucao_base: np.ndarray) -> tuple:
+        """
+        Cria o solver do problema restrito ao núcleo, com os itens fora do núcleo fixados como na solução base. Os
+        itens dominados do núcleo são excluídos.
 
-        # Solução ótima encontrada. Neste caso, começa com zero, dado que, até o momento, a solução inicial é a melhor
-        # solução.
-        limitante_primal = 0
+        :param nucleo: Posições (na ordem da razão importância/valor) dos itens do núcleo.
+        :param solucao_base: Vetor de bytes, na ordem da razão, com a fixação dos itens fora do núcleo.
+        :return: Solver do subproblema, vetor booleano com os itens incluídos fora do núcleo e posições dos itens do
+            núcleo que não foram excluídos.
+        """
+        fora_nucleo = np.ones(len(solucao_base), dtype=bool)
+        fora_nucleo[nucleo] = False
+        incluidos = fora_nucleo & (solucao_base == 1)
+        importancia_base = float(self._importancias_ordenadas[incluidos].sum())
+        capacidade = self.valor_disponivel - float(self._valores_ordenados[incluidos].sum())
+
+        # Itens dominados do núcleo são excluídos antes da busca.
+        importancias = self._importancias_ordenadas[nucleo]
+        valores = self._valores_ordenados[nucleo]
+        nucleo = nucleo[~self._itens_dominados(importancias, valores, capacidade)]
+
+        subproblema = BranchAndBoundKnapsackSolver(capacidade, InstanciaKnapsack(self._importancias_ordenadas[nucleo],
+                                                                                 self._valores_ordenados[nucleo]))
+        subproblema._preparar()
+        # O subproblema acumula suas estatísticas nas do solver e compartilha seus critérios de parada.
+        subproblema.estatisticas = self.estatisticas
+        subproblema._criterios = self._criterios
+        subproblema._importancia_base = importancia_base
+
+        return subproblema, incluidos, nucleo
+
+    @staticmethod
+    def _solucao_nucleo(incluidos: np.ndarray, nucleo: np.ndarray, selecionados: np.ndarray) -> np.ndarray:
+        """
+        Monta o vetor de bytes (na ordem da razão) de uma solução do núcleo.
+
+        :param incluidos: Vetor booleano com os itens incluídos fora do núcleo.
+        :param nucleo: Posições dos itens do núcleo.
+        :param selecionados: Posições, no núcleo, dos itens selecionados.
+        :return: Vetor de bytes com a solução.
+        """
+        solucao = incluidos.astype(np.uint8)
+        solucao[nucleo[selecionados]] = 1
+
+        return solucao
+
+    def _arredondar_limitante(self, limitante: float) -> float:
+        # Com importâncias inteiras, o limitante pode ser arredondado para baixo.
+        if self._importancias_inteiras and np.isfinite(limitante):
+            return math.floor(limitante + 1e-6)
+
+        return limitante
+
+    def _solucao_inicial(self, tempo_tabu: float, solucao_inicial: SolucaoKnapsack) -> tuple:
+        """
+        Obtém a solução inicial do pré-processamento: a melhor entre a solução do algoritmo guloso (ou de uma Busca
+        Tabu curta) e a solução inicial informada.
+
+        :param tempo_tabu: Tempo, em segundos, da Busca Tabu. Se zero, é utilizada apenas a solução gulosa.
+        :param solucao_inicial: Solução viável conhecida (None se não houver).
+        :return: Solução inicial e limitante de Dantzig da raiz, obtido com a solução gulosa.
+        """
+        solucao_gulosa = GreedyKnapsackSolver(self.valor_disponivel, self.instancia).solucionar()
+        limitante_raiz = self._arredondar_limitante(solucao_gulosa.limitante_superior)
+        if solucao_inicial is None or solucao_gulosa.importancia > solucao_inicial.importancia:
+            solucao_inicial = solucao_gulosa
+        if tempo_tabu > 0:
+            solucao_tabu = TabuSearchKnapsackSolver(self.valor_disponivel,
+                                                    self.instancia).solucionar(timeout=tempo_tabu)
+            if solucao_tabu.importancia > solucao_inicial.importancia:
+                solucao_inicial = solucao_tabu
+        self.estatisticas.melhoria(solucao_inicial.importancia)
+
+        return solucao_inicial, limitante_raiz
+
+    def _solucao_base(self) -> tuple:
+        """
+        Obtém a solução base do pré-processamento (solução gulosa da raiz, que inclui os itens anteriores ao item
+        crítico) e os limitantes com a fixação oposta à da solução base de cada item. Requer os vetores ordenados.
+
+        :return: Posição do item crítico, vetor de bytes com a solução base e vetor com os limitantes com a fixação
+            oposta, ambos na ordem da razão importância/valor.
+        """
+        critico = int(np.searchsorted(self.instancia.valor_acumulado, self.valor_disponivel, side="right")) - 1
+        solucao_base = np.zeros(len(self.instancia), dtype=np.uint8)
+        solucao_base[:critico] = 1
+
+        return critico, solucao_base, self._limitantes_opostos()
+
+    def _iterar_com_presolve(self, limite_nos: int, fracao_mergulho: float, tempo_tabu: float,
+                             tamanho_nucleo: int, solucao_inicial: SolucaoKnapsack = None) -> Generator:
+        """
+        Soluciona o problema com a etapa de pré-processamento (*presolve*):
+
+        1. o limitante primal é iniciado com a melhor entre a solução do algoritmo guloso (ou de uma Busca Tabu curta)
+           e a solução inicial informada;
+        2. itens cujo limitante com a fixação oposta à da solução gulosa da raiz não supera o limitante primal são
+           fixados;
+        3. a busca é feita sobre um núcleo de itens livres em torno do item crítico, com os demais itens fixados como
+           na solução gulosa da raiz. Os itens dominados do núcleo são excluídos;
+        4. com o novo limitante primal, os itens livres fora do núcleo são testados novamente. Os que não puderem ser
+           fixados são incluídos no núcleo e a busca é repetida; caso contrário, a solução é ótima.
+
+        A solução gulosa e o limitante de Dantzig da raiz são obtidos por seleção parcial, sem ordenar os itens. A
+        ordenação completa só é feita se a solução inicial não atender aos critérios de parada.
+
+        O limitante superior global é o maior entre o limitante da busca no núcleo e os limitantes com a fixação
+        oposta dos itens livres fora do núcleo. É um gerador que, a cada nova melhor solução (a começar pela inicial),
+        produz sua importância, o limitante superior global e uma função que materializa as posições, na instância,
+        dos itens da solução.
+
+        :return: Melhor solução encontrada (valor de retorno do gerador).
+        """
+        estatisticas = self.estatisticas
+        with estatisticas.fase("presolve"):
+
+            # 1. Solução inicial. A solução gulosa traz o limitante de Dantzig da raiz.
+            solucao_inicial, limitante_raiz = self._solucao_inicial(tempo_tabu, solucao_inicial)
+            limitante_primal = solucao_inicial.importancia
+            melhor_solucao = None
+
+        # A solução inicial já pode atender à tolerância de gap, sem nenhuma busca (e sem ordenar os itens).
+        yield limitante_primal, max(limitante_raiz, limitante_primal), lambda: solucao_inicial.selecionados
+        if self._criterios.verificar(limitante_primal, limitante_raiz):
+            return solucao_inicial
+
+        with estatisticas.fase("preparacao"):
+            self._ordenar()
+        ordem = self.instancia.ordem
+        with estatisticas.fase("presolve"):
+            # 2. Fixação de itens pelos limitantes com a fixação oposta.
+            critico, solucao_base, limitantes_opostos = self._solucao_base()
+
+        # 3 e 4. Busca no núcleo em torno do item crítico, expandido enquanto houver itens livres fora dele.
+        livres = np.flatnonzero(self._pode_superar(limitantes_opostos, limitante_primal))
+        inicio = max(int(np.searchsorted(livres, critico)) - tamanho_nucleo // 2, 0)
+        nucleo = livres[inicio:inicio + tamanho_nucleo]
+        while True:
+            # Soluções que diferem da solução base em algum item livre fora do núcleo são limitadas pelo limitante com
+            # a fixação oposta desse item.
+            fora_nucleo = np.setdiff1d(livres, nucleo, assume_unique=True)
+            limitante_externo = self._arredondar_limitante(float(limitantes_opostos[fora_nucleo].max(initial=-np.inf)))
+            busca = self._resolver_nucleo(nucleo, solucao_base, limitante_primal, limite_nos, fracao_mergulho,
+                                          limitante_externo)
+            while True:
+                try:
+                    importancia, limitante_superior, materializar = next(busca)
+                except StopIteration as fim:
+                    importancia, solucao = fim.value
+                    break
+                yield (importancia, limitante_superior,
+                       lambda materializar=materializar: ordem[np.flatnonzero(materializar())])
+            if solucao is not None:
+                limitante_primal = importancia
+                melhor_solucao = solucao
+            if self._criterios.interrompida:
+                break
+
+            livres = np.flatnonzero(self._pode_superar(limitantes_opostos, limitante_primal))
+            fora_nucleo = np.setdiff1d(livres, nucleo, assume_unique=True)
+            if len(fora_nucleo) == 0:
+                break
+            nucleo = np.union1d(nucleo, fora_nucleo)
+
+        if melhor_solucao is None:
+            return solucao_inicial
+
+        with estatisticas.fase("materializacao"):
+            return SolucaoKnapsack(self.instancia, ordem[np.flatnonzero(melhor_solucao)])
+
+    def solucionar(self, limite_nos: int = None, fracao_mergulho: float = 0.9, presolve: bool = True,
+                   tempo_tabu: float = 0, tamanho_nucleo: int = 64, solucao_inicial: SolucaoKnapsack = None,
+                   tolerancia_gap: float = 0.0, tolerancia_gap_absoluta: float = 0.0, limite_expansoes: int = None,
+                   timeout: float = None) -> SolucaoKnapsack:
+        """
+        Implementa o algoritmo que soluciona o Problema da Mochila Binária (0-1 Knapsack Problem).
+
+        A busca é feita pelo melhor limitante dual (*best-first*). Se for informado um limite de nós, quando a fila de
+        nós ativos se aproxima do limite a busca passa a mergulhar em profundidade (*depth-first*) a partir do nó
+        retirado da fila: os nós filhos são empilhados em vez de enfileirados, o que encontra soluções inteiras
+        rapidamente. A cada nova solução encontrada durante o mergulho, a fila é podada pelo novo limitante primal.
+        A pilha do mergulho não ultrapassa a quantidade de itens da instância.
+
+        A busca pode ser interrompida antes da comprovação da otimalidade por tolerância de *gap*, limite de nós
+        expandidos ou tempo limite. A solução retornada é sempre a melhor encontrada, com o limitante superior que
+        certifica sua qualidade (atributos `limitante_superior`, `gap` e `gap_relativo`). Sem interrupção, a solução é
+        ótima e o limitante é a sua própria importância.
+
+        :param limite_nos: Quantidade máxima de nós na fila de nós ativos. Se não informado, a fila não é limitada.
+        :param fracao_mergulho: Fração do limite de nós a partir da qual a busca mergulha em profundidade.
+        :param presolve: Indica se deverá ser executado o pré-processamento: solução inicial gulosa (ou da Busca
+            Tabu), fixação de itens por limitantes, exclusão de itens dominados e busca sobre um núcleo de itens em
+            torno do item crítico, expandido apenas se necessário.
+        :param tempo_tabu: Tempo, em segundos, de uma Busca Tabu executada no pré-processamento para melhorar a
+            solução inicial. Se zero, é utilizada apenas a solução do algoritmo guloso.
+        :param tamanho_nucleo: Quantidade inicial de itens livres do núcleo.
+        :param solucao_inicial: Solução viável conhecida (por exemplo, de uma execução anterior com poucos itens
+            alterados), utilizada como limitante primal inicial. Só é retornada se nenhuma solução melhor for
+            encontrada.
+        :param tolerancia_gap: Interrompe a busca quando o gap relativo (distância entre o limitante superior e a
+            importância da melhor solução, dividida pela importância) não ultrapassar esse valor. Por exemplo, 0.001
+            para 0,1%.
+        :param tolerancia_gap_absoluta: Interrompe a busca quando o gap absoluto não ultrapassar esse valor.
+        :param limite_expansoes: Quantidade máxima de nós expandidos. Se não informada, a busca não é limitada.
+        :param timeout: Tempo máximo de execução, em segundos. Se não informado, a busca não é limitada.
+        :return: Solução contendo os itens selecionados para compor o orçamento. O pico da fila de nós ativos fica
+            disponível no atributo tamanho_maximo_fila do solver e os nós criados, expandidos e podados e o motivo
+            da interrupção, se houver, nas estatísticas.
+        """
+        return self._esgotar(self._executar(limite_nos, fracao_mergulho, presolve, tempo_tabu, tamanho_nucleo,
+                                            solucao_inicial, tolerancia_gap, tolerancia_gap_absoluta,
+                                            limite_expansoes, timeout))
+
+    def solucionar_iterativo(self, limite_nos: int = None, fracao_mergulho: float = 0.9, presolve: bool = True,
+                             tempo_tabu: float = 0, tamanho_nucleo: int = 64, solucao_inicial: SolucaoKnapsack = None,
+                             tolerancia_gap: float = 0.0, tolerancia_gap_absoluta: float = 0.0,
+                             limite_expansoes: int = None, timeout: float = None) -> Iterator[SolucaoKnapsack]:
+        """
+        Soluciona o problema produzindo cada nova melhor solução assim que encontrada, com o limitante superior
+        global no momento. Com o pré-processamento, a primeira solução é a do algoritmo guloso, disponível quase
+        imediatamente. A última solução produzida é a solução final, com o limitante superior que certifica sua
+        qualidade. O consumidor pode interromper a iteração a qualquer momento, por exemplo, quando o gap for
+        suficiente para a sua finalidade.
+
+        Os parâmetros são os mesmos do método `solucionar`.
+
+        :return: Iterador das soluções encontradas, em ordem crescente de importância.
+        """
+        execucao = self._executar(limite_nos, fracao_mergulho, presolve, tempo_tabu, tamanho_nucleo, solucao_inicial,
+                                  tolerancia_gap, tolerancia_gap_absoluta, limite_expansoes, timeout)
+        while True:
+            try:
+                _, limitante_superior, materializar = next(execucao)
+            except StopIteration as fim:
+                yield fim.value
+                return
+            yield SolucaoKnapsack(self.instancia, materializar()).certificar(limitante_superior)
 
-        itens_selecionados = []
-        if node.limitante_dual > 0:
-            # Enfileira o nó raiz.
+    def solucionar_paralelo(self, processos: int = None, tempo_tabu: float = 0,
+                            solucao_inicial: SolucaoKnapsack = None, tolerancia_gap: float = 0.0,
+                            tolerancia_gap_absoluta: float = 0.0, limite_expansoes: int = None,
+                            timeout: float = None) -> SolucaoKnapsack:
+        """
+        Soluciona o problema com a busca Branch and Bound distribuída entre processos auxiliares.
+
+        O pré-processamento é o mesmo do método `solucionar` (solução inicial, fixação de itens pelos limitantes com a
+        fixação oposta e exclusão de itens dominados), mas todos os itens livres compõem um único núcleo, cuja árvore
+        é dividida entre os processos. Cada processo faz a busca pelo melhor limitante dual em sua própria fila de
+        prioridade. Os processos ociosos recebem parte dos nós dos processos ocupados (*work stealing*) e todos podam
+        pelo limitante primal global, publicado em um incumbente compartilhado. Os nós são transmitidos apenas com o
+        conjunto de itens fixados e seus limitantes são recalculados no processo que os recebe. Os vetores da
+        instância são publicados uma única vez em memória compartilhada.
+
+        Os critérios de parada são os mesmos do método `solucionar`. O processo principal compara periodicamente o
+        incumbente compartilhado ao maior limitante dual informado pelos processos e encerra a busca quando algum
+        critério é atingido.
+
+        :param processos: Quantidade de processos auxiliares. Padrão igual à quantidade de processadores.
+        :param tempo_tabu: Tempo, em segundos, de uma Busca Tabu executada no pré-processamento para melhorar a
+            solução inicial. Se zero, é utilizada apenas a solução do algoritmo guloso.
+        :param solucao_inicial: Solução viável conhecida, utilizada como limitante primal inicial. Só é retornada se
+            nenhuma solução melhor for encontrada.
+        :param tolerancia_gap: Interrompe a busca quando o gap relativo não ultrapassar esse valor.
+        :param tolerancia_gap_absoluta: Interrompe a busca quando o gap absoluto não ultrapassar esse valor.
+        :param limite_expansoes: Quantidade máxima de nós expandidos, somados todos os processos. Se não informada, a
+            busca não é limitada.
+        :param timeout: Tempo máximo de execução, em segundos. Se não informado, a busca não é limitada. Em qualquer
+            interrupção, a solução é certificada pelo maior limitante dual dos nós restantes nas filas dos processos.
+        :return: Solução contendo os itens selecionados para compor o orçamento. Os nós criados, expandidos e podados,
+            somados todos os processos, e a quantidade de envios de nós entre processos ficam disponíveis nas
+            estatísticas.
+        """
+        self.estatisticas.reiniciar()
+        criterios = CriteriosParada(tolerancia_gap, tolerancia_gap_absoluta, limite_expansoes, timeout)
+        with self.estatisticas.fase("preparacao"):
+            self._preparar()
+        self._criterios = criterios
+        if len(self.instancia) == 0:
+            return self._certificar(SolucaoKnapsack(self.instancia, []), criterios)
+
+        with self.estatisticas.fase("presolve"):
+            solucao_inicial, limitante_raiz = self._solucao_inicial(tempo_tabu, solucao_inicial)
+        # A solução inicial já pode atender à tolerância de gap, sem nenhuma busca.
+        if criterios.verificar(solucao_inicial.importancia, limitante_raiz):
+            return self._certificar(solucao_inicial, criterios)
+
+        with self.estatisticas.fase("presolve"):
+            _, solucao_base, limitantes_opostos = self._solucao_base()
+            livres = np.flatnonzero(self._pode_superar(limitantes_opostos, solucao_inicial.importancia))
+            subproblema, incluidos, nucleo = self._subproblema_nucleo(livres, solucao_base)
+
+        with self.estatisticas.fase("busca"):
+            _, selecionados = subproblema._buscar_paralelo(processos or os.cpu_count() or 1,
+                                                           solucao_inicial.importancia - subproblema._importancia_base)
+        self.tamanho_maximo_fila = subproblema.tamanho_maximo_fila
+        if selecionados is None:
+            return self._certificar(solucao_inicial, criterios)
+
+        with self.estatisticas.fase("materializacao"):
+            solucao = SolucaoKnapsack(self.instancia, self.instancia.ordem[
+                np.flatnonzero(self._solucao_nucleo(incluidos, nucleo, selecionados))])
+
+        return self._certificar(solucao, criterios)
+
+    def _buscar_paralelo(self, processos: int, limitante_primal: float) -> tuple:
+        """
+        Executa a busca Branch and Bound sobre a instância do solver, distribuída entre processos auxiliares. O nó raiz
+        é entregue ao primeiro processo e os demais recebem trabalho por roubo.
+
+        :param processos: Quantidade de processos auxiliares.
+        :param limitante_primal: Importância de uma solução já conhecida. Só são retornadas soluções melhores.
+        :return: Importância e posições, na instância, dos itens da melhor solução encontrada; ou o limitante primal
+            informado e None, se nenhuma solução melhor for encontrada.
+        """
+        criterios = self._criterios
+        raiz = self._criar_no(None, -1, 0, np.empty(0, dtype=np.intp), np.empty(0, dtype=np.uint8))
+        if raiz is None or not self._pode_superar(raiz.limitante_dual, limitante_primal):
+            return limitante_primal, None
+
+        n = len(self.instancia)
+        incumbente = IncumbenteCompartilhado(n)
+        incumbente.publicar(limitante_primal, np.zeros(n, dtype=np.uint8))
+        distribuicao = DistribuicaoTrabalho(processos)
+        with InstanciaCompartilhada(self.instancia) as instancia_compartilhada:
+            with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_processo_branch_and_bound,
+                                     initargs=(instancia_compartilhada.descritor, self.valor_disponivel, incumbente,
+                                               distribuicao)) as executor:
+                tarefas = [executor.submit(_executar_busca_paralela, k) for k in range(processos)]
+                distribuicao.reivindicar(0)
+                distribuicao.enviar(0, self._codificar([raiz]), raiz.limitante_dual)
+
+                while True:
+                    intervalo = self.INTERVALO_ACOMPANHAMENTO
+                    if criterios.prazo is not None:
+                        intervalo = min(intervalo, max(criterios.prazo - time.perf_counter(), 0))
+                    _, pendentes = wait(tarefas, timeout=intervalo)
+                    if not pendentes:
+                        break
+                    # O incumbente global é comparado ao maior limitante informado pelos processos, como na busca
+                    # serial. A busca pode ter terminado entre o fim da espera e o encerramento.
+                    limitante = max(distribuicao.limitante, incumbente.importancia)
+                    if criterios.verificar(self._importancia_base + incumbente.importancia,
+                                           max(self._arredondar_limitante(limitante + self._importancia_base),
+                                               self._limitante_externo), distribuicao.expansoes):
+                        if not distribuicao.encerrar():
+                            criterios.motivo = None
+                        break
+                resultados = [tarefa.result() for tarefa in tarefas]
+
+        importancia, solucao, versao = incumbente.consultar()
+        expandidos = sum(resultado["nos_expandidos"] for resultado in resultados)
+        criterios.expansoes += expandidos
+        self.estatisticas.registrar("processos", processos)
+        self.estatisticas.incrementar("nos_criados", 1 + sum(resultado["nos_criados"] for resultado in resultados))
+        self.estatisticas.incrementar("nos_expandidos", expandidos)
+        for contador in ("nos_podados_limitante", "nos_podados_inviabilidade", "envios_nos"):
+            self.estatisticas.incrementar(contador, sum(resultado[contador] for resultado in resultados))
+        self.tamanho_maximo_fila = max(self.tamanho_maximo_fila,
+                                       max(resultado["tamanho_maximo_fila"] for resultado in resultados))
+        self.estatisticas.registrar_maximo("tamanho_maximo_fila", self.tamanho_maximo_fila)
+        if criterios.interrompida:
+            # Os nós restantes nas filas dos processos limitam as soluções ainda não exploradas.
+            limitante = max(importancia, max(resultado["limitante_restante"] for resultado in resultados))
+            criterios.limitante_superior = max(self._arredondar_limitante(limitante + self._importancia_base),
+                                               self._limitante_externo)
+
+        # A primeira versão do incumbente é o limitante primal informado; as demais são soluções dos processos.
+        if versao == 1:
+            return limitante_primal, None
+        self.estatisticas.melhoria(self._importancia_base + importancia)
+
+        return importancia, np.flatnonzero(solucao)
+
+    def _executar(self, limite_nos: int, fracao_mergulho: float, presolve: bool, tempo_tabu: float,
+                  tamanho_nucleo: int, solucao_inicial: SolucaoKnapsack, tolerancia_gap: float,
+                  tolerancia_gap_absoluta: float, limite_expansoes: int, timeout: float) -> Generator:
+        """
+        Executa a busca, com as estatísticas, produzindo a importância, o limitante superior global e a função de
+        materialização de cada nova melhor solução.
+
+        :return: Solução final certificada (valor de retorno do gerador).
+        """
+        self.estatisticas.reiniciar()
+        criterios = CriteriosParada(tolerancia_gap, tolerancia_gap_absoluta, limite_expansoes, timeout)
+        presolve = presolve and len(self.instancia) > 0
+        with self.estatisticas.fase("preparacao"):
+            self._preparar(ordenar=not presolve)
+        self._criterios = criterios
+
+        if presolve:
+            solucao = yield from self._iterar_com_presolve(limite_nos, fracao_mergulho, tempo_tabu, tamanho_nucleo,
+                                                           solucao_inicial)
+        else:
+            limitante_primal = solucao_inicial.importancia if solucao_inicial is not None else 0
+            _, selecionados = yield from self._buscar(limite_nos, fracao_mergulho, limitante_primal)
+
+            # Retorna a solução com os itens que foram selecionados (proporção = 1).
+            if selecionados is None:
+                solucao = solucao_inicial if solucao_inicial is not None else SolucaoKnapsack(self.instancia, [])
+            else:
+                solucao = SolucaoKnapsack(self.instancia, selecionados)
+
+        return self._certificar(solucao, criterios)
+
+    def _certificar(self, solucao: SolucaoKnapsack, criterios: CriteriosParada) -> SolucaoKnapsack:
+        """
+        Certifica a solução final e conclui as estatísticas.
+
+        :param solucao: Melhor solução encontrada.
+        :param criterios: Critérios de parada da busca.
+        :return: Solução certificada.
+        """
+        # Sem interrupção, a busca comprova a otimalidade. Caso contrário, o certificado é o menor limitante superior
+        # calculado durante a busca.
+        otima = criterios.motivo in (None, "otimalidade")
+        solucao.certificar(None if otima else criterios.limitante_superior)
+        self.estatisticas.registrar("motivo_parada", criterios.motivo or "otimalidade")
+        self.estatisticas.registrar("limitante_superior", solucao.limitante_superior)
+        self.estatisticas.registrar("gap", solucao.gap)
+
+        return self.estatisticas.concluir(solucao)
+
+
+def _inicializar_processo_branch_and_bound(descritor: tuple, valor_disponivel: float,
+                                           incumbente: IncumbenteCompartilhado, distribuicao: DistribuicaoTrabalho):
+    """
+    Inicializa um processo auxiliar do Branch and Bound paralelo, anexando a instância compartilhada, o incumbente e a
+    distribuição de trabalho. Os vetores ordenados da instância são preparados uma única vez por processo.
+    """
+    instancia, _estado_processo["memoria"] = InstanciaCompartilhada.anexar(descritor)
+    solver = BranchAndBoundKnapsackSolver(valor_disponivel, instancia)
+    solver._preparar()
+    _estado_processo["solver"] = solver
+    _estado_processo["incumbente"] = incumbente
+    _estado_processo["distribuicao"] = distribuicao
+
+
+def _executar_busca_paralela(processo: int) -> dict:
+    """
+    Executa, em um processo auxiliar, a busca Branch and Bound sobre os nós recebidos, em sua própria fila de
+    prioridade. A cada INTERVALO_DOACAO nós, verifica o encerramento da busca, envia parte de sua fila a um processo
+    ocioso, se houver, e informa o maior limitante dual de sua fila e a quantidade de nós expandidos. Quando a fila se
+    esgota, o processo se declara ocioso e aguarda novos nós.
+
+    :param processo: Índice do processo na distribuição de trabalho.
+    :return: Contadores da busca no processo e maior limitante dual dos nós restantes na fila (-inf se não houver).
+    """
+    solver = _estado_processo["solver"]
+    incumbente = _estado_processo["incumbente"]
+    distribuicao = _estado_processo["distribuicao"]
+    pq = solver.PriorityQueue()
+    criados, inviaveis, expandidos, podados, envios = 0, 0, 0, 0, 0
+
+    interrompida = False
+    while not interrompida:
+        codificados = distribuicao.receber(processo)
+        if codificados is None:
+            break
+        for node in solver._decodificar(codificados):
             pq.enqueue(node)
 
-            while pq.tamanho != 0:
-                # Remove o nó ativo com o melhor limitante dual.
-                node = pq.dequeue()
-
-                # Antes de ramificar, verifica se existe elemento com limitante dual composto por valor fracionado.
-                # Se existir e o limitante dual for maior que o limitante primal, continua a ramificação da árvore, caso
-                # contrário, despreza o nó ativo dado que solução melhor já existe (poda por limitante).
-                if node.indice_fracionado > -1 and node.limitante_dual > limitante_primal:
-                    # Ramifica o nó corrente. Caso o valor do nó corrente
-                    folha1, folha2 = node.ramificar()
-
-                    # Enfileira os nós folhas.
-                    pq.enqueue(folha1)
-                    pq.enqueue(folha2)
-                # Se o valor for inteiro (índice_fracionado == -1) e se sua importância for maior que o limitante
-                # primal, indica que uma melhor solução foi encontrada e atualiza o limitante primal e a lista de itens
-                # selecionados.
-                elif node.importancia > limitante_primal:
-                    limitante_primal = node.importancia
-                    itens_selecionados = node.itens_selecionados
-
-        # Atualiza o dataframe de itens para indicar os itens que foram selecionados (proporção = 1).
-        self.itens.loc[itens_selecionados, "proporcao"] = 1
-
-        # Reordena o dataset para a ordem original.
-        self.itens.sort_index(inplace=True)
-
-        return self.itens
+        retirados = 0
+        while pq.tamanho != 0:
+            if retirados % solver.INTERVALO_DOACAO == 0:
+                if distribuicao.encerrada:
+                    interrompida = True
+                    break
+                if distribuicao.ha_ociosos and pq.tamanho > 1:
+                    ocioso = distribuicao.reivindicar()
+                    if ocioso is not None:
+                        doados = pq.dividir(solver.TAMANHO_MAXIMO_DOACAO)
+                        distribuicao.enviar(ocioso, solver._codificar(doados),
+                                            max(node.limitante_dual for node in doados))
+                        envios += 1
+                # Os nós filhos não superam o limitante do nó pai: até a próxima verificação, o limitante informado
+                # só pode superestimar o dos nós da fila.
+                distribuicao.informar(processo, -pq.pqueue[0][0], expandidos)
+            retirados += 1
+
+            node = pq.dequeue()
+            # O limitante primal é o global, atualizado pelas soluções de todos os processos.
+            limitante_primal = incumbente.importancia
+            # A parte inteira da solução de qualquer nó é viável e, se for melhor, é publicada para fortalecer a poda
+            # em todos os processos antes que a busca alcance as folhas.
+            if node.importancia > limitante_primal:
+                solucao = np.zeros(len(solver.instancia), dtype=np.uint8)
+                solucao[solver._itens_selecionados(node)] = 1
+                incumbente.publicar(node.importancia, solucao)
+                limitante_primal = node.importancia
+            if node.indice_fracionado > -1 and solver._pode_superar(node.limitante_dual, limitante_primal):
+                folha1, folha2 = solver._ramificar(node)
+                expandidos += 1
+                folhas_viaveis = (folha1 is not None) + (folha2 is not None)
+                criados += folhas_viaveis
+                inviaveis += 2 - folhas_viaveis
+                pq.enqueue(folha1)
+                pq.enqueue(folha2)
+            elif node.indice_fracionado > -1:
+                podados += 1
+
+        if not interrompida:
+            distribuicao.ocioso(processo)
+
+    return {"nos_criados": criados, "nos_expandidos": expandidos, "nos_podados_limitante": podados,
+            "nos_podados_inviabilidade": inviaveis, "envios_nos": envios, "tamanho_maximo_fila": pq.tamanho_maximo,
+            "limitante_restante": -pq.pqueue[0][0] if pq.tamanho else -np.inf}
@@ -0,0 +1,287 @@
+"""Benchmark dos solvers do Problema da Mochila Binária sobre famílias de instâncias sintéticas."""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from instancia_knapsack import InstanciaKnapsack
+from knapsack_utils import KnapsackSolverFactory
+from paralelismo_knapsack import InstanciaCompartilhada
+from portfolio_knapsack import ModeloCusto
+
+FAMILIAS = ("nao_correlacionada", "fracamente_correlacionada", "fortemente_correlacionada",
+            "inversamente_fortemente_correlacionada", "soma_de_subconjuntos")
+"""
+Famílias clássicas de instâncias do Problema da Mochila Binária (Pisinger).
+"""
+
+SOLVERS_EXATOS = (KnapsackSolverFactory.DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER,
+                  KnapsackSolverFactory.BRANCH_AND_BOUND_KNAPSACK_SOLVER,
+                  KnapsackSolverFactory.ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER,
+                  KnapsackSolverFactory.AUTO_KNAPSACK_SOLVER, KnapsackSolverFactory.RACING_KNAPSACK_SOLVER)
+"""
+Tipos de *solver* cujas soluções são ótimas comprovadas e servem de referência para a qualidade dos demais.
+"""
+
+
+def gerar_instancia(familia: str, n: int, amplitude: int = 1000, razao_capacidade: float = 0.5,
+                    semente: int = None) -> tuple:
+    """
+    Gera uma instância sintética com valores (pesos) inteiros em [1, amplitude] e importâncias conforme a família:
+
+    - nao_correlacionada: importâncias independentes em [1, amplitude];
+    - fracamente_correlacionada: importâncias em [valor - amplitude/10, valor + amplitude/10], no mínimo 1;
+    - fortemente_correlacionada: importância = valor + amplitude/10;
+    - inversamente_fortemente_correlacionada: importâncias em [1, amplitude] e valor = importância + amplitude/10;
+    - soma_de_subconjuntos: importância = valor.
+
+    :param familia: Família da instância (uma das FAMILIAS).
+    :param n: Quantidade de itens.
+    :param amplitude: Maior valor (e importância) sorteado.
+    :param razao_capacidade: Valor disponível como fração da soma dos valores.
+    :param semente: Semente do gerador de números aleatórios.
+    :return: Instância gerada e valor disponível.
+    :raises ValueError: Se a família não existir.
+    """
+    gerador = np.random.default_rng(semente)
+    valor = gerador.integers(1, amplitude + 1, n)
+    deslocamento = amplitude // 10
+    if familia == "nao_correlacionada":
+        importancia = gerador.integers(1, amplitude + 1, n)
+    elif familia == "fracamente_correlacionada":
+        importancia = np.maximum(valor + gerador.integers(-deslocamento, deslocamento + 1, n), 1)
+    elif familia == "fortemente_correlacionada":
+        importancia = valor + deslocamento
+    elif familia == "inversamente_fortemente_correlacionada":
+        importancia = valor
+        valor = importancia + deslocamento
+    elif familia == "soma_de_subconjuntos":
+        importancia = valor
+    else:
+        raise ValueError("Família de instâncias inválida: {}.".format(familia))
+
+    return InstanciaKnapsack(importancia, valor), float(np.floor(razao_capacidade * valor.sum()))
+
+
+def _executar_solver(descritor: tuple, valor_disponivel: float, tipo: int, parametros: dict, rastrear_memoria: bool,
+                     conexao):
+    """
+    Executa um *solver* em um processo auxiliar sobre a instância publicada em memória compartilhada e envia, pela
+    conexão, o tempo de execução, o pico de memória alocada (tracemalloc, que contabiliza as alocações do Python e do
+    NumPy, apenas se rastrear_memoria for verdadeiro), o pico de memória residente do processo (que inclui bibliotecas
+    nativas, como o OR-Tools), a importância e o valor da solução.
+    """
+    instancia, memoria = InstanciaCompartilhada.anexar(descritor)
+    try:
+        pico = None
+        if rastrear_memoria:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        solucao = KnapsackSolverFactory.get_solver(tipo, valor_disponivel, instancia).solucionar(**parametros)
+        tempo = time.perf_counter() - inicio
+        if rastrear_memoria:
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        # No Linux, ru_maxrss é informado em kilobytes.
+        pico_residente = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        conexao.send(("concluido", tempo, pico, pico_residente, solucao.importancia, solucao.valor))
+    except Exception as erro:
+        conexao.send(("erro: " + repr(erro), None, None, None, None, None))
+    finally:
+        del instancia
+        memoria.close()
+        conexao.close()
+
+
+def _medir(compartilhada: InstanciaCompartilhada, valor_disponivel: float, tipo: int, parametros: dict,
+           limite_tempo: float, rastrear_memoria: bool = False) -> tuple:
+    """
+    Mede uma execução de um *solver* em um processo isolado, que é encerrado se exceder o limite de tempo.
+    """
+    recepcao, envio = multiprocessing.Pipe(duplex=False)
+    processo = multiprocessing.Process(target=_executar_solver,
+                                       args=(compartilhada.descritor, valor_disponivel, tipo, parametros,
+                                             rastrear_memoria, envio))
+    processo.start()
+    envio.close()
+    resultado = ("tempo_esgotado", None, None, None, None, None)
+    if recepcao.poll(limite_tempo):
+        try:
+            resultado = recepcao.recv()
+        except EOFError:
+            resultado = ("falha", None, None, None, None, None)
+    processo.join(1)
+    if processo.is_alive():
+        processo.terminate()
+        processo.join()
+    elif resultado[0] == "tempo_esgotado" and processo.exitcode != 0:
+        # O processo terminou sem enviar o resultado (por exemplo, encerrado por falta de memória).
+        resultado = ("falha (código {})".format(processo.exitcode), None, None, None, None, None)
+    recepcao.close()
+
+    return resultado
+
+
+def executar_benchmark(familias=FAMILIAS, tamanhos=(100, 1000, 10000), razoes_capacidade=(0.5,), solvers=None,
+                       repeticoes: int = 3, limite_tempo: float = 60.0, parametros: dict = None,
+                       amplitudes=(1000,), semente: int = 0, arquivo: str = None, verbose: bool = False) -> dict:
+    """
+    Executa os *solvers* sobre as instâncias geradas para cada família, tamanho (de 10² a 10⁶ itens) e razão de
+    capacidade. Cada execução é feita em um processo isolado, com limite de tempo, e registra o tempo de execução, o
+    pico de memória residente do processo e a qualidade da solução em relação ao ótimo comprovado (a melhor solução dos
+    *solvers* exatos que concluíram). O rastreamento do tracemalloc torna as alocações mais lentas (várias vezes, no
+    Branch and Bound), de modo que as repetições são cronometradas sem ele e o pico de memória alocada é medido em
+    uma execução adicional, registrado em todas as repetições do *solver* na instância.
+
+    :param familias: Famílias de instâncias.
+    :param tamanhos: Quantidades de itens.
+    :param razoes_capacidade: Valores disponíveis como fração da soma dos valores.
+    :param solvers: Tipos de *solver* a executar. Se não informados, todos os registrados na `KnapsackSolverFactory`.
+    :param repeticoes: Quantidade de repetições de cada execução. Após um tempo esgotado, as repetições restantes do
+        mesmo *solver* e instância não são executadas.
+    :param limite_tempo: Tempo máximo, em segundos, de cada execução.
+    :param parametros: Parâmetros do método `solucionar` de cada tipo de *solver* ({tipo: {parâmetro: valor}}). A
+        Busca Tabu, se não informada, é executada com parada por estagnação (1000 iterações sem melhora).
+    :param amplitudes: Maiores valores (e importâncias) sorteados nas instâncias. Variar a amplitude independentemente
+        da quantidade de itens separa, na calibração do modelo de custo, o efeito da capacidade do efeito de n.
+    :param semente: Semente base das instâncias (cada instância recebe uma semente derivada).
+    :param arquivo: Arquivo JSON onde os resultados serão gravados.
+    :param verbose: Indica se cada execução deverá ser impressa.
+    :return: Dicionário com o ambiente de execução e a lista de resultados (uma entrada por execução).
+    """
+    nomes = {valor: nome for nome, valor in KnapsackSolverFactory.solvers_registrados().items()}
+    solvers = list(nomes) if solvers is None else list(solvers)
+    parametros = {KnapsackSolverFactory.TABU_SEARCH_KNAPSACK_SOLVER:
+                  {"timeout": limite_tempo, "max_iteracoes_sem_melhora": 1000}, **(parametros or {})}
+    resultados = []
+
+    for indice, (familia, n, amplitude, razao) in enumerate((f, n, a, r) for f in familias for n in tamanhos
+                                                            for a in amplitudes for r in razoes_capacidade):
+        instancia, valor_disponivel = gerar_instancia(familia, n, amplitude, razao, semente + indice)
+        # Características da instância, utilizadas na calibração do modelo de custo (`ModeloCusto.calibrar`).
+        caracteristicas = ModeloCusto.caracteristicas(instancia, valor_disponivel)
+        execucoes = []
+        with InstanciaCompartilhada(instancia) as compartilhada:
+            for tipo in solvers:
+                primeira = len(execucoes)
+                for repeticao in range(repeticoes):
+                    situacao, tempo, pico, pico_residente, importancia, valor = _medir(
+                        compartilhada, valor_disponivel, tipo, parametros.get(tipo, {}), limite_tempo)
+                    execucoes.append({"familia": familia, "n": n, "amplitude": amplitude, "razao_capacidade": razao,
+                                      "valor_disponivel": valor_disponivel, "solver": nomes.get(tipo, str(tipo)),
+                                      "tipo": tipo, "repeticao": repeticao, "situacao": situacao,
+                                      "tempo": tempo, "pico_memoria": pico, "pico_residente": pico_residente,
+                                      "importancia": importancia, "valor": valor,
+                                      "caracteristicas": caracteristicas})
+                    if verbose:
+                        print(execucoes[-1])
+                    if situacao != "concluido":
+                        break
+                if len(execucoes) > primeira and execucoes[-1]["situacao"] == "concluido":
+                    # O pico de memória alocada é medido em uma execução adicional, com o tracemalloc, que não é
+                    # cronometrada.
+                    pico = _medir(compartilhada, valor_disponivel, tipo, parametros.get(tipo, {}), limite_tempo,
+                                  rastrear_memoria=True)[2]
+                    for execucao in execucoes[primeira:]:
+                        execucao["pico_memoria"] = pico
+
+        concluidas = [execucao["importancia"] for execucao in execucoes
+                      if execucao["tipo"] in SOLVERS_EXATOS and execucao["situacao"] == "concluido"]
+        otimo = max(concluidas) if concluidas else None
+        for execucao in execucoes:
+            execucao["otimo"] = otimo
+            execucao["gap"] = None
+            if otimo and execucao["importancia"] is not None:
+                execucao["gap"] = (otimo - execucao["importancia"]) / otimo
+        resultados.extend(execucoes)
+
+    benchmark = {"data": datetime.now().isoformat(), "python": platform.python_version(),
+                 "plataforma": platform.platform(), "numpy": np.__version__, "repeticoes": repeticoes,
+                 "limite_tempo": limite_tempo, "amplitudes": list(amplitudes),
+                 "semente": semente, "resultados": resultados}
+    if arquivo is not None:
+        with open(arquivo, "w", encoding="utf-8") as saida:
+            json.dump(benchmark, saida, indent=1, default=str)
+
+    return benchmark
+
+
+def resumir(benchmark: dict) -> pd.DataFrame:
+    """
+    Resume os resultados de um benchmark com uma linha por instância e *solver*: mediana do tempo, maiores picos de
+    memória, pior gap e quantidade de execuções concluídas.
+
+    :param benchmark: Resultado de `executar_benchmark` (ou o conteúdo do arquivo JSON gravado).
+    :return: DataFrame do Pandas com o resumo.
+    """
+    resultados = pd.DataFrame(benchmark["resultados"])
+    resultados["concluido"] = resultados.situacao == "concluido"
+    if "amplitude" not in resultados:
+        # Benchmarks gravados antes da variação da amplitude utilizavam sempre a amplitude padrão.
+        resultados["amplitude"] = 1000
+
+    return resultados.groupby(["familia", "n", "amplitude", "razao_capacidade", "solver"]).agg(
+        tempo=("tempo", "median"), pico_memoria=("pico_memoria", "max"), pico_residente=("pico_residente", "max"),
+        gap=("gap", "max"),
+        concluidas=("concluido", "sum")).reset_index()
+
+
+def comparar(arquivo_base: str, arquivo_novo: str, tolerancia: float = 0.1) -> pd.DataFrame:
+    """
+    Compara dois benchmarks gravados e aponta regressões: tempo mediano ou pico de memória maiores que a tolerância,
+    gap maior ou menos execuções concluídas.
+
+    :param arquivo_base: Arquivo JSON do benchmark de referência.
+    :param arquivo_novo: Arquivo JSON do benchmark a comparar.
+    :param tolerancia: Aumento relativo de tempo ou memória tolerado (0.1 = 10%).
+    :return: DataFrame do Pandas com uma linha por instância e *solver* presentes nos dois benchmarks, com as razões
+        novo/base e a coluna "regressao".
+    """
+    with open(arquivo_base, encoding="utf-8") as base, open(arquivo_novo, encoding="utf-8") as novo:
+        comparacao = resumir(json.load(base)).merge(resumir(json.load(novo)),
+                                                    on=["familia", "n", "amplitude", "razao_capacidade", "solver"],
+                                                    suffixes=("_base", "_novo"))
+
+    comparacao["razao_tempo"] = comparacao.tempo_novo / comparacao.tempo_base
+    comparacao["razao_memoria"] = comparacao.pico_memoria_novo / comparacao.pico_memoria_base
+    comparacao["regressao"] = ((comparacao.razao_tempo > 1 + tolerancia) |
+                               (comparacao.razao_memoria > 1 + tolerancia) |
+                               (comparacao.gap_novo.fillna(0) > comparacao.gap_base.fillna(0) + 1e-9) |
+                               (comparacao.concluidas_novo < comparacao.concluidas_base))
+
+    return comparacao
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Benchmark dos solvers do Problema da Mochila Binária.")
+    argumentos.add_argument("arquivo", help="Arquivo JSON onde os resultados serão gravados.")
+    argumentos.add_argument("--familias", nargs="+", default=FAMILIAS, choices=FAMILIAS)
+    argumentos.add_argument("--tamanhos", nargs="+", type=int, default=[100, 1000, 10000])
+    argumentos.add_argument("--razoes", nargs="+", type=float, default=[0.5])
+    argumentos.add_argument("--amplitudes", nargs="+", type=int, default=[1000])
+    argumentos.add_argument("--solvers", nargs="+", type=int, default=None)
+    argumentos.add_argument("--repeticoes", type=int, default=3)
+    argumentos.add_argument("--limite-tempo", type=float, default=60.0)
+    argumentos.add_argument("--semente", type=int, default=0, help="Semente base das instâncias.")
+    argumentos.add_argument("--comparar-com", default=None, help="Benchmark de referência para apontar regressões.")
+    argumentos.add_argument("--calibrar", default=None,
+                            help="Arquivo JSON onde será gravado o modelo de custo calibrado com os resultados.")
+    opcoes = argumentos.parse_args()
+
+    executar_benchmark(opcoes.familias, opcoes.tamanhos, opcoes.razoes, opcoes.solvers, opcoes.repeticoes,
+                       opcoes.limite_tempo, amplitudes=opcoes.amplitudes, semente=opcoes.semente,
+                       arquivo=opcoes.arquivo, verbose=True)
+    with open(opcoes.arquivo, encoding="utf-8") as arquivo:
+        print(resumir(json.load(arquivo)).to_string())
+    if opcoes.comparar_com:
+        print(comparar(opcoes.comparar_com, opcoes.arquivo).query("regressao").to_string())
+    if opcoes.calibrar:
+        ModeloCusto.calibrar(opcoes.arquivo).salvar(opcoes.calibrar)
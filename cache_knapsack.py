@@ -0,0 +1,205 @@
+"""Cache de soluções, endereçado pelo conteúdo dos itens, do orçamento, do tipo de solver e de seus parâmetros."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from instancia_knapsack import InstanciaKnapsack, SolucaoKnapsack
+from knapsack_utils import KnapsackSolverFactory
+
+
+class CacheSolucoes:
+    """
+    Classe que implementa um cache de soluções na frente da `KnapsackSolverFactory`. A chave de cada solução é um hash
+    estável (SHA-256) dos vetores de importância, valor e proporção da instância, do valor disponível, do tipo de
+    *solver* e dos parâmetros repassados ao método `solucionar`. Qualquer alteração nos itens produz uma chave
+    diferente, de modo que entradas antigas nunca são retornadas para entradas alteradas.
+
+    As soluções são mantidas em memória, com descarte da menos recentemente utilizada (LRU) quando a capacidade é
+    excedida, e opcionalmente em disco, em um diretório que pode ser compartilhado entre processos e sessões.
+    """
+
+    def __init__(self, capacidade: int = 128, diretorio: str = None):
+        """
+        Método construtor.
+
+        :param capacidade: Quantidade máxima de soluções mantidas em memória.
+        :param diretorio: Diretório onde as soluções são persistidas. Se não informado, o cache é apenas em memória.
+        """
+        self.capacidade = capacidade
+        """
+        Quantidade máxima de soluções mantidas em memória.
+        """
+        self.diretorio = diretorio
+        """
+        Diretório onde as soluções são persistidas (None se o cache for apenas em memória).
+        """
+        if diretorio is not None:
+            os.makedirs(diretorio, exist_ok=True)
+        self.acertos = 0
+        """
+        Quantidade de consultas atendidas pelo cache (em memória ou em disco).
+        """
+        self.falhas = 0
+        """
+        Quantidade de consultas que precisaram executar o *solver*.
+        """
+        self._entradas = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @staticmethod
+    def chave(instancia: InstanciaKnapsack, valor_disponivel: float, tipo: int, parametros: dict = None) -> str:
+        """
+        Calcula a chave de uma solução.
+
+        :param instancia: Instância do problema.
+        :param valor_disponivel: Valor do orçamento disponível.
+        :param tipo: Tipo de *solver* (constantes de `KnapsackSolverFactory`).
+        :param parametros: Parâmetros repassados ao método `solucionar`.
+        :return: Hash hexadecimal (SHA-256).
+        :raises TypeError: Se algum parâmetro não tiver representação canônica (veja `_canonico`).
+        """
+        resumo = hashlib.sha256()
+        for vetor in (instancia.importancia, instancia.valor, instancia.proporcao):
+            resumo.update(np.int64(len(vetor)).tobytes())
+            resumo.update(vetor.tobytes())
+        # A representação dos parâmetros é canônica (chaves ordenadas), de modo que a ordem dos argumentos não altera
+        # a chave.
+        resumo.update(json.dumps([float(valor_disponivel), int(tipo), parametros or {}], sort_keys=True,
+                                 default=_canonico).encode("utf-8"))
+
+        return resumo.hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave + ".npz")
+
+    def _guardar(self, chave: str, solucao: SolucaoKnapsack):
+        with self._trava:
+            self._entradas[chave] = (solucao.selecionados, solucao.item_fracionado, solucao.fracao,
+                                     solucao.limitante_superior)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+
+        if self.diretorio is not None:
+            # A escrita é feita em um arquivo temporário e renomeada, para que outros processos nunca leiam uma
+            # entrada incompleta.
+            descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+            with os.fdopen(descritor, "wb") as arquivo:
+                # Sem limitante superior (solução não certificada), é gravado NaN.
+                limitante = np.nan if solucao.limitante_superior is None else solucao.limitante_superior
+                np.savez(arquivo, selecionados=solucao.selecionados, item_fracionado=solucao.item_fracionado,
+                         fracao=solucao.fracao, limitante_superior=limitante)
+            os.replace(temporario, self._caminho(chave))
+
+    def consultar(self, chave: str, instancia: InstanciaKnapsack) -> Union[SolucaoKnapsack, None]:
+        """
+        Consulta uma solução no cache, em memória e, se não encontrada, em disco.
+
+        :param chave: Chave da solução.
+        :param instancia: Instância à qual a solução se refere.
+        :return: Solução encontrada ou None.
+        """
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                self._entradas.move_to_end(chave)
+
+        if entrada is None and self.diretorio is not None and os.path.exists(self._caminho(chave)):
+            with np.load(self._caminho(chave)) as arquivo:
+                # Entradas gravadas sem o limitante superior são lidas como não certificadas.
+                limitante = float(arquivo["limitante_superior"]) if "limitante_superior" in arquivo.files else np.nan
+                entrada = (arquivo["selecionados"], int(arquivo["item_fracionado"]), float(arquivo["fracao"]),
+                           None if np.isnan(limitante) else limitante)
+            with self._trava:
+                self._entradas[chave] = entrada
+                while len(self._entradas) > self.capacidade:
+                    self._entradas.popitem(last=False)
+
+        if entrada is None:
+            return None
+
+        selecionados, item_fracionado, fracao, limitante = entrada
+        solucao = SolucaoKnapsack(instancia, selecionados, item_fracionado, fracao)
+        solucao.limitante_superior = limitante
+
+        return solucao
+
+    def solucionar(self, tipo: int, valor_disponivel: float, itens: Union[pd.DataFrame, InstanciaKnapsack],
+                   **kwargs) -> SolucaoKnapsack:
+        """
+        Retorna a solução do cache ou, se não houver, obtém o *solver* da `KnapsackSolverFactory`, soluciona o problema
+        e guarda a solução.
+
+        :param tipo: Tipo de *solver* (constantes de `KnapsackSolverFactory`).
+        :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
+        :param itens: Itens que serão avaliados para compor o orçamento.
+        :param kwargs: Parâmetros repassados ao método `solucionar` do *solver*. Se algum deles não tiver
+            representação canônica na chave (veja `_canonico`), o cache não é utilizado.
+        :return: Solução contendo os itens selecionados para compor o orçamento.
+        """
+        if isinstance(itens, pd.DataFrame):
+            itens = InstanciaKnapsack.de_dataframe(itens)
+
+        try:
+            chave = self.chave(itens, valor_disponivel, tipo, kwargs)
+        except TypeError:
+            # Sem chave estável, a solução é obtida sem consultar nem alimentar o cache.
+            chave = None
+        solucao = None if chave is None else self.consultar(chave, itens)
+        if solucao is not None:
+            self.acertos += 1
+            return solucao
+
+        self.falhas += 1
+        solucao = KnapsackSolverFactory.get_solver(tipo, valor_disponivel, itens).solucionar(**kwargs)
+        if chave is not None:
+            self._guardar(chave, solucao)
+
+        return solucao
+
+    def limpar(self, disco: bool = False):
+        """
+        Descarta as soluções mantidas em memória e, opcionalmente, as persistidas em disco.
+
+        :param disco: Indica se as soluções em disco também devem ser descartadas.
+        """
+        with self._trava:
+            self._entradas.clear()
+
+        if disco and self.diretorio is not None:
+            for nome in os.listdir(self.diretorio):
+                if nome.endswith(".npz"):
+                    os.remove(os.path.join(self.diretorio, nome))
+
+
+def _canonico(objeto):
+    """
+    Representa, na chave de uma solução, os parâmetros que não são tipos do JSON. A representação padrão dos objetos
+    (repr) inclui o endereço de memória, que muda a cada execução e pode ser reutilizado por outro objeto: a chave
+    nunca seria encontrada por outro processo e poderia colidir com a de outra solução.
+
+    :param objeto: Parâmetro a representar.
+    :return: Representação do parâmetro pelo seu conteúdo.
+    :raises TypeError: Se o tipo do parâmetro não tiver representação canônica.
+    """
+    if isinstance(objeto, SolucaoKnapsack):
+        # Solução inicial: os itens selecionados referem-se à própria instância, que já compõe a chave.
+        return {"selecionados": np.sort(objeto.selecionados).tolist(), "item_fracionado": int(objeto.item_fracionado),
+                "fracao": float(objeto.fracao)}
+    if isinstance(objeto, np.ndarray):
+        return objeto.tolist()
+    if isinstance(objeto, np.generic):
+        return objeto.item()
+
+    raise TypeError("Parâmetro sem representação canônica na chave do cache: {}.".format(type(objeto).__name__))
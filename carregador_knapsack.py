@@ -0,0 +1,207 @@
+"""Carregamento da planilha de proposições, com cache colunar binário reaproveitado enquanto a planilha não mudar."""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from instancia_knapsack import InstanciaKnapsack
+
+PLANILHA_PADRAO = "Tratado"
+"""
+Aba da planilha de proposições com os itens tratados.
+"""
+COLUNAS_PADRAO = {"Ação": "acao", "GUT": "importancia", "Unidade Total": "valor"}
+"""
+Colunas da planilha utilizadas e seus nomes nos itens orçamentários.
+"""
+VERSAO_CACHE = 1
+"""
+Versão do formato do cache. Caches de outra versão são descartados e recriados.
+"""
+
+
+class CarregadorProposicoes:
+    """
+    Classe que carrega a planilha de proposições nos itens orçamentários utilizados pelos *solvers* (colunas "acao",
+    "importancia", "valor", "importancia_por_valor" e "proporcao").
+
+    Na primeira leitura, o esquema da planilha é validado e as colunas são convertidas em vetores NumPy tipados,
+    gravados em um diretório de cache (arquivos .npy, abertos por mapeamento em memória nas leituras seguintes). O
+    cache é reaproveitado enquanto a data de modificação e o tamanho da planilha não mudarem; se mudarem, o hash
+    (SHA-256) do conteúdo é comparado antes de a planilha ser lida novamente.
+    """
+
+    def __init__(self, caminho: str = "proposicoes_STI_2023.xlsx", planilha: str = PLANILHA_PADRAO,
+                 colunas: dict = None, diretorio_cache: str = None):
+        """
+        Método construtor.
+
+        :param caminho: Caminho da planilha de proposições.
+        :param planilha: Aba da planilha com os itens.
+        :param colunas: Colunas da planilha que correspondem a "acao", "importancia" e "valor" (nome na planilha para
+            nome nos itens). Padrão: COLUNAS_PADRAO.
+        :param diretorio_cache: Diretório do cache. Padrão: diretório ".cache_knapsack" ao lado da planilha.
+        """
+        self.caminho = os.path.abspath(caminho)
+        self.planilha = planilha
+        self.colunas = dict(colunas or COLUNAS_PADRAO)
+        if diretorio_cache is None:
+            diretorio_cache = os.path.join(os.path.dirname(self.caminho), ".cache_knapsack")
+        # Cada combinação de planilha, aba e colunas tem seu próprio subdiretório de cache.
+        identificacao = json.dumps([self.caminho, planilha, self.colunas], sort_keys=True).encode("utf-8")
+        self.diretorio_cache = os.path.join(diretorio_cache, "{}-{}".format(
+            os.path.splitext(os.path.basename(self.caminho))[0], hashlib.sha256(identificacao).hexdigest()[:16]))
+        """
+        Diretório com os arquivos do cache desta planilha.
+        """
+
+    def _arquivo(self, nome: str) -> str:
+        return os.path.join(self.diretorio_cache, nome)
+
+    def _hash_planilha(self) -> str:
+        resumo = hashlib.sha256()
+        with open(self.caminho, "rb") as arquivo:
+            for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+                resumo.update(bloco)
+
+        return resumo.hexdigest()
+
+    def _metadados_planilha(self) -> dict:
+        estado = os.stat(self.caminho)
+        return {"versao": VERSAO_CACHE, "mtime_ns": estado.st_mtime_ns, "tamanho": estado.st_size}
+
+    def _validar(self, dados: pd.DataFrame) -> pd.DataFrame:
+        """
+        Valida o esquema da planilha: as colunas configuradas devem existir e as colunas de importância e valor devem
+        ser numéricas.
+
+        :param dados: Aba da planilha lida pelo Pandas.
+        :return: Itens com as colunas renomeadas.
+        :raises ValueError: Se o esquema da planilha for inválido.
+        """
+        faltantes = [coluna for coluna in self.colunas if coluna not in dados.columns]
+        if faltantes:
+            raise ValueError("Colunas ausentes na planilha {} (aba {}): {}.".format(self.caminho, self.planilha,
+                                                                                    ", ".join(faltantes)))
+        if sorted(self.colunas.values()) != ["acao", "importancia", "valor"]:
+            raise ValueError("As colunas devem ser mapeadas para \"acao\", \"importancia\" e \"valor\".")
+
+        itens = dados.filter(list(self.colunas)).rename(columns=self.colunas)
+        for coluna in ("importancia", "valor"):
+            convertida = pd.to_numeric(itens[coluna], errors="coerce")
+            invalidos = convertida.isna() & itens[coluna].notna()
+            if invalidos.any():
+                raise ValueError("Valores não numéricos na coluna \"{}\" (linhas {}).".format(
+                    coluna, ", ".join(str(linha) for linha in itens.index[invalidos][:10])))
+            itens[coluna] = convertida.astype(np.float64)
+
+        return itens
+
+    def _gravar(self, nome: str, vetor: np.ndarray):
+        # A escrita é feita em um arquivo temporário e renomeada, para que outros processos nunca leiam um arquivo
+        # incompleto.
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio_cache, suffix=".tmp")
+        with os.fdopen(descritor, "wb") as arquivo:
+            np.save(arquivo, vetor, allow_pickle=False)
+        os.replace(temporario, self._arquivo(nome))
+
+    def _converter(self, metadados: dict):
+        """
+        Lê a planilha, valida o esquema e grava o cache. Os metadados são gravados por último, de modo que um cache
+        interrompido no meio da gravação nunca é considerado válido.
+        """
+        itens = self._validar(pd.read_excel(self.caminho, sheet_name=self.planilha))
+        os.makedirs(self.diretorio_cache, exist_ok=True)
+
+        importancia = itens["importancia"].to_numpy(dtype=np.float64)
+        valor = itens["valor"].to_numpy(dtype=np.float64)
+        posicoes = np.flatnonzero(np.isfinite(importancia) & np.isfinite(valor))
+        # Ações ausentes são gravadas como texto vazio, pois os vetores de texto de tamanho fixo não aceitam nulos.
+        acao = itens["acao"].fillna("").astype(str).to_numpy(dtype=np.str_)
+        self._gravar("importancia.npy", importancia)
+        self._gravar("valor.npy", valor)
+        self._gravar("acao.npy", acao)
+        self._gravar("posicoes.npy", posicoes)
+        # Vetores da instância (apenas as linhas válidas), prontos para os solvers.
+        self._gravar("instancia_importancia.npy", importancia[posicoes])
+        self._gravar("instancia_valor.npy", valor[posicoes])
+        self._gravar_metadados(metadados)
+
+    def _gravar_metadados(self, metadados: dict):
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio_cache, suffix=".tmp")
+        with os.fdopen(descritor, "w") as arquivo:
+            json.dump(metadados, arquivo)
+        os.replace(temporario, self._arquivo("metadados.json"))
+
+    def atualizar(self) -> bool:
+        """
+        Garante que o cache corresponde à planilha atual, recriando-o se necessário.
+
+        :return: Verdadeiro se a planilha foi lida (cache criado ou recriado).
+        :raises ValueError: Se o esquema da planilha for inválido.
+        """
+        metadados = self._metadados_planilha()
+        try:
+            with open(self._arquivo("metadados.json")) as arquivo:
+                gravados = json.load(arquivo)
+        except (OSError, ValueError):
+            gravados = None
+
+        if gravados is not None and gravados.get("versao") == VERSAO_CACHE:
+            if all(gravados.get(chave) == metadados[chave] for chave in ("mtime_ns", "tamanho")):
+                return False
+            # A planilha foi tocada (ou copiada) sem alteração do conteúdo: o cache continua válido e apenas os
+            # metadados são atualizados.
+            metadados["sha256"] = self._hash_planilha()
+            if gravados.get("sha256") == metadados["sha256"]:
+                self._gravar_metadados(metadados)
+                return False
+        else:
+            metadados["sha256"] = self._hash_planilha()
+
+        self._converter(metadados)
+        return True
+
+    def _abrir(self, nome: str) -> np.ndarray:
+        return np.load(self._arquivo(nome), mmap_mode="r", allow_pickle=False)
+
+    def carregar_instancia(self) -> InstanciaKnapsack:
+        """
+        Carrega a instância compilada diretamente dos vetores do cache, sem construir o DataFrame. Os vetores de
+        importância e valor são mapeados em memória, somente leitura, e compartilhados sem cópia.
+
+        :return: Instância com as linhas válidas da planilha. As posições originais referem-se às linhas da planilha.
+        """
+        self.atualizar()
+        return InstanciaKnapsack(self._abrir("instancia_importancia.npy"), self._abrir("instancia_valor.npy"),
+                                 posicoes_originais=self._abrir("posicoes.npy"))
+
+    def carregar_itens(self) -> pd.DataFrame:
+        """
+        Carrega os itens orçamentários, com as colunas "acao", "importancia", "valor", "importancia_por_valor" e
+        "proporcao", equivalentes à preparação da planilha descrita no README.
+
+        :return: DataFrame do Pandas com uma linha por linha da planilha.
+        """
+        self.atualizar()
+        importancia = np.array(self._abrir("importancia.npy"))
+        valor = np.array(self._abrir("valor.npy"))
+        acao = pd.Series(self._abrir("acao.npy"), dtype=object).replace("", np.nan)
+        itens = pd.DataFrame({"acao": acao, "importancia": importancia, "valor": valor})
+        itens["importancia_por_valor"] = itens.importancia / itens.valor
+        itens["proporcao"] = 0
+
+        return itens
+
+    def carregar(self) -> InstanciaKnapsack:
+        """
+        Carrega a instância compilada com o DataFrame dos itens como referência, de modo que as soluções tragam as
+        demais colunas (por exemplo, "acao") no atributo `itens`.
+
+        :return: Instância compilada.
+        """
+        return InstanciaKnapsack.de_dataframe(self.carregar_itens())
@@ -0,0 +1,149 @@
+"""Estatísticas de execução dos solvers e ganchos (*hooks*) para instrumentação."""
+
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+
+class EstatisticasSolver:
+    """
+    Classe que reúne as estatísticas da última execução de um *solver*: tempo de cada fase (preparação,
+    pré-processamento, busca e materialização do resultado) e contadores próprios de cada algoritmo (por exemplo, nós
+    criados, expandidos e podados no Branch and Bound, iterações e movimentos avaliados na Busca Tabu ou tamanho da
+    tabela da Programação Dinâmica).
+
+    Ganchos (*hooks*) podem ser registrados para instrumentação própria. Cada gancho é chamado com o nome do evento e
+    um dicionário com os dados do evento:
+
+    - "inicio": início da execução;
+    - "inicio_fase" e "fim_fase": início e fim de uma fase ("fase" e, no fim, "duracao" em segundos);
+    - "melhoria": nova melhor solução ("importancia" e "tempo", em segundos desde o início);
+    - "fim": fim da execução ("importancia" e "tempo").
+    """
+
+    def __init__(self):
+        """
+        Método construtor.
+        """
+        self.fases = {}
+        """
+        Tempo, em segundos, gasto em cada fase da última execução.
+        """
+        self.contadores = {}
+        """
+        Contadores e medidas da última execução (por exemplo, nos_criados, iteracoes ou celulas_tabela).
+        """
+        self._ganchos = []
+        self._inicio = time.perf_counter()
+
+    def adicionar_gancho(self, gancho: Callable[[str, dict], None]):
+        """
+        Registra um gancho, que permanece registrado entre as execuções.
+
+        :param gancho: Função chamada com o nome do evento e o dicionário de dados do evento.
+        """
+        self._ganchos.append(gancho)
+
+    def remover_gancho(self, gancho: Callable[[str, dict], None]):
+        """
+        Remove um gancho registrado.
+
+        :param gancho: Gancho a ser removido.
+        """
+        self._ganchos.remove(gancho)
+
+    def notificar(self, evento: str, **dados):
+        """
+        Chama os ganchos registrados com o evento informado.
+
+        :param evento: Nome do evento.
+        :param dados: Dados do evento.
+        """
+        for gancho in self._ganchos:
+            gancho(evento, dados)
+
+    @property
+    def tempo_decorrido(self) -> float:
+        """
+        Tempo, em segundos, desde o início da última execução.
+        """
+        return time.perf_counter() - self._inicio
+
+    def reiniciar(self):
+        """
+        Descarta as estatísticas da execução anterior e marca o início de uma nova execução.
+        """
+        self.fases = {}
+        self.contadores = {}
+        self._inicio = time.perf_counter()
+        self.notificar("inicio")
+
+    @contextmanager
+    def fase(self, nome: str):
+        """
+        Gerenciador de contexto que mede o tempo de uma fase. Fases repetidas têm seus tempos somados.
+
+        :param nome: Nome da fase (por exemplo, "preparacao", "presolve", "busca" ou "materializacao").
+        """
+        self.notificar("inicio_fase", fase=nome)
+        inicio = time.perf_counter()
+        try:
+            yield self
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.fases[nome] = self.fases.get(nome, 0.0) + duracao
+            self.notificar("fim_fase", fase=nome, duracao=duracao)
+
+    def registrar(self, nome: str, valor):
+        """
+        Registra o valor de uma medida.
+        """
+        self.contadores[nome] = valor
+
+    def incrementar(self, nome: str, quantidade=1):
+        """
+        Soma uma quantidade a um contador.
+        """
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def registrar_maximo(self, nome: str, valor):
+        """
+        Registra o valor de uma medida apenas se for maior que o já registrado.
+        """
+        self.contadores[nome] = max(self.contadores.get(nome, valor), valor)
+
+    def melhoria(self, importancia: float):
+        """
+        Registra uma nova melhor solução e o momento em que foi encontrada.
+
+        :param importancia: Importância da nova melhor solução.
+        """
+        tempo = self.tempo_decorrido
+        self.incrementar("melhorias")
+        self.contadores["tempo_melhor_solucao"] = tempo
+        self.notificar("melhoria", importancia=importancia, tempo=tempo)
+
+    def concluir(self, solucao):
+        """
+        Registra o fim da execução e associa à solução os tempos das fases, aos quais a construção tardia do DataFrame
+        de itens da solução (`SolucaoKnapsack.itens`) é somada como fase "materializacao".
+
+        :param solucao: Solução obtida.
+        :return: A própria solução.
+        """
+        solucao.fases = self.fases
+        self.contadores["tempo_total"] = self.tempo_decorrido
+        self.notificar("fim", importancia=solucao.importancia, tempo=self.contadores["tempo_total"])
+
+        return solucao
+
+    def como_dict(self) -> dict:
+        """
+        Representa as estatísticas como dicionário, com os tempos das fases prefixados por "fase_".
+
+        :return: Dicionário com os contadores e os tempos das fases.
+        """
+        return {**{"fase_" + nome: duracao for nome, duracao in self.fases.items()}, **self.contadores}
+
+    def __repr__(self):
+        return "EstatisticasSolver({})".format(self.como_dict())
@@ -0,0 +1,307 @@
+"""Solução de problemas com mais itens do que cabem em memória: leitura em blocos e conjunto limitado de candidatos."""
+
+import os
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from algoritmos_aproximados import GreedyKnapsackSolver
+from estatisticas_knapsack import EstatisticasSolver
+from instancia_knapsack import InstanciaKnapsack, SolucaoKnapsack
+from knapsack_utils import KnapsackSolverFactory
+
+BYTES_POR_CANDIDATO = 128
+"""
+Estimativa da memória ocupada por item candidato, incluídos os vetores temporários da compactação.
+"""
+COLUNAS_PADRAO = {"importancia": "importancia", "valor": "valor"}
+"""
+Colunas do arquivo utilizadas e seus nomes nos itens orçamentários.
+"""
+
+
+def ler_csv(caminho: str, tamanho_bloco: int = 100000, colunas: dict = None, **opcoes) -> Iterator[pd.DataFrame]:
+    """
+    Lê um arquivo CSV em blocos, apenas com as colunas de importância e valor.
+
+    :param caminho: Caminho do arquivo.
+    :param tamanho_bloco: Quantidade de linhas de cada bloco.
+    :param colunas: Colunas do arquivo que correspondem a "importancia" e "valor" (nome no arquivo para nome nos
+        itens). Padrão: COLUNAS_PADRAO.
+    :param opcoes: Demais parâmetros de `pandas.read_csv` (por exemplo, sep=";" e decimal=",").
+    :return: Iterador dos blocos, DataFrames com as colunas "importancia" e "valor".
+    """
+    colunas = colunas or COLUNAS_PADRAO
+    with pd.read_csv(caminho, usecols=list(colunas), chunksize=tamanho_bloco, **opcoes) as leitor:
+        for bloco in leitor:
+            yield bloco.rename(columns=colunas)
+
+
+def ler_parquet(caminho: str, tamanho_bloco: int = 100000, colunas: dict = None) -> Iterator[pd.DataFrame]:
+    """
+    Lê um arquivo Parquet em blocos, apenas com as colunas de importância e valor. Requer o pacote pyarrow.
+
+    :param caminho: Caminho do arquivo.
+    :param tamanho_bloco: Quantidade de linhas de cada bloco.
+    :param colunas: Colunas do arquivo que correspondem a "importancia" e "valor" (nome no arquivo para nome nos
+        itens). Padrão: COLUNAS_PADRAO.
+    :return: Iterador dos blocos, DataFrames com as colunas "importancia" e "valor".
+    :raises ImportError: Se o pacote pyarrow não estiver instalado.
+    """
+    try:
+        import pyarrow.parquet as parquet
+    except ImportError as erro:
+        raise ImportError("A leitura de arquivos Parquet requer o pacote pyarrow.") from erro
+
+    colunas = colunas or COLUNAS_PADRAO
+    for bloco in parquet.ParquetFile(caminho).iter_batches(batch_size=tamanho_bloco, columns=list(colunas)):
+        yield bloco.to_pandas().rename(columns=colunas)
+
+
+def ler_arquivo(caminho: str, tamanho_bloco: int = 100000, colunas: dict = None, **opcoes) -> Iterator[pd.DataFrame]:
+    """
+    Lê um arquivo CSV ou Parquet em blocos, conforme a extensão (.parquet ou .pq para Parquet; as demais, CSV).
+
+    :param caminho: Caminho do arquivo.
+    :param tamanho_bloco: Quantidade de linhas de cada bloco.
+    :param colunas: Colunas do arquivo que correspondem a "importancia" e "valor". Padrão: COLUNAS_PADRAO.
+    :param opcoes: Demais parâmetros de `pandas.read_csv`, para arquivos CSV.
+    :return: Iterador dos blocos, DataFrames com as colunas "importancia" e "valor".
+    """
+    if os.path.splitext(caminho)[1].lower() in (".parquet", ".pq"):
+        return ler_parquet(caminho, tamanho_bloco, colunas)
+
+    return ler_csv(caminho, tamanho_bloco, colunas, **opcoes)
+
+
+def _margens(importancia: np.ndarray, valor: np.ndarray, razao_critica: float) -> np.ndarray:
+    """
+    Calcula a margem de cada item em relação à razão crítica: o quanto a inclusão do item reduz o limitante de
+    Dantzig (valor x razão crítica - importância). Itens de razão maior ou igual à crítica têm margem não positiva.
+    """
+    margens = np.full(len(valor), -np.inf)
+    positivos = valor > 0
+    margens[positivos] = valor[positivos] * razao_critica - importancia[positivos]
+
+    return margens
+
+
+class ReducaoFluxo:
+    """
+    Classe que reduz, durante a leitura em blocos, um conjunto de itens grande demais para a memória a um conjunto
+    limitado de itens candidatos, que é então solucionado pelos *solvers* existentes.
+
+    Itens inválidos, sem importância ou que sozinhos não cabem no valor disponível nunca fazem parte de uma solução
+    ótima e são descartados na leitura. Quando a quantidade de candidatos ultrapassa o limite, os candidatos são
+    compactados: o item crítico é encontrado por seleção parcial, sem ordenação, e os itens de razão
+    importância/valor menor que a razão crítica são descartados, a começar pelos de maior margem (valor x razão
+    crítica - importância). São mantidos todos os itens de razão maior ou igual à crítica e, abaixo dela, uma faixa de
+    itens de menor margem. Os itens lidos depois de uma compactação com margem maior que a da compactação são
+    descartados imediatamente.
+
+    Como a razão crítica nunca diminui com a chegada de novos itens, a margem de um item descartado só aumenta e o
+    limitante de Dantzig do conjunto completo é igual ao do conjunto reduzido. Qualquer solução que inclua um item
+    descartado tem importância no máximo igual a esse limitante menos a menor margem descartada, o que certifica a
+    solução obtida no conjunto reduzido (veja `limitante_superior`): se esse valor não superar a importância da
+    solução ótima do conjunto reduzido, ela é ótima também para o conjunto completo.
+    """
+
+    def __init__(self, valor_disponivel: float, limite_memoria: int = 64 * 2 ** 20):
+        """
+        Método construtor.
+
+        :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
+        :param limite_memoria: Memória máxima, em bytes, ocupada pelos itens candidatos (veja BYTES_POR_CANDIDATO).
+            Não inclui os blocos lidos, que devem ser bem menores que o limite.
+        """
+        self.valor_disponivel = float(valor_disponivel)
+        self.limite_candidatos = max(int(limite_memoria) // BYTES_POR_CANDIDATO,
+                                     4 * InstanciaKnapsack.TAMANHO_ORDENACAO)
+        """
+        Quantidade máxima de itens candidatos mantidos em memória.
+        """
+        self.estatisticas = EstatisticasSolver()
+        """
+        Estatísticas da redução: itens lidos, descartados na leitura e na compactação, compactações e pico de
+        candidatos.
+        """
+        self.margem_descartados = np.inf
+        """
+        Menor margem entre os itens descartados por margem (infinito se nenhum foi descartado).
+        """
+        self.razao_critica = None
+        """
+        Razão importância/valor do item crítico na última compactação.
+        """
+        self._importancia = np.empty(0)
+        self._valor = np.empty(0)
+        self._posicoes = np.empty(0, dtype=np.intp)
+        self._pendentes = []
+        self._quantidade_pendente = 0
+        self._lidos = 0
+        # Margem a partir da qual os itens lidos são descartados imediatamente.
+        self._limiar = np.inf
+
+    def __len__(self):
+        return len(self._valor) + self._quantidade_pendente
+
+    def adicionar(self, lote):
+        """
+        Adiciona um bloco de itens. As posições dos itens são numeradas na ordem de leitura, a partir de zero,
+        contadas todas as linhas (inclusive as inválidas).
+
+        :param lote: DataFrame com as colunas "importancia" e "valor" ou par de vetores (importância, valor).
+        """
+        if isinstance(lote, pd.DataFrame):
+            importancia = lote["importancia"].to_numpy(dtype=np.float64, na_value=np.nan)
+            valor = lote["valor"].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            importancia, valor = (np.asarray(vetor, dtype=np.float64) for vetor in lote)
+        posicoes = np.arange(self._lidos, self._lidos + len(valor))
+        self._lidos += len(valor)
+        estatisticas = self.estatisticas
+        estatisticas.incrementar("itens_lidos", len(valor))
+
+        # Itens inválidos, sem importância ou que sozinhos não cabem nunca fazem parte de uma solução ótima.
+        validos = (np.isfinite(importancia) & np.isfinite(valor) & (importancia > 0)
+                   & (valor <= self.valor_disponivel))
+        estatisticas.incrementar("descartados_leitura", len(valor) - int(np.count_nonzero(validos)))
+        importancia, valor, posicoes = importancia[validos], valor[validos], posicoes[validos]
+        if self.razao_critica is not None:
+            margens = _margens(importancia, valor, self.razao_critica)
+            descartados = margens > self._limiar
+            if np.any(descartados):
+                self.margem_descartados = min(self.margem_descartados, float(margens[descartados].min()))
+                estatisticas.incrementar("descartados_margem", int(np.count_nonzero(descartados)))
+                importancia, valor, posicoes = importancia[~descartados], valor[~descartados], posicoes[~descartados]
+
+        if len(valor):
+            self._pendentes.append((importancia, valor, posicoes))
+            self._quantidade_pendente += len(valor)
+        estatisticas.registrar_maximo("pico_candidatos", len(self))
+        if len(self) > self.limite_candidatos:
+            self._compactar(self.limite_candidatos // 2)
+
+    def consumir(self, lotes: Iterable) -> "ReducaoFluxo":
+        """
+        Adiciona todos os blocos de um iterador (por exemplo, de `ler_arquivo` ou de um gerador próprio).
+
+        :param lotes: Iterador dos blocos (veja `adicionar`).
+        :return: A própria redução.
+        """
+        for lote in lotes:
+            self.adicionar(lote)
+
+        return self
+
+    def _juntar(self):
+        if self._pendentes:
+            self._importancia = np.concatenate([self._importancia] + [lote[0] for lote in self._pendentes])
+            self._valor = np.concatenate([self._valor] + [lote[1] for lote in self._pendentes])
+            self._posicoes = np.concatenate([self._posicoes] + [lote[2] for lote in self._pendentes])
+            self._pendentes = []
+            self._quantidade_pendente = 0
+
+    def _compactar(self, alvo: int):
+        """
+        Compacta os candidatos, descartando os itens de razão menor que a crítica a começar pelos de maior margem. Os
+        itens de margem maior que a distância entre o limitante de Dantzig e a solução gulosa dos candidatos são
+        sempre descartados; os demais, apenas enquanto a quantidade de candidatos superar o alvo.
+
+        :param alvo: Quantidade de candidatos após a compactação.
+
+        :raises MemoryError: Se os itens de razão maior ou igual à crítica, que nunca são descartados, não couberem
+            no limite. O limite deve comportar, com folga, a quantidade de itens de uma solução.
+        """
+        self._juntar()
+        estatisticas = self.estatisticas
+        estatisticas.incrementar("compactacoes")
+        self._importancia.setflags(write=False)
+        self._valor.setflags(write=False)
+        instancia = InstanciaKnapsack(self._importancia, self._valor)
+        solucao = GreedyKnapsackSolver(self.valor_disponivel, instancia).solucionar()
+        _, critico, _, _ = instancia.particao_critica(self.valor_disponivel)
+        if critico < 0:
+            # Todos os candidatos cabem: nenhum pode ser descartado.
+            if len(instancia) > self.limite_candidatos:
+                raise MemoryError("Os {} itens candidatos, que cabem todos no valor disponível, não cabem no limite de "
+                                  "{} itens candidatos.".format(len(instancia), self.limite_candidatos))
+            return
+
+        self.razao_critica = float(instancia.importancia_por_valor[critico])
+        margens = _margens(self._importancia, self._valor, self.razao_critica)
+        limiar = solucao.gap
+        descartados = margens > limiar
+        excesso = len(margens) - int(np.count_nonzero(descartados)) - alvo
+        if excesso > 0:
+            # Ainda há candidatos demais: a faixa abaixo da razão crítica é estreitada.
+            faixa = margens[~descartados & (margens > 0)]
+            if len(faixa):
+                limiar = float(np.partition(faixa, max(len(faixa) - excesso, 0))[max(len(faixa) - excesso, 0)])
+                descartados |= margens >= limiar
+                descartados &= margens > 0
+
+        if np.any(descartados):
+            self.margem_descartados = min(self.margem_descartados, float(margens[descartados].min()))
+            estatisticas.incrementar("descartados_margem", int(np.count_nonzero(descartados)))
+            mantidos = ~descartados
+            self._importancia = self._importancia[mantidos]
+            self._valor = self._valor[mantidos]
+            self._posicoes = self._posicoes[mantidos]
+        self._limiar = limiar
+        if len(self._valor) > self.limite_candidatos:
+            raise MemoryError("Os {} itens de razão importância/valor maior ou igual à razão crítica não cabem no limite "
+                              "de {} itens candidatos.".format(len(self._valor), self.limite_candidatos))
+
+    def instancia(self) -> InstanciaKnapsack:
+        """
+        Obtém a instância com os itens candidatos, após uma última compactação com todos os itens lidos. As posições
+        originais dos itens referem-se à ordem de leitura.
+
+        :return: Instância reduzida.
+        """
+        if len(self):
+            self._compactar(self.limite_candidatos)
+        return InstanciaKnapsack(self._importancia, self._valor, posicoes_originais=self._posicoes)
+
+    def limitante_superior(self, solucao: SolucaoKnapsack) -> float:
+        """
+        Calcula o limitante superior da importância de qualquer solução do conjunto completo de itens, a partir de uma
+        solução da instância reduzida: o maior entre o limitante da solução (ou, se não houver, o limitante de
+        Dantzig da instância reduzida) e o limitante das soluções que incluem algum item descartado.
+
+        :param solucao: Solução da instância reduzida.
+        :return: Limitante superior.
+        """
+        dantzig = solucao.instancia.limitante_dantzig(self.valor_disponivel)
+        limitante = dantzig if solucao.limitante_superior is None else solucao.limitante_superior
+        if np.isfinite(self.margem_descartados):
+            limitante = max(limitante, dantzig - self.margem_descartados)
+
+        return limitante
+
+
+def solucionar_fluxo(lotes: Iterable, valor_disponivel: float,
+                     tipo: int = KnapsackSolverFactory.BRANCH_AND_BOUND_KNAPSACK_SOLVER, parametros: dict = None,
+                     limite_memoria: int = 64 * 2 ** 20) -> SolucaoKnapsack:
+    """
+    Soluciona o problema a partir de blocos de itens lidos em sequência (veja `ReducaoFluxo`), sem manter todos os
+    itens em memória.
+
+    :param lotes: Iterador dos blocos: DataFrames com as colunas "importancia" e "valor" (por exemplo, de
+        `ler_arquivo`) ou pares de vetores (importância, valor).
+    :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
+    :param tipo: Tipo de *solver* aplicado à instância reduzida (constantes de `KnapsackSolverFactory`). Padrão:
+        Branch and Bound.
+    :param parametros: Parâmetros do método `solucionar` do *solver*.
+    :param limite_memoria: Memória máxima, em bytes, ocupada pelos itens candidatos.
+    :return: Solução da instância reduzida, com o limitante superior do conjunto completo (atributos
+        `limitante_superior`, `gap` e `gap_relativo`). O atributo `indices` da solução contém as posições dos itens
+        selecionados na ordem de leitura.
+    """
+    reducao = ReducaoFluxo(valor_disponivel, limite_memoria).consumir(lotes)
+    knapsack_solver = KnapsackSolverFactory.get_solver(tipo, valor_disponivel, reducao.instancia())
+    solucao = knapsack_solver.solucionar(**(parametros or {}))
+
+    return solucao.certificar(reducao.limitante_superior(solucao))
@@ -0,0 +1,502 @@
+"""Classes que representam uma instância compilada do Problema da Mochila Binária e a solução obtida pelos solvers."""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class InstanciaKnapsack:
+    """
+    Classe que representa uma instância compilada do Problema da Mochila Binária (0-1 Knapsack Problem).
+
+    Os itens orçamentários são convertidos uma única vez em vetores NumPy contíguos e somente leitura (importância,
+    valor e razão importância/valor), que são compartilhados por todos os *solvers* sem cópia do DataFrame original.
+    """
+
+    TAMANHO_ORDENACAO = 256
+    """
+    Quantidade de itens candidatos a partir da qual a seleção parcial do item crítico deixa de particionar os itens e
+    passa a ordená-los.
+    """
+
+    def __init__(self, importancia, valor, itens: pd.DataFrame = None, posicoes_originais=None, proporcao=None):
+        """
+        Método construtor.
+
+        :param importancia: Vetor com a importância de cada item (valor no problema da mochila).
+        :param valor: Vetor com o valor de cada item (peso no problema da mochila).
+        :param itens: DataFrame do Pandas de onde os vetores foram extraídos. É mantido apenas como referência para a
+            construção do DataFrame de resultado.
+        :param posicoes_originais: Posição (linha) de cada item da instância no DataFrame original.
+        :param proporcao: Solução inicial (proporção de cada item), quando houver.
+        :raises ValueError: Se os vetores não forem unidimensionais e de mesmo tamanho.
+        """
+        self.importancia = self._vetor_somente_leitura(importancia, np.float64)
+        """
+        Importância de cada item (valor no problema da mochila).
+        """
+        self.valor = self._vetor_somente_leitura(valor, np.float64)
+        """
+        Valor de cada item (peso no problema da mochila).
+        """
+        if self.importancia.ndim != 1 or self.importancia.shape != self.valor.shape:
+            raise ValueError("Os vetores de importância e valor devem ser unidimensionais e de mesmo tamanho.")
+
+        # Itens de valor zero têm razão infinita (sempre cabem) ou nula (quando também não possuem importância).
+        razao = np.zeros(len(self.valor))
+        np.divide(self.importancia, self.valor, out=razao, where=self.valor > 0)
+        razao[(self.valor <= 0) & (self.importancia > 0)] = np.inf
+        self.importancia_por_valor = self._vetor_somente_leitura(razao, np.float64)
+        """
+        Razão importância/valor de cada item.
+        """
+        self.itens = itens
+        """
+        DataFrame original dos itens orçamentários (somente referência, nunca é alterado).
+        """
+        if posicoes_originais is None:
+            posicoes_originais = np.arange(len(self.valor))
+        self.posicoes_originais = self._vetor_somente_leitura(posicoes_originais, np.intp)
+        """
+        Posição (linha) de cada item da instância no DataFrame original.
+        """
+        if proporcao is None:
+            proporcao = np.zeros(len(self.valor))
+        self.proporcao = self._vetor_somente_leitura(proporcao, np.float64)
+        """
+        Solução inicial informada na coluna "proporcao" do DataFrame original.
+        """
+        self._ordem = None
+        self._valor_acumulado = None
+        self._importancia_acumulada = None
+
+    @staticmethod
+    def _vetor_somente_leitura(vetor, dtype) -> np.ndarray:
+        # Vetores já contíguos e somente leitura (por exemplo, em memória compartilhada) são usados sem cópia.
+        vetor = np.ascontiguousarray(vetor, dtype=dtype)
+        if vetor.flags.writeable:
+            vetor = vetor.copy()
+            vetor.setflags(write=False)
+        return vetor
+
+    @classmethod
+    def de_dataframe(cls, itens: pd.DataFrame) -> "InstanciaKnapsack":
+        """
+        Compila o DataFrame de itens orçamentários em uma instância. Linhas sem importância ou sem valor (por exemplo,
+        linhas em branco ou de totalização da planilha) não fazem parte da instância e nunca são selecionadas.
+
+        :param itens: Itens que serão avaliados para compor o orçamento. Deve conter as colunas "importancia" e
+            "valor" e, opcionalmente, "proporcao".
+        :return: Instância compilada.
+        """
+        importancia = itens["importancia"].to_numpy(dtype=np.float64, na_value=np.nan)
+        valor = itens["valor"].to_numpy(dtype=np.float64, na_value=np.nan)
+        validos = np.isfinite(importancia) & np.isfinite(valor)
+        proporcao = None
+        if "proporcao" in itens.columns:
+            proporcao = itens["proporcao"].fillna(0).to_numpy(dtype=np.float64)[validos]
+
+        # A seleção por máscara já produz vetores novos, que não precisam ser copiados novamente pelo construtor.
+        importancia, valor = importancia[validos], valor[validos]
+        importancia.setflags(write=False)
+        valor.setflags(write=False)
+
+        return cls(importancia, valor, itens, np.flatnonzero(validos), proporcao)
+
+    def __len__(self):
+        return len(self.valor)
+
+    @property
+    def ordem(self) -> np.ndarray:
+        """
+        Posições dos itens em ordem decrescente da razão importância/valor. A ordenação é estável e calculada uma única
+        vez por instância.
+        """
+        if self._ordem is None:
+            ordem = np.argsort(-self.importancia_por_valor, kind="stable")
+            ordem.setflags(write=False)
+            self._ordem = ordem
+
+        return self._ordem
+
+    @property
+    def ordenada(self) -> bool:
+        """
+        Indica se a ordenação dos itens pela razão importância/valor já foi calculada.
+        """
+        return self._ordem is not None
+
+    @property
+    def valor_acumulado(self) -> np.ndarray:
+        """
+        Soma acumulada dos valores na ordem decrescente da razão importância/valor, com n + 1 posições: a posição k
+        contém a soma dos valores dos k primeiros itens da ordem.
+        """
+        if self._valor_acumulado is None:
+            self._valor_acumulado = self._acumular(self.valor)
+
+        return self._valor_acumulado
+
+    @property
+    def importancia_acumulada(self) -> np.ndarray:
+        """
+        Soma acumulada das importâncias na ordem decrescente da razão importância/valor, com n + 1 posições: a posição
+        k contém a soma das importâncias dos k primeiros itens da ordem.
+        """
+        if self._importancia_acumulada is None:
+            self._importancia_acumulada = self._acumular(self.importancia)
+
+        return self._importancia_acumulada
+
+    def _acumular(self, vetor: np.ndarray) -> np.ndarray:
+        acumulado = np.zeros(len(vetor) + 1)
+        np.cumsum(vetor[self.ordem], out=acumulado[1:])
+        acumulado.setflags(write=False)
+        return acumulado
+
+    def limitante_dantzig(self, valor_disponivel: float) -> float:
+        """
+        Calcula o limitante de Dantzig (relaxação linear) do problema: os itens são incluídos em ordem decrescente da
+        razão importância/valor e o primeiro que não couber é incluído de forma fracionada. Nenhuma solução binária
+        tem importância maior.
+
+        Se a ordenação dos itens ainda não foi calculada, o limitante é obtido por seleção parcial, em tempo linear
+        esperado (veja `particao_critica`).
+
+        :param valor_disponivel: Valor do orçamento disponível (capacidade da mochila).
+        :return: Limitante superior da importância de qualquer solução.
+        """
+        if not self.ordenada:
+            return self.particao_critica(valor_disponivel)[3]
+
+        critico = int(np.searchsorted(self.valor_acumulado, valor_disponivel, side="right")) - 1
+        if critico < 0:
+            return 0.0
+        limitante = float(self.importancia_acumulada[critico])
+        if critico < len(self):
+            restante = valor_disponivel - float(self.valor_acumulado[critico])
+            limitante += restante * float(self.importancia_por_valor[self.ordem[critico]])
+
+        return limitante
+
+    def particao_critica(self, valor_disponivel: float) -> tuple:
+        """
+        Encontra o item crítico (o primeiro item, na ordem decrescente da razão importância/valor, que não cabe no
+        valor disponível), os itens anteriores a ele e o limitante de Dantzig sem ordenar os itens, por seleção parcial
+        (Balas e Zemel).
+
+        A cada etapa, a razão mediana de uma amostra dos itens candidatos divide-os em itens de razão maior, igual e
+        menor. Se os itens de razão maior não couberem no valor restante, o item crítico está entre eles; caso
+        contrário, eles são incluídos e a busca continua pelos itens de razão igual (na ordem das posições, como na
+        ordenação estável) e, se também couberem, pelos de razão menor. Cada etapa descarta uma fração dos candidatos,
+        o que resulta em tempo linear esperado. Quando restam poucos candidatos, eles são ordenados. O resultado é o
+        mesmo da ordenação completa, a menos de arredondamentos nas somas dos valores.
+
+        :param valor_disponivel: Valor do orçamento disponível (capacidade da mochila).
+        :return: Posições (em ordem crescente) dos itens anteriores ao item crítico, posição do item crítico (-1 se
+            todos os itens couberem ou se o valor disponível for negativo), valor restante após a inclusão dos itens
+            anteriores e limitante de Dantzig.
+        """
+        if valor_disponivel < 0:
+            return np.empty(0, dtype=np.intp), -1, valor_disponivel, 0.0
+
+        incluidos = np.zeros(len(self), dtype=bool)
+        restante = float(valor_disponivel)
+        critico = -1
+        # Posições dos itens candidatos a item crítico (None na primeira etapa, em que todos os itens são candidatos).
+        candidatos = None
+        while True:
+            razoes = self.importancia_por_valor if candidatos is None else self.importancia_por_valor[candidatos]
+            valores = self.valor if candidatos is None else self.valor[candidatos]
+            m = len(razoes)
+            if m == 0:
+                break
+            if m <= self.TAMANHO_ORDENACAO:
+                # Poucos candidatos: a ordenação estável resolve a etapa final.
+                posicoes = np.arange(m) if candidatos is None else candidatos
+                ordem = np.argsort(-razoes, kind="stable")
+                acumulado = np.cumsum(valores[ordem])
+                k = int(np.searchsorted(acumulado, restante, side="right"))
+                incluidos[posicoes[ordem[:k]]] = True
+                if k > 0:
+                    restante -= float(acumulado[k - 1])
+                if k < m:
+                    critico = int(posicoes[ordem[k]])
+                break
+
+            # O pivô é a razão de um dos candidatos, de modo que o conjunto de razão igual nunca é vazio.
+            amostra = razoes[::max(m // 127, 1)]
+            pivo = np.partition(amostra, len(amostra) // 2)[len(amostra) // 2]
+            maiores = razoes > pivo
+            soma_maiores = float(valores[maiores].sum())
+            if soma_maiores > restante:
+                candidatos = np.flatnonzero(maiores) if candidatos is None else candidatos[maiores]
+                continue
+
+            # Os itens de razão maior cabem. Entre os de razão igual, o item crítico é o primeiro que não couber.
+            iguais = razoes == pivo
+            posicoes_maiores = np.flatnonzero(maiores) if candidatos is None else candidatos[maiores]
+            posicoes_iguais = np.flatnonzero(iguais) if candidatos is None else candidatos[iguais]
+            incluidos[posicoes_maiores] = True
+            restante -= soma_maiores
+            acumulado = np.cumsum(valores[iguais])
+            k = int(np.searchsorted(acumulado, restante, side="right"))
+            incluidos[posicoes_iguais[:k]] = True
+            if k > 0:
+                restante -= float(acumulado[k - 1])
+            if k < len(posicoes_iguais):
+                critico = int(posicoes_iguais[k])
+                break
+            menores = razoes < pivo
+            candidatos = np.flatnonzero(menores) if candidatos is None else candidatos[menores]
+
+        incluidos = np.flatnonzero(incluidos)
+        limitante = float(self.importancia[incluidos].sum())
+        if critico > -1:
+            limitante += restante * float(self.importancia_por_valor[critico])
+
+        return incluidos, critico, restante, limitante
+
+
+class SolucaoKnapsack:
+    """
+    Classe que representa a solução obtida por um *solver* do Problema da Mochila Binária (0-1 Knapsack Problem).
+
+    A solução guarda apenas as posições dos itens selecionados na instância. O DataFrame com a coluna "proporcao"
+    só é construído quando solicitado através do atributo `itens`.
+    """
+
+    def __init__(self, instancia: InstanciaKnapsack, selecionados, item_fracionado: int = -1, fracao: float = 0.0):
+        """
+        Método construtor.
+
+        :param instancia: Instância do problema solucionado.
+        :param selecionados: Posições, na instância, dos itens selecionados integralmente.
+        :param item_fracionado: Posição do item incluído de forma fracionada, se houver (-1 caso contrário).
+        :param fracao: Proporção do item fracionado incluída na solução.
+        """
+        self.instancia = instancia
+        """
+        Instância do problema solucionado.
+        """
+        self.selecionados = np.sort(np.asarray(selecionados, dtype=np.intp))
+        """
+        Posições, na instância, dos itens selecionados integralmente (em ordem crescente).
+        """
+        self.item_fracionado = item_fracionado
+        """
+        Posição do item incluído de forma fracionada, se houver (-1 caso contrário).
+        """
+        self.fracao = fracao if item_fracionado > -1 else 0.0
+        """
+        Proporção do item fracionado incluída na solução.
+        """
+        self.limitante_superior = None
+        """
+        Limitante superior comprovado da importância de qualquer solução do problema (certificado da qualidade da
+        solução), quando o *solver* o fornece. Igual à importância quando a solução é ótima.
+        """
+        self.fases = None
+        """
+        Tempo, em segundos, de cada fase da execução do *solver* que obteve a solução (o dicionário
+        `EstatisticasSolver.fases` daquela execução). A construção do DataFrame `itens`, feita apenas na primeira
+        consulta, é somada à fase "materializacao".
+        """
+        self._itens = None
+
+    def __len__(self):
+        return len(self.selecionados)
+
+    @property
+    def importancia(self) -> float:
+        """
+        Importância somada dos itens da solução.
+        """
+        importancia = float(self.instancia.importancia[self.selecionados].sum())
+        if self.item_fracionado > -1:
+            importancia += self.fracao * float(self.instancia.importancia[self.item_fracionado])
+
+        return importancia
+
+    @property
+    def valor(self) -> float:
+        """
+        Valor somado dos itens da solução.
+        """
+        valor = float(self.instancia.valor[self.selecionados].sum())
+        if self.item_fracionado > -1:
+            valor += self.fracao * float(self.instancia.valor[self.item_fracionado])
+
+        return valor
+
+    def certificar(self, limitante_superior: float = None) -> "SolucaoKnapsack":
+        """
+        Registra o limitante superior que certifica a qualidade da solução.
+
+        :param limitante_superior: Limitante superior comprovado. Se não informado, a solução é ótima e o limitante é
+            a sua própria importância.
+        :return: A própria solução.
+        """
+        importancia = self.importancia
+        self.limitante_superior = importancia if limitante_superior is None else max(limitante_superior, importancia)
+
+        return self
+
+    @property
+    def gap(self) -> float:
+        """
+        Distância absoluta entre o limitante superior e a importância da solução (None se não houver limitante).
+        """
+        if self.limitante_superior is None:
+            return None
+
+        return self.limitante_superior - self.importancia
+
+    @property
+    def gap_relativo(self) -> float:
+        """
+        Distância entre o limitante superior e a importância da solução, relativa à importância (None se não houver
+        limitante e infinito se a solução for vazia e o limitante, positivo).
+        """
+        gap = self.gap
+        if gap is None or gap <= 0:
+            return gap
+
+        importancia = abs(self.importancia)
+        return gap / importancia if importancia > 0 else np.inf
+
+    @property
+    def indices(self) -> pd.Index:
+        """
+        Índices, no DataFrame original, dos itens selecionados integralmente.
+        """
+        posicoes = self.instancia.posicoes_originais[self.selecionados]
+        if self.instancia.itens is None:
+            return pd.Index(posicoes)
+
+        return self.instancia.itens.index[posicoes]
+
+    def vetor_binario(self) -> np.ndarray:
+        """
+        Representa a solução como um vetor de bytes com 1 nos itens selecionados e 0 nos demais.
+
+        :return: Vetor NumPy (uint8) com o tamanho da instância.
+        """
+        solucao = np.zeros(len(self.instancia), dtype=np.uint8)
+        solucao[self.selecionados] = 1
+
+        return solucao
+
+    @property
+    def itens(self) -> pd.DataFrame:
+        """
+        DataFrame do Pandas contendo os itens marcados (coluna "proporcao") ou não para compor o orçamento. É
+        construído na primeira consulta e reutilizado nas seguintes.
+        """
+        if self._itens is None:
+            inicio = time.perf_counter()
+            instancia = self.instancia
+            if instancia.itens is not None:
+                itens = instancia.itens.copy()
+                posicoes = instancia.posicoes_originais
+            else:
+                # Sem DataFrame original, os itens são montados a partir dos vetores, indexados pelas posições
+                # originais.
+                itens = pd.DataFrame({"importancia": instancia.importancia, "valor": instancia.valor,
+                                      "importancia_por_valor": instancia.importancia_por_valor},
+                                     index=instancia.posicoes_originais)
+                posicoes = np.arange(len(instancia))
+
+            if self.item_fracionado > -1:
+                proporcao = np.zeros(len(itens))
+                proporcao[posicoes[self.item_fracionado]] = self.fracao
+            else:
+                proporcao = np.zeros(len(itens), dtype=np.int64)
+            proporcao[posicoes[self.selecionados]] = 1
+            itens["proporcao"] = proporcao
+            self._itens = itens
+            if self.fases is not None:
+                self.fases["materializacao"] = self.fases.get("materializacao", 0.0) + time.perf_counter() - inicio
+
+        return self._itens
+
+
+class FronteiraKnapsack:
+    """
+    Classe que representa a fronteira eficiente de um Problema da Mochila Binária (0-1 Knapsack Problem): para cada
+    orçamento (capacidade), a importância máxima e os itens que a atingem.
+
+    A fronteira é guardada de forma compacta, em vetores com um ponto por orçamento e uma matriz de bits com os itens
+    selecionados em cada ponto (uma linha de n bits por ponto). Para um orçamento entre dois pontos, vale o ponto
+    imediatamente inferior.
+    """
+
+    def __init__(self, instancia: InstanciaKnapsack, orcamentos, importancias, selecoes):
+        """
+        Método construtor.
+
+        :param instancia: Instância do problema solucionado.
+        :param orcamentos: Orçamento de cada ponto, em ordem crescente.
+        :param importancias: Importância máxima de cada ponto.
+        :param selecoes: Matriz booleana (pontos x itens) com os itens selecionados em cada ponto.
+        """
+        self.instancia = instancia
+        """
+        Instância do problema solucionado.
+        """
+        self.orcamentos = np.asarray(orcamentos, dtype=np.float64)
+        """
+        Orçamento de cada ponto da fronteira, em ordem crescente.
+        """
+        self.importancias = np.asarray(importancias, dtype=np.float64)
+        """
+        Importância máxima de cada ponto da fronteira.
+        """
+        self.selecoes = np.packbits(np.asarray(selecoes, dtype=bool).reshape(len(self.orcamentos), len(instancia)),
+                                    axis=1, bitorder="little")
+        """
+        Itens selecionados em cada ponto, compactados em bits (uma linha por ponto).
+        """
+
+    def __len__(self):
+        return len(self.orcamentos)
+
+    def _ponto(self, orcamento: float) -> int:
+        return int(np.searchsorted(self.orcamentos, orcamento, side="right")) - 1
+
+    def importancia_maxima(self, orcamentos):
+        """
+        Consulta a importância máxima de um ou vários orçamentos.
+
+        :param orcamentos: Orçamento ou vetor de orçamentos.
+        :return: Importância máxima de cada orçamento (zero para orçamentos anteriores ao primeiro ponto).
+        """
+        pontos = np.searchsorted(self.orcamentos, orcamentos, side="right") - 1
+        importancias = np.append(0.0, self.importancias)[pontos + 1]
+
+        return importancias if np.ndim(importancias) else float(importancias)
+
+    def solucao(self, orcamento: float) -> SolucaoKnapsack:
+        """
+        Obtém a solução de um orçamento.
+
+        :param orcamento: Orçamento desejado.
+        :return: Solução do ponto da fronteira correspondente ao orçamento.
+        """
+        ponto = self._ponto(orcamento)
+        if ponto < 0:
+            return SolucaoKnapsack(self.instancia, [])
+
+        selecionados = np.unpackbits(self.selecoes[ponto], count=len(self.instancia), bitorder="little")
+        return SolucaoKnapsack(self.instancia, np.flatnonzero(selecionados))
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Resume a fronteira em um DataFrame do Pandas com uma linha por ponto: orçamento, importância máxima, valor
+        utilizado e quantidade de itens selecionados.
+        """
+        selecoes = np.unpackbits(self.selecoes, axis=1, count=len(self.instancia), bitorder="little")
+        return pd.DataFrame({"orcamento": self.orcamentos, "importancia": self.importancias,
+                             "valor": selecoes @ self.instancia.valor,
+                             "itens_selecionados": selecoes.sum(axis=1, dtype=np.int64)})
@@ -1,7 +1,11 @@
+from typing import Union
+
 import pandas as pd
 
-from algoritmos_aproximados import GreedyKnapsackSolver, TabuSearchKnapsackSolver
-from algoritmos_exatos import DynamicProgrammingKnapsackSolver, BranchAndBoundKnapsackSolver
+from algoritmos_aproximados import GreedyKnapsackSolver, TabuSearchKnapsackSolver, FPTASKnapsackSolver
+from algoritmos_exatos import DynamicProgrammingKnapsackSolver, BranchAndBoundKnapsackSolver, \
+    AdaptiveDynamicProgrammingKnapsackSolver
+from instancia_knapsack import InstanciaKnapsack
 
 
 class KnapsackSolverFactory:
@@ -27,15 +31,47 @@ class KnapsackSolverFactory:
     """
     Abordagem baseada na metaheurística de Busca Tabu.
     """
+    ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER = 4
+    """
+    Abordagem baseada em Programação Dinâmica vetorizada, sem dependência do OR-Tools, que indexa a tabela pela
+    importância ou pelo valor (reduzido pelo máximo divisor comum), conforme o menor custo.
+    """
+    AUTO_KNAPSACK_SOLVER = 5
+    """
+    Escolha automática, entre o Branch and Bound e a Programação Dinâmica Adaptativa, do *solver* de menor tempo
+    estimado pelo modelo de custo (`portfolio_knapsack.ModeloCusto`) a partir das características da instância.
+    """
+    RACING_KNAPSACK_SOLVER = 6
+    """
+    Execução concorrente de vários *solvers* em processos auxiliares: a primeira solução com otimalidade comprovada é
+    retornada e os demais *solvers* são encerrados.
+    """
+    FPTAS_KNAPSACK_SOLVER = 7
+    """
+    Abordagem baseada em esquema de aproximação totalmente polinomial (FPTAS): a solução tem importância de pelo menos
+    (1 - epsilon) vezes a ótima, com tempo polinomial na quantidade de itens e em 1 / epsilon.
+    """
+
+    @staticmethod
+    def solvers_registrados() -> dict:
+        """
+        Obtém os tipos de *solver* registrados na *factory*.
+
+        :return: Dicionário com o nome da constante de cada tipo e o seu valor.
+        """
+        return {nome: valor for nome, valor in vars(KnapsackSolverFactory).items()
+                if nome.endswith("_KNAPSACK_SOLVER")}
 
     @staticmethod
-    def get_solver(tipo: int, valor_disponivel: float, itens: pd.DataFrame):
+    def get_solver(tipo: int, valor_disponivel: float, itens: Union[pd.DataFrame, InstanciaKnapsack]):
         """
         Método estático de criação de *knapsack solvers*.
 
         :param tipo: Tipo de _solver_ que se deseja criar.
         :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
-        :param itens: Itens que serão avaliados para compor o orçamento.
+        :param itens: Itens que serão avaliados para compor o orçamento. Para avaliar vários *solvers* sobre os
+            mesmos itens, recomenda-se compilar o DataFrame uma única vez com `InstanciaKnapsack.de_dataframe` e
+            repassar a instância, que é compartilhada sem cópia.
         :return: Instância do tipo de solver selecionado.
         :raises AssertionError: Se for passado um tipo não existente de solver, dispara um AssertionError.
         """
@@ -47,4 +83,14 @@ class KnapsackSolverFactory:
             return GreedyKnapsackSolver(valor_disponivel, itens)
         elif tipo == KnapsackSolverFactory.TABU_SEARCH_KNAPSACK_SOLVER:
             return TabuSearchKnapsackSolver(valor_disponivel, itens)
+        elif tipo == KnapsackSolverFactory.ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER:
+            return AdaptiveDynamicProgrammingKnapsackSolver(valor_disponivel, itens)
+        elif tipo == KnapsackSolverFactory.FPTAS_KNAPSACK_SOLVER:
+            return FPTASKnapsackSolver(valor_disponivel, itens)
+        elif tipo in (KnapsackSolverFactory.AUTO_KNAPSACK_SOLVER, KnapsackSolverFactory.RACING_KNAPSACK_SOLVER):
+            # O portfólio depende da factory e, por isso, é importado apenas quando utilizado.
+            from portfolio_knapsack import RacingKnapsackSolver, escolher_solver
+            if tipo == KnapsackSolverFactory.AUTO_KNAPSACK_SOLVER:
+                return escolher_solver(valor_disponivel, itens)
+            return RacingKnapsackSolver(valor_disponivel, itens)
         raise AssertionError("Tipo de Knapsack Solver inválido.")
@@ -0,0 +1,213 @@
+"""Solução em lote de vários problemas independentes (por exemplo, um por unidade, ano ou cenário) em paralelo."""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+import pandas as pd
+
+from instancia_knapsack import InstanciaKnapsack, SolucaoKnapsack
+from knapsack_utils import KnapsackSolverFactory
+from paralelismo_knapsack import InstanciaCompartilhada
+
+# Estado de cada processo auxiliar do lote, preenchido uma única vez na inicialização do processo.
+_estado_processo = {}
+
+
+class TarefaKnapsack:
+    """
+    Classe que representa uma tarefa do lote: os itens, o valor disponível, o tipo de *solver* e os parâmetros do
+    método `solucionar`.
+    """
+
+    def __init__(self, itens: Union[pd.DataFrame, InstanciaKnapsack], valor_disponivel: float,
+                 tipo: int = KnapsackSolverFactory.ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER,
+                 parametros: dict = None, chave=None):
+        """
+        Método construtor.
+
+        :param itens: Itens da tarefa. Tarefas que repassam o mesmo objeto (DataFrame ou instância) compartilham uma
+            única cópia dos vetores em memória compartilhada.
+        :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
+        :param tipo: Tipo de *solver* (constantes de `KnapsackSolverFactory`). Padrão: Programação Dinâmica
+            Adaptativa.
+        :param parametros: Parâmetros repassados ao método `solucionar` do *solver*.
+        :param chave: Identificação da tarefa (por exemplo, unidade e ano), devolvida no resultado.
+        """
+        self.itens = itens
+        self.valor_disponivel = valor_disponivel
+        self.tipo = tipo
+        self.parametros = parametros or {}
+        self.chave = chave
+
+
+class ResultadoLote:
+    """
+    Classe que representa o resultado de uma tarefa do lote.
+    """
+
+    def __init__(self, indice: int, tarefa: TarefaKnapsack, solucao: SolucaoKnapsack = None,
+                 estatisticas: dict = None, erro: BaseException = None):
+        self.indice = indice
+        """
+        Posição da tarefa no lote.
+        """
+        self.tarefa = tarefa
+        """
+        Tarefa solucionada.
+        """
+        self.solucao = solucao
+        """
+        Solução obtida, referente aos itens da tarefa (None se ocorreu erro).
+        """
+        self.estatisticas = estatisticas or {}
+        """
+        Estatísticas da execução do *solver* (veja `EstatisticasSolver.como_dict`).
+        """
+        self.erro = erro
+        """
+        Exceção lançada pelo *solver*, se houver.
+        """
+
+    @property
+    def chave(self):
+        """
+        Identificação da tarefa.
+        """
+        return self.tarefa.chave
+
+    def __repr__(self):
+        if self.erro is not None:
+            return "ResultadoLote({}, {!r}, erro={!r})".format(self.indice, self.chave, self.erro)
+
+        return "ResultadoLote({}, {!r}, importancia={})".format(self.indice, self.chave, self.solucao.importancia)
+
+
+def _tarefa(tarefa) -> TarefaKnapsack:
+    # Tarefas também podem ser informadas como tuplas (itens, valor_disponivel[, tipo[, parametros[, chave]]]).
+    return tarefa if isinstance(tarefa, TarefaKnapsack) else TarefaKnapsack(*tarefa)
+
+
+def _agrupar(tarefas: list, tamanhos: list, itens_por_bloco: int) -> list:
+    """
+    Agrupa as tarefas em blocos despachados de uma só vez aos processos, para reduzir o custo de despacho das tarefas
+    pequenas. As tarefas são acumuladas em um bloco até que a soma de seus itens alcance itens_por_bloco. Tarefas da
+    Busca Tabu, cuja duração é dada pelo tempo limite e não pelo tamanho, e tarefas grandes formam blocos próprios.
+
+    :return: Lista de blocos, cada um uma lista de posições de tarefas.
+    """
+    blocos, bloco, itens_bloco = [], [], 0
+    for indice, (tarefa, tamanho) in enumerate(zip(tarefas, tamanhos)):
+        if tarefa.tipo == KnapsackSolverFactory.TABU_SEARCH_KNAPSACK_SOLVER or tamanho >= itens_por_bloco:
+            blocos.append([indice])
+            continue
+        bloco.append(indice)
+        itens_bloco += tamanho
+        if itens_bloco >= itens_por_bloco:
+            blocos.append(bloco)
+            bloco, itens_bloco = [], 0
+    if bloco:
+        blocos.append(bloco)
+
+    return blocos
+
+
+def solucionar_lote(tarefas: Iterable, processos: int = None, itens_por_bloco: int = 20000) -> Iterator[ResultadoLote]:
+    """
+    Soluciona várias tarefas independentes em um conjunto de processos auxiliares, produzindo os resultados à medida
+    que são concluídos (não necessariamente na ordem das tarefas; use o atributo `indice` do resultado).
+
+    Os vetores de importância, valor e proporção (solução inicial) de todas as tarefas são publicados uma única vez em
+    memória compartilhada, de modo que cada processo recebe apenas posições e parâmetros, e não os DataFrames
+    serializados. As tarefas pequenas são agrupadas em blocos. O erro de uma tarefa não interrompe as demais: é
+    devolvido no resultado.
+
+    :param tarefas: Tarefas do lote (`TarefaKnapsack` ou tuplas (itens, valor_disponivel[, tipo[, parametros[,
+        chave]]])).
+    :param processos: Quantidade de processos auxiliares. Padrão igual à quantidade de processadores.
+    :param itens_por_bloco: Quantidade de itens, somadas as tarefas, a partir da qual um bloco é despachado.
+    :return: Iterador dos resultados das tarefas, na ordem de conclusão.
+    """
+    tarefas = [_tarefa(tarefa) for tarefa in tarefas]
+    if not tarefas:
+        return
+
+    # Compila os itens de cada tarefa uma única vez por objeto e calcula a posição de cada instância no vetor único
+    # publicado em memória compartilhada.
+    instancias, posicoes, inicios = [], {}, []
+    for tarefa in tarefas:
+        if id(tarefa.itens) not in posicoes:
+            posicoes[id(tarefa.itens)] = len(instancias)
+            itens = tarefa.itens
+            instancias.append(itens if isinstance(itens, InstanciaKnapsack) else InstanciaKnapsack.de_dataframe(itens))
+        inicios.append(posicoes[id(tarefa.itens)])
+    limites = np.concatenate(([0], np.cumsum([len(instancia) for instancia in instancias])))
+    unificada = InstanciaKnapsack(np.concatenate([instancia.importancia for instancia in instancias]),
+                                  np.concatenate([instancia.valor for instancia in instancias]),
+                                  proporcao=np.concatenate([instancia.proporcao for instancia in instancias]))
+    tamanhos = [len(instancias[posicao]) for posicao in inicios]
+
+    def descrever(indice):
+        tarefa, posicao = tarefas[indice], inicios[indice]
+        return (indice, int(limites[posicao]), int(limites[posicao + 1]), tarefa.valor_disponivel, tarefa.tipo,
+                tarefa.parametros)
+
+    blocos = _agrupar(tarefas, tamanhos, itens_por_bloco)
+    with InstanciaCompartilhada(unificada) as instancia_compartilhada:
+        executor = ProcessPoolExecutor(max_workers=min(processos or os.cpu_count() or 1, len(blocos)),
+                                       initializer=_inicializar_processo_lote,
+                                       initargs=(instancia_compartilhada.descritor,))
+        try:
+            pendentes = {executor.submit(_executar_bloco, [descrever(indice) for indice in bloco])
+                         for bloco in blocos}
+            while pendentes:
+                concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for concluido in concluidos:
+                    for indice, selecionados, item_fracionado, fracao, limitante, estatisticas, erro in \
+                            concluido.result():
+                        tarefa = tarefas[indice]
+                        if erro is not None:
+                            yield ResultadoLote(indice, tarefa, estatisticas=estatisticas, erro=erro)
+                            continue
+                        solucao = SolucaoKnapsack(instancias[inicios[indice]], selecionados, item_fracionado, fracao)
+                        solucao.limitante_superior = limitante
+                        yield ResultadoLote(indice, tarefa, solucao, estatisticas)
+        finally:
+            # Se o consumidor interromper a iteração, os blocos ainda não iniciados são cancelados.
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _inicializar_processo_lote(descritor: tuple):
+    """
+    Inicializa um processo auxiliar do lote, anexando os vetores publicados em memória compartilhada.
+    """
+    _estado_processo["instancia"], _estado_processo["memoria"] = InstanciaCompartilhada.anexar(descritor)
+
+
+def _executar_bloco(bloco: list) -> list:
+    """
+    Executa, em um processo auxiliar, as tarefas de um bloco. Os vetores de cada tarefa são fatias, sem cópia, dos
+    vetores em memória compartilhada.
+
+    :return: Lista com a posição, os itens selecionados, o item fracionado, a fração, o limitante superior, as
+        estatísticas e o erro de cada tarefa.
+    """
+    unificada = _estado_processo["instancia"]
+    resultados = []
+    for indice, inicio, fim, valor_disponivel, tipo, parametros in bloco:
+        instancia = InstanciaKnapsack(unificada.importancia[inicio:fim], unificada.valor[inicio:fim],
+                                      proporcao=unificada.proporcao[inicio:fim])
+        knapsack_solver = None
+        try:
+            # O solver é criado dentro do bloco protegido: um tipo inválido é um erro apenas da sua tarefa.
+            knapsack_solver = KnapsackSolverFactory.get_solver(tipo, valor_disponivel, instancia)
+            solucao = knapsack_solver.solucionar(**parametros)
+        except Exception as erro:
+            estatisticas = knapsack_solver.estatisticas.como_dict() if knapsack_solver is not None else None
+            resultados.append((indice, None, -1, 0.0, None, estatisticas, erro))
+            continue
+        resultados.append((indice, solucao.selecionados, solucao.item_fracionado, solucao.fracao,
+                           solucao.limitante_superior, knapsack_solver.estatisticas.como_dict(), None))
+
+    return resultados
@@ -0,0 +1,294 @@
+"""Classes de apoio à execução dos solvers em paralelo, em vários processos."""
+
+import ctypes
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from instancia_knapsack import InstanciaKnapsack
+
+
+class InstanciaCompartilhada:
+    """
+    Classe que publica os vetores de importância, valor e proporção (solução inicial) de uma instância em memória
+    compartilhada, para que processos auxiliares os acessem sem que o DataFrame ou os vetores sejam serializados
+    (*pickle*) a cada tarefa.
+
+    O processo que cria a instância compartilhada é responsável por liberá-la com o método `fechar` (ou utilizando a
+    classe como gerenciador de contexto). Os processos auxiliares recebem apenas o `descritor`, que é pequeno, e
+    reconstroem a instância com o método estático `anexar`.
+    """
+
+    def __init__(self, instancia: InstanciaKnapsack):
+        """
+        Método construtor.
+
+        :param instancia: Instância cujos vetores serão publicados em memória compartilhada.
+        """
+        n = len(instancia)
+        # O bloco não pode ter tamanho zero; instâncias vazias ocupam um único byte.
+        self._memoria = shared_memory.SharedMemory(create=True, size=max(3 * n * 8, 1))
+        vetores = np.ndarray((3, n), dtype=np.float64, buffer=self._memoria.buf)
+        vetores[0] = instancia.importancia
+        vetores[1] = instancia.valor
+        # A proporção é publicada para que a instância reconstruída seja equivalente à original: a Busca Tabu parte
+        # dela quando a solução gulosa não é utilizada, e ela compõe a chave do cache de soluções.
+        vetores[2] = instancia.proporcao
+        del vetores
+        self.descritor = (self._memoria.name, n)
+        """
+        Descritor (nome do bloco de memória compartilhada e quantidade de itens) a ser repassado aos processos.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def fechar(self):
+        """
+        Libera o bloco de memória compartilhada.
+        """
+        if self._memoria is not None:
+            self._memoria.close()
+            self._memoria.unlink()
+            self._memoria = None
+
+    @staticmethod
+    def anexar(descritor: tuple) -> tuple:
+        """
+        Reconstrói, em um processo auxiliar, a instância publicada em memória compartilhada. Os vetores de importância,
+        valor e proporção da instância apontam diretamente para a memória compartilhada e são somente leitura.
+
+        :param descritor: Descritor da instância compartilhada.
+        :return: Instância reconstruída e o bloco de memória compartilhada, que deve ser mantido enquanto a instância
+            for utilizada.
+        """
+        nome, n = descritor
+        memoria = shared_memory.SharedMemory(name=nome)
+        vetores = np.ndarray((3, n), dtype=np.float64, buffer=memoria.buf)
+        vetores.setflags(write=False)
+
+        return InstanciaKnapsack(vetores[0], vetores[1], proporcao=vetores[2]), memoria
+
+
+class IncumbenteCompartilhado:
+    """
+    Classe que mantém, em memória compartilhada entre processos, a melhor solução conhecida (incumbente) e sua
+    importância. Os processos publicam suas melhores soluções e consultam a melhor solução global.
+    """
+
+    def __init__(self, tamanho: int, contexto=None):
+        """
+        Método construtor.
+
+        :param tamanho: Quantidade de itens da instância.
+        :param contexto: Contexto do módulo multiprocessing a ser utilizado. Se não informado, utiliza o padrão.
+        """
+        contexto = contexto or multiprocessing.get_context()
+        self._trava = contexto.Lock()
+        self._importancia = contexto.RawValue(ctypes.c_double, -np.inf)
+        self._versao = contexto.RawValue(ctypes.c_long, 0)
+        self._solucao = contexto.RawArray(ctypes.c_uint8, max(tamanho, 1))
+        self._tamanho = tamanho
+
+    @property
+    def importancia(self) -> float:
+        """
+        Importância da melhor solução publicada até o momento (-inf se nenhuma foi publicada).
+        """
+        return self._importancia.value
+
+    @property
+    def versao(self) -> int:
+        """
+        Quantidade de vezes em que o incumbente foi substituído. Permite aos processos detectar novas publicações.
+        """
+        return self._versao.value
+
+    def publicar(self, importancia: float, solucao: np.ndarray) -> bool:
+        """
+        Publica uma solução, que só substitui o incumbente se tiver importância maior.
+
+        :param importancia: Importância da solução.
+        :param solucao: Vetor de bytes com 1 nos itens selecionados e 0 nos demais.
+        :return: Verdadeiro se a solução passou a ser o incumbente.
+        """
+        with self._trava:
+            if importancia <= self._importancia.value:
+                return False
+            np.frombuffer(self._solucao, dtype=np.uint8)[:self._tamanho] = solucao
+            self._importancia.value = importancia
+            self._versao.value += 1
+            return True
+
+    def consultar(self) -> tuple:
+        """
+        Consulta o incumbente.
+
+        :return: Importância, vetor de bytes com a solução (cópia) e versão do incumbente.
+        """
+        with self._trava:
+            solucao = np.frombuffer(self._solucao, dtype=np.uint8)[:self._tamanho].copy()
+            return self._importancia.value, solucao, self._versao.value
+
+
+class DistribuicaoTrabalho:
+    """
+    Classe que coordena a distribuição de trabalho entre processos por roubo de trabalho (*work stealing*). Cada
+    processo mantém seus subproblemas localmente. Os processos sem trabalho se declaram ociosos e os processos ocupados, ao
+    perceberem que há processos ociosos, reivindicam um deles e lhe enviam parte de seus subproblemas pela caixa de
+    entrada desse processo.
+
+    A distribuição termina quando todos os processos estão ociosos: um processo reivindicado deixa de ser contado como
+    ocioso antes do envio e, portanto, não há trabalho em trânsito nesse momento. A distribuição também pode ser
+    encerrada a qualquer momento (por exemplo, por tempo limite); os processos reivindicados recebem o trabalho em
+    trânsito antes de encerrar, de modo que nenhum subproblema é perdido.
+
+    Cada processo também informa periodicamente o maior limitante de seus subproblemas e a quantidade de subproblemas
+    já expandidos, para que o processo coordenador acompanhe o limitante global da busca. O limitante do trabalho
+    enviado é atribuído ao processo que o recebe antes do envio, de modo que o limitante global nunca é subestimado.
+    """
+
+    def __init__(self, processos: int, contexto=None):
+        """
+        Método construtor. Todos os processos iniciam ociosos.
+
+        :param processos: Quantidade de processos.
+        :param contexto: Contexto do módulo multiprocessing a ser utilizado. Se não informado, utiliza o padrão.
+        """
+        contexto = contexto or multiprocessing.get_context()
+        self.processos = processos
+        self._trava = contexto.Lock()
+        self._ociosos = contexto.RawValue(ctypes.c_int, processos)
+        self._encerrada = contexto.RawValue(ctypes.c_bool, False)
+        self._famintos = contexto.RawArray(ctypes.c_uint8, [1] * processos)
+        self._a_receber = contexto.RawArray(ctypes.c_uint8, processos)
+        self._limitantes = contexto.RawArray(ctypes.c_double, [-np.inf] * processos)
+        self._expansoes = contexto.RawArray(ctypes.c_long, processos)
+        self._caixas = [contexto.Queue() for _ in range(processos)]
+
+    @property
+    def ha_ociosos(self) -> bool:
+        """
+        Indica se há processos ociosos aguardando trabalho. A consulta não utiliza a trava e pode ser feita com
+        frequência pelos processos ocupados.
+        """
+        return self._ociosos.value > 0
+
+    @property
+    def encerrada(self) -> bool:
+        """
+        Indica se a distribuição foi encerrada, por término do trabalho ou por interrupção.
+        """
+        return self._encerrada.value
+
+    @property
+    def limitante(self) -> float:
+        """
+        Maior limitante informado pelos processos ou atribuído ao trabalho em trânsito (-inf se não houver trabalho).
+        """
+        with self._trava:
+            return max(self._limitantes)
+
+    @property
+    def expansoes(self) -> int:
+        """
+        Quantidade de subproblemas expandidos informada pelos processos, somados todos eles.
+        """
+        return sum(self._expansoes)
+
+    def informar(self, processo: int, limitante: float, expansoes: int):
+        """
+        Informa o maior limitante dos subproblemas do processo e a quantidade de subproblemas já expandidos por ele.
+
+        :param processo: Processo que informa.
+        :param limitante: Maior limitante dos subproblemas mantidos pelo processo.
+        :param expansoes: Quantidade de subproblemas expandidos pelo processo desde o início.
+        """
+        with self._trava:
+            self._limitantes[processo] = limitante
+        self._expansoes[processo] = expansoes
+
+    def reivindicar(self, processo: int = None) -> int:
+        """
+        Reivindica um processo ocioso, que passa a aguardar o trabalho a ser enviado.
+
+        :param processo: Processo a ser reivindicado. Se não informado, o primeiro processo ocioso.
+        :return: Processo reivindicado, ou None se não houver processo ocioso ou se a distribuição estiver encerrada.
+        """
+        with self._trava:
+            if self._encerrada.value:
+                return None
+            candidatos = range(self.processos) if processo is None else (processo,)
+            for candidato in candidatos:
+                if self._famintos[candidato]:
+                    self._famintos[candidato] = 0
+                    self._a_receber[candidato] = 1
+                    self._ociosos.value -= 1
+                    return candidato
+
+        return None
+
+    def enviar(self, processo: int, trabalho, limitante: float = np.inf):
+        """
+        Envia trabalho a um processo reivindicado.
+
+        :param processo: Processo reivindicado.
+        :param trabalho: Trabalho a ser enviado (serializável).
+        :param limitante: Maior limitante dos subproblemas enviados, atribuído ao processo reivindicado. Se não
+            informado, o limitante global deixa de ser conhecido até que o processo informe o seu.
+        """
+        with self._trava:
+            self._limitantes[processo] = limitante
+        self._caixas[processo].put(trabalho)
+
+    def receber(self, processo: int, intervalo: float = 0.05):
+        """
+        Aguarda trabalho na caixa de entrada do processo.
+
+        :param processo: Processo que aguarda trabalho.
+        :param intervalo: Intervalo, em segundos, entre as verificações do encerramento.
+        :return: Trabalho recebido, ou None se a distribuição for encerrada sem trabalho a receber.
+        """
+        while True:
+            try:
+                trabalho = self._caixas[processo].get(timeout=intervalo)
+            except queue.Empty:
+                with self._trava:
+                    if self._encerrada.value and not self._a_receber[processo]:
+                        return None
+            else:
+                with self._trava:
+                    self._a_receber[processo] = 0
+                return trabalho
+
+    def ocioso(self, processo: int) -> bool:
+        """
+        Declara o processo ocioso.
+
+        :param processo: Processo sem trabalho.
+        :return: Verdadeiro se a distribuição estiver encerrada. A distribuição é encerrada quando todos os processos
+            ficam ociosos.
+        """
+        with self._trava:
+            self._famintos[processo] = 1
+            self._limitantes[processo] = -np.inf
+            self._ociosos.value += 1
+            if self._ociosos.value == self.processos:
+                self._encerrada.value = True
+            return self._encerrada.value
+
+    def encerrar(self) -> bool:
+        """
+        Encerra a distribuição antes do término do trabalho.
+
+        :return: Verdadeiro se a distribuição ainda não estava encerrada (ou seja, se houve interrupção).
+        """
+        with self._trava:
+            interrompida = not self._encerrada.value
+            self._encerrada.value = True
+            return interrompida
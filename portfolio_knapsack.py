@@ -0,0 +1,304 @@
+"""Portfólio de solvers: escolha automática por modelo de custo e execução concorrente (corrida) de vários solvers."""
+
+import itertools
+import json
+import math
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from abstract_knapsack import AbstractKnapsackSolver
+from algoritmos_exatos import AdaptiveDynamicProgrammingKnapsackSolver
+from instancia_knapsack import InstanciaKnapsack, SolucaoKnapsack
+from knapsack_utils import KnapsackSolverFactory
+from paralelismo_knapsack import InstanciaCompartilhada
+
+COEFICIENTES_PADRAO = {
+    KnapsackSolverFactory.BRANCH_AND_BOUND_KNAPSACK_SOLVER: [-5.8780, 0.0, 0.1832, 0.7445],
+    KnapsackSolverFactory.ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER: [-14.8382, 0.0352, 0.7327, -0.1372],
+}
+"""
+Coeficientes do modelo de custo de cada tipo de *solver*, calibrados com o `benchmark_knapsack` (todas as famílias,
+de 10² a 10⁴ itens, amplitudes de 10² a 10⁴ e razões de capacidade de 0,1 e 0,5). Para reproduzi-los:
+
+    python benchmark_knapsack.py calibracao.json --tamanhos 100 1000 10000 --amplitudes 100 1000 10000
+        --razoes 0.1 0.5 --solvers 1 4 --repeticoes 2 --limite-tempo 10 --semente 0 --calibrar coeficientes.json
+
+No Branch and Bound, o tempo é explicado pela correlação (dificuldade) e não pela quantidade de itens, cujo
+coeficiente é limitado a zero na calibração.
+"""
+
+
+class ModeloCusto:
+    """
+    Classe que estima o tempo de execução de cada *solver* a partir de características da instância e escolhe o de
+    menor custo estimado.
+
+    O modelo de cada *solver* é log-linear: o logaritmo do tempo é uma combinação linear do logaritmo da quantidade de
+    itens, do logaritmo da quantidade de células da tabela da Programação Dinâmica Adaptativa (que reflete a
+    capacidade após a redução pelo máximo divisor comum, ou o limitante da importância) e da correlação entre
+    importância e valor, que torna o Branch and Bound mais difícil. Os coeficientes são ajustados por mínimos
+    quadrados sobre os resultados do `benchmark_knapsack`, com os coeficientes do tamanho (log n e log células) não
+    negativos: o tempo estimado não diminui quando a instância cresce.
+    """
+
+    def __init__(self, coeficientes: dict = None):
+        """
+        Método construtor.
+
+        :param coeficientes: Coeficientes de cada tipo de *solver* ({tipo: [constante, log n, log células,
+            correlação]}). Padrão: COEFICIENTES_PADRAO.
+        """
+        self.coeficientes = {int(tipo): list(map(float, valores))
+                             for tipo, valores in (coeficientes or COEFICIENTES_PADRAO).items()}
+        """
+        Coeficientes de cada tipo de *solver*.
+        """
+
+    @staticmethod
+    def caracteristicas(instancia: InstanciaKnapsack, valor_disponivel: float) -> dict:
+        """
+        Calcula as características da instância utilizadas pelo modelo.
+
+        :param instancia: Instância do problema.
+        :param valor_disponivel: Valor do orçamento disponível.
+        :return: Dicionário com a quantidade de itens (n), a quantidade de células da tabela da Programação Dinâmica
+            Adaptativa (celulas) e a correlação entre importância e valor (correlacao).
+        """
+        n = len(instancia)
+        _, celulas = AdaptiveDynamicProgrammingKnapsackSolver(valor_disponivel, instancia).escolher_dimensao()
+        correlacao = 0.0
+        if n > 1 and np.std(instancia.importancia) > 0 and np.std(instancia.valor) > 0:
+            correlacao = float(np.corrcoef(instancia.importancia, instancia.valor)[0, 1])
+
+        return {"n": n, "celulas": int(celulas), "correlacao": correlacao}
+
+    @staticmethod
+    def _variaveis(caracteristicas: dict) -> np.ndarray:
+        return np.array([1.0, math.log1p(caracteristicas["n"]), math.log1p(caracteristicas["celulas"]),
+                         caracteristicas["correlacao"]])
+
+    def estimar(self, instancia: InstanciaKnapsack, valor_disponivel: float) -> dict:
+        """
+        Estima o tempo de execução de cada *solver* do modelo.
+
+        :param instancia: Instância do problema.
+        :param valor_disponivel: Valor do orçamento disponível.
+        :return: Dicionário com o tempo estimado, em segundos, de cada tipo de *solver*.
+        """
+        variaveis = self._variaveis(self.caracteristicas(instancia, valor_disponivel))
+        return {tipo: math.exp(float(np.dot(coeficientes, variaveis)))
+                for tipo, coeficientes in self.coeficientes.items()}
+
+    def escolher(self, instancia: InstanciaKnapsack, valor_disponivel: float) -> int:
+        """
+        Escolhe o *solver* de menor tempo estimado.
+
+        :param instancia: Instância do problema.
+        :param valor_disponivel: Valor do orçamento disponível.
+        :return: Tipo de *solver* (constantes de `KnapsackSolverFactory`).
+        """
+        estimativas = self.estimar(instancia, valor_disponivel)
+        return min(estimativas, key=estimativas.get)
+
+    @classmethod
+    def calibrar(cls, benchmark: Union[dict, str]) -> "ModeloCusto":
+        """
+        Ajusta os coeficientes do modelo aos resultados de um *benchmark*. Execuções com tempo esgotado entram com o
+        limite de tempo, que é um limite inferior do seu tempo real; execuções com falha ou erro são descartadas.
+
+        Como a capacidade costuma crescer com a quantidade de itens, log n e log células são correlacionados e o
+        ajuste livre pode compensar um coeficiente positivo de um com um negativo do outro. Os coeficientes do tamanho
+        são, por isso, restritos a valores não negativos: entre os ajustes com cada subconjunto deles fixado em zero,
+        é escolhido o de menor erro que atende à restrição.
+
+        :param benchmark: Resultado de `benchmark_knapsack.executar_benchmark` ou arquivo JSON gravado por ele.
+        :return: Modelo calibrado, com os tipos de *solver* presentes no *benchmark*.
+        """
+        if isinstance(benchmark, str):
+            with open(benchmark, encoding="utf-8") as arquivo:
+                benchmark = json.load(arquivo)
+
+        amostras = {}
+        for execucao in benchmark["resultados"]:
+            if execucao.get("caracteristicas") is None:
+                continue
+            if execucao["situacao"] == "concluido":
+                tempo = execucao["tempo"]
+            elif execucao["situacao"] == "tempo_esgotado":
+                tempo = benchmark["limite_tempo"]
+            else:
+                continue
+            amostras.setdefault(int(execucao["tipo"]), []).append(
+                (cls._variaveis(execucao["caracteristicas"]), math.log(max(tempo, 1e-6))))
+
+        coeficientes = {}
+        for tipo, pares in amostras.items():
+            variaveis = np.array([par[0] for par in pares])
+            tempos = np.array([par[1] for par in pares])
+            coeficientes[tipo] = cls._ajustar(variaveis, tempos).tolist()
+
+        return cls(coeficientes)
+
+    @staticmethod
+    def _ajustar(variaveis: np.ndarray, tempos: np.ndarray) -> np.ndarray:
+        """
+        Ajuste por mínimos quadrados com os coeficientes do tamanho (posições 1 e 2) não negativos. Com apenas duas
+        restrições, todos os conjuntos ativos são avaliados.
+        """
+        tamanho = (1, 2)
+        melhor, menor_erro = None, np.inf
+        for fixados in itertools.chain.from_iterable(itertools.combinations(tamanho, k) for k in range(3)):
+            livres = [j for j in range(variaveis.shape[1]) if j not in fixados]
+            coeficientes = np.zeros(variaveis.shape[1])
+            coeficientes[livres] = np.linalg.lstsq(variaveis[:, livres], tempos, rcond=None)[0]
+            erro = float(np.sum((variaveis @ coeficientes - tempos) ** 2))
+            if (coeficientes[list(tamanho)] >= 0).all() and erro < menor_erro:
+                melhor, menor_erro = coeficientes, erro
+
+        return melhor
+
+    def salvar(self, arquivo: str):
+        """
+        Grava os coeficientes do modelo em um arquivo JSON.
+
+        :param arquivo: Caminho do arquivo.
+        """
+        with open(arquivo, "w", encoding="utf-8") as saida:
+            json.dump({str(tipo): valores for tipo, valores in self.coeficientes.items()}, saida, indent=1)
+
+    @classmethod
+    def carregar(cls, arquivo: str) -> "ModeloCusto":
+        """
+        Lê os coeficientes de um modelo gravado com `salvar`.
+
+        :param arquivo: Caminho do arquivo.
+        :return: Modelo com os coeficientes lidos.
+        """
+        with open(arquivo, encoding="utf-8") as entrada:
+            return cls(json.load(entrada))
+
+
+class RacingKnapsackSolver(AbstractKnapsackSolver):
+    """
+    Classe que soluciona o Problema da Mochila Binária (0-1 Knapsack Problem) executando vários *solvers* ao mesmo
+    tempo, cada um em um processo auxiliar, sobre a instância publicada em memória compartilhada. A primeira solução
+    com otimalidade comprovada é retornada e os demais processos são encerrados.
+    """
+
+    def __str__(self):
+        return "Corrida de Solvers"
+
+    def solucionar(self, tipos=None, parametros: dict = None, timeout: float = None) -> SolucaoKnapsack:
+        """
+        Implementa o algoritmo que soluciona o Problema da Mochila Binária (0-1 Knapsack Problem).
+
+        :param tipos: Tipos de *solver* que participam da corrida. Padrão: Branch and Bound e Programação Dinâmica
+            Adaptativa.
+        :param parametros: Parâmetros do método `solucionar` de cada tipo de *solver* ({tipo: {parâmetro: valor}}).
+        :param timeout: Tempo máximo de espera, em segundos. Ao final, é retornada a melhor solução sem otimalidade
+            comprovada recebida, se houver. Se não informado, a espera não é limitada.
+        :return: Primeira solução ótima comprovada; se nenhum *solver* comprovar a otimalidade, a melhor solução
+            recebida. O *solver* vencedor fica registrado nas estatísticas.
+        :raises TimeoutError: Se nenhuma solução for recebida dentro do tempo máximo.
+        :raises RuntimeError: Se todos os *solvers* falharem.
+        """
+        tipos = list(tipos or (KnapsackSolverFactory.BRANCH_AND_BOUND_KNAPSACK_SOLVER,
+                               KnapsackSolverFactory.ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER))
+        parametros = parametros or {}
+        self.estatisticas.reiniciar()
+        prazo = None if timeout is None else time.perf_counter() + timeout
+        melhor, vencedor, erros = None, None, []
+
+        with InstanciaCompartilhada(self.instancia) as compartilhada, self.estatisticas.fase("busca"):
+            processos = {}
+            for tipo in tipos:
+                recepcao, envio = multiprocessing.Pipe(duplex=False)
+                processo = multiprocessing.Process(target=_executar_corrida,
+                                                   args=(compartilhada.descritor, self.valor_disponivel, tipo,
+                                                         parametros.get(tipo, {}), envio), daemon=True)
+                processo.start()
+                envio.close()
+                processos[recepcao] = (tipo, processo)
+
+            try:
+                while processos and vencedor is None:
+                    restante = None if prazo is None else prazo - time.perf_counter()
+                    if restante is not None and restante <= 0:
+                        break
+                    for recepcao in wait(list(processos), restante):
+                        tipo, _ = processos.pop(recepcao)
+                        try:
+                            mensagem = recepcao.recv()
+                        except EOFError:
+                            mensagem = ("falha", None)
+                        recepcao.close()
+                        if mensagem[0] != "concluido":
+                            erros.append("{}: {}".format(tipo, mensagem[1]))
+                            continue
+                        # A solução é materializada apenas ao fim da corrida: a comparação utiliza a importância e o
+                        # limitante superior enviados pelo processo.
+                        importancia, limitante = mensagem[1][4], mensagem[1][3]
+                        if melhor is None or importancia > melhor[1][4]:
+                            melhor = (tipo, mensagem[1])
+                        if limitante is not None and limitante - importancia <= 1e-9 * max(abs(importancia), 1.0):
+                            vencedor = tipo
+                            melhor = (tipo, mensagem[1])
+                            break
+            finally:
+                # Os solvers que não venceram a corrida são encerrados.
+                for recepcao, (_, processo) in processos.items():
+                    processo.terminate()
+                    processo.join()
+                    recepcao.close()
+
+        if melhor is None:
+            if erros:
+                raise RuntimeError("Todos os solvers falharam: " + "; ".join(erros))
+            raise TimeoutError("Nenhum solver concluiu em {} segundos.".format(timeout))
+
+        self.estatisticas.registrar("vencedor", vencedor)
+        self.estatisticas.registrar("melhor_solver", melhor[0])
+        self.estatisticas.registrar("solvers_encerrados", len(processos))
+        with self.estatisticas.fase("materializacao"):
+            solucao = SolucaoKnapsack(self.instancia, *melhor[1][:3])
+            solucao.limitante_superior = melhor[1][3]
+
+        return self.estatisticas.concluir(solucao)
+
+
+def _executar_corrida(descritor: tuple, valor_disponivel: float, tipo: int, parametros: dict, conexao):
+    """
+    Executa, em um processo auxiliar, um dos *solvers* da corrida e envia a solução pela conexão.
+    """
+    instancia, memoria = InstanciaCompartilhada.anexar(descritor)
+    try:
+        solucao = KnapsackSolverFactory.get_solver(tipo, valor_disponivel, instancia).solucionar(**parametros)
+        conexao.send(("concluido", (solucao.selecionados, solucao.item_fracionado, solucao.fracao,
+                                    solucao.limitante_superior, solucao.importancia)))
+    except Exception as erro:
+        conexao.send(("erro", repr(erro)))
+    finally:
+        del instancia
+        memoria.close()
+        conexao.close()
+
+
+def escolher_solver(valor_disponivel: float, itens: Union[pd.DataFrame, InstanciaKnapsack],
+                    modelo: ModeloCusto = None) -> AbstractKnapsackSolver:
+    """
+    Obtém o *solver* de menor custo estimado para os itens e o valor disponível.
+
+    :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
+    :param itens: Itens que serão avaliados para compor o orçamento.
+    :param modelo: Modelo de custo. Padrão: modelo com os COEFICIENTES_PADRAO.
+    :return: *Solver* escolhido.
+    """
+    instancia = itens if isinstance(itens, InstanciaKnapsack) else InstanciaKnapsack.de_dataframe(itens)
+    tipo = (modelo or ModeloCusto()).escolher(instancia, valor_disponivel)
+
+    return KnapsackSolverFactory.get_solver(tipo, valor_disponivel, instancia)
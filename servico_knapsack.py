@@ -0,0 +1,608 @@
+"""Serviço local e assíncrono de solução do Problema da Mochila Binária, com requisições JSON sobre HTTP."""
+
+import argparse
+import asyncio
+import collections
+import inspect
+import json
+import math
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+import pandas as pd
+
+from cache_knapsack import CacheSolucoes
+from carregador_knapsack import CarregadorProposicoes
+from instancia_knapsack import InstanciaKnapsack, SolucaoKnapsack
+from knapsack_utils import KnapsackSolverFactory
+from paralelismo_knapsack import InstanciaCompartilhada
+
+# Estado de cada processo auxiliar do serviço, preenchido uma única vez na inicialização do processo.
+_estado_processo = {}
+
+MARGEM_PRAZO = 0.1
+"""
+Tempo, em segundos, reservado do prazo de cada requisição para a comunicação com o processo auxiliar e a resposta. O
+restante do prazo é repassado como tempo limite (parâmetro `timeout`) aos *solvers* que o aceitam.
+"""
+JANELA_METRICAS = 60.0
+"""
+Janela, em segundos, da vazão recente informada nas métricas.
+"""
+EVENTOS = ("recebidas", "concluidas", "agrupadas", "rejeitadas", "prazos_excedidos", "erros")
+"""
+Eventos contados nas métricas do serviço.
+"""
+
+
+class ErroServico(Exception):
+    """
+    Exceção de uma requisição ao serviço, com o código de status HTTP da resposta.
+    """
+
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+        """
+        Código de status HTTP (400, 404, 405, 413, 422, 500, 503 ou 504).
+        """
+
+
+class MetricasServico:
+    """
+    Classe que acumula as métricas do serviço: requisições recebidas, concluídas, agrupadas a uma computação idêntica
+    em andamento, rejeitadas por fila cheia, com prazo excedido e com erro; percentis de latência das últimas
+    requisições concluídas; e vazão desde o início e na janela recente (JANELA_METRICAS).
+    """
+
+    def __init__(self, amostras: int = 1024):
+        """
+        Método construtor.
+
+        :param amostras: Quantidade de latências, das últimas requisições concluídas, utilizadas nos percentis.
+        """
+        self.inicio = time.monotonic()
+        self.contadores = collections.Counter()
+        self._latencias = collections.deque(maxlen=amostras)
+        self._conclusoes = collections.deque()
+
+    def registrar(self, evento: str):
+        """
+        Conta uma ocorrência do evento.
+
+        :param evento: Um dos EVENTOS.
+        """
+        self.contadores[evento] += 1
+
+    def concluir(self, latencia: float):
+        """
+        Registra uma requisição concluída.
+
+        :param latencia: Tempo, em segundos, entre o recebimento e a resposta da requisição.
+        """
+        agora = time.monotonic()
+        self.contadores["concluidas"] += 1
+        self._latencias.append(latencia)
+        self._conclusoes.append(agora)
+        self._descartar(agora)
+
+    def _descartar(self, agora: float):
+        while self._conclusoes and self._conclusoes[0] < agora - JANELA_METRICAS:
+            self._conclusoes.popleft()
+
+    def como_dict(self) -> dict:
+        """
+        Representa as métricas como dicionário.
+
+        :return: Dicionário com os contadores dos eventos, a vazão (requisições concluídas por segundo) desde o início
+            e na janela recente e as latências (mediana, percentis 95 e 99 e máxima), em segundos.
+        """
+        agora = time.monotonic()
+        self._descartar(agora)
+        decorrido = agora - self.inicio
+        metricas = {evento: self.contadores[evento] for evento in EVENTOS}
+        metricas["vazao"] = metricas["concluidas"] / decorrido if decorrido > 0 else 0.0
+        metricas["vazao_recente"] = len(self._conclusoes) / min(decorrido, JANELA_METRICAS) if decorrido > 0 else 0.0
+        if self._latencias:
+            p50, p95, p99 = np.percentile(self._latencias, [50, 95, 99])
+            metricas.update(latencia_p50=float(p50), latencia_p95=float(p95), latencia_p99=float(p99),
+                            latencia_maxima=float(max(self._latencias)))
+
+        return metricas
+
+
+class _Trabalho:
+    """
+    Computação despachada aos processos auxiliares, compartilhada pelas requisições idênticas simultâneas.
+    """
+
+    __slots__ = ("chave", "descricao", "prazo", "futuro")
+
+    def __init__(self, chave: str, descricao: tuple, prazo: float, futuro: asyncio.Future):
+        self.chave = chave
+        self.descricao = descricao
+        # Instante (relógio do laço de eventos) até o qual alguma requisição aguarda o resultado (None sem prazo).
+        self.prazo = prazo
+        self.futuro = futuro
+
+
+class ServicoKnapsack:
+    """
+    Classe que implementa um serviço local e assíncrono (asyncio) de solução do Problema da Mochila Binária. As
+    requisições são recebidas em JSON sobre HTTP, por TCP ou socket Unix, e a computação é despachada a um conjunto de
+    processos auxiliares.
+
+    - Conjuntos de dados nomeados (por exemplo, a planilha de proposições) são carregados uma única vez e publicados em
+      memória compartilhada. As requisições os referenciam pelo nome, sem enviar os itens.
+    - Requisições idênticas simultâneas (mesmos itens, orçamento, tipo de *solver* e parâmetros) são agrupadas em uma
+      única computação (*request coalescing*).
+    - As computações aguardam os processos em uma fila limitada. Com a fila cheia, as requisições são rejeitadas
+      imediatamente com status 503 (*backpressure*), em vez de acumularem memória e latência.
+    - O prazo de cada requisição limita a espera pela resposta (status 504 quando excedido) e o seu restante é
+      repassado como tempo limite aos *solvers* que o aceitam (Branch and Bound, Busca Tabu e corrida), que retornam
+      a melhor solução encontrada, certificada pelo limitante superior.
+    - As métricas de latência e vazão ficam disponíveis em GET /metricas.
+
+    Rotas: POST /solucionar (corpo descrito no método `solucionar`) e GET /metricas.
+    """
+
+    def __init__(self, conjuntos: dict = None, processos: int = None, tamanho_fila: int = 64,
+                 prazo_padrao: float = None, tamanho_maximo_corpo: int = 64 * 2 ** 20):
+        """
+        Método construtor. Os conjuntos de dados são compilados imediatamente.
+
+        :param conjuntos: Conjuntos de dados disponíveis às requisições, por nome. Cada conjunto pode ser uma
+            instância, um DataFrame com os itens, um `CarregadorProposicoes` ou o caminho de uma planilha de
+            proposições (carregada pelo `CarregadorProposicoes`, com cache).
+        :param processos: Quantidade de processos auxiliares. Padrão igual à quantidade de processadores.
+        :param tamanho_fila: Quantidade máxima de computações aguardando os processos.
+        :param prazo_padrao: Prazo, em segundos, das requisições que não informarem prazo. Se não informado, as
+            requisições não têm prazo.
+        :param tamanho_maximo_corpo: Tamanho máximo, em bytes, do corpo das requisições.
+        """
+        self.processos = processos or os.cpu_count() or 1
+        self.tamanho_fila = tamanho_fila
+        self.prazo_padrao = prazo_padrao
+        self.tamanho_maximo_corpo = tamanho_maximo_corpo
+        self.instancias = {nome: self._compilar(conjunto) for nome, conjunto in (conjuntos or {}).items()}
+        """
+        Instâncias dos conjuntos de dados, por nome.
+        """
+        self.metricas = MetricasServico()
+        """
+        Métricas do serviço.
+        """
+        self._em_andamento = {}
+        self._compartilhadas = {}
+        self._executor = None
+        self._fila = None
+        self._despachantes = []
+        self._servidor = None
+
+    @staticmethod
+    def _compilar(conjunto) -> InstanciaKnapsack:
+        if isinstance(conjunto, str):
+            conjunto = CarregadorProposicoes(conjunto)
+        if isinstance(conjunto, CarregadorProposicoes):
+            return conjunto.carregar_instancia()
+        if isinstance(conjunto, pd.DataFrame):
+            return InstanciaKnapsack.de_dataframe(conjunto)
+
+        return conjunto
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.encerrar()
+
+    async def iniciar(self, host: str = "127.0.0.1", porta: int = 8080, caminho_socket: str = None):
+        """
+        Publica os conjuntos de dados em memória compartilhada, cria os processos auxiliares e passa a aceitar
+        conexões.
+
+        :param host: Endereço em que o serviço aceita conexões TCP.
+        :param porta: Porta TCP (0 para uma porta livre, disponível em `servidor.sockets`).
+        :param caminho_socket: Caminho de um socket Unix. Se informado, é utilizado no lugar de TCP.
+        :return: Servidor do asyncio.
+        """
+        self._compartilhadas = {nome: InstanciaCompartilhada(instancia) for nome, instancia in self.instancias.items()}
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processos, initializer=_inicializar_processo_servico,
+            initargs=({nome: compartilhada.descritor for nome, compartilhada in self._compartilhadas.items()},))
+        # Os processos são criados antes de qualquer conexão: criados sob demanda por fork, herdariam os sockets abertos
+        # dos clientes e impediriam que o fechamento da conexão chegasse ao cliente.
+        laco = asyncio.get_running_loop()
+        await asyncio.gather(*[laco.run_in_executor(self._executor, os.getpid) for _ in range(self.processos)])
+        # O limite da fila é verificado em `solucionar`, junto com as computações já retiradas pelos despachantes.
+        self._fila = asyncio.Queue()
+        # Cada despachante mantém um processo ocupado; as demais computações aguardam na fila limitada.
+        self._despachantes = [asyncio.create_task(self._despachar()) for _ in range(self.processos)]
+        if caminho_socket is not None:
+            self._servidor = await asyncio.start_unix_server(self._atender, path=caminho_socket)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, porta)
+
+        return self._servidor
+
+    async def encerrar(self):
+        """
+        Deixa de aceitar conexões, rejeita as computações ainda na fila e libera os processos auxiliares e a memória
+        compartilhada.
+        """
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        for despachante in self._despachantes:
+            despachante.cancel()
+        await asyncio.gather(*self._despachantes, return_exceptions=True)
+        self._despachantes = []
+        for trabalho in list(self._em_andamento.values()):
+            if not trabalho.futuro.done():
+                trabalho.futuro.set_exception(ErroServico(503, "Serviço encerrado."))
+        if self._executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, lambda: self._executor.shutdown(
+                wait=True, cancel_futures=True))
+            self._executor = None
+        for compartilhada in self._compartilhadas.values():
+            compartilhada.fechar()
+        self._compartilhadas = {}
+
+    @staticmethod
+    def _tipo(tipo) -> int:
+        # O tipo de solver pode ser informado pelo valor ou pelo nome da constante da factory.
+        tipos = KnapsackSolverFactory.solvers_registrados()
+        if isinstance(tipo, str) and tipo.upper() in tipos:
+            return tipos[tipo.upper()]
+        if isinstance(tipo, int) and tipo in tipos.values():
+            return tipo
+        raise ValueError("tipo de solver desconhecido: {!r}".format(tipo))
+
+    def _interpretar(self, requisicao: dict) -> tuple:
+        """
+        Valida a requisição e obtém a instância, a descrição da computação enviada aos processos, a chave que
+        identifica as requisições idênticas e o prazo da requisição.
+
+        :raises ErroServico: Se a requisição for inválida (400) ou o conjunto de dados não existir (404).
+        """
+        if not isinstance(requisicao, dict):
+            raise ErroServico(400, "A requisição deve ser um objeto JSON.")
+        try:
+            valor_disponivel = float(requisicao["valor_disponivel"])
+            # O json aceita NaN e Infinity, e float aceita as cadeias "nan" e "inf": valores não finitos tornariam
+            # todos os itens viáveis (comparações com NaN são falsas) ou o problema ilimitado.
+            if not math.isfinite(valor_disponivel):
+                raise ValueError("valor_disponivel deve ser finito")
+            tipo = self._tipo(requisicao.get("tipo", KnapsackSolverFactory.AUTO_KNAPSACK_SOLVER))
+            parametros = dict(requisicao.get("parametros") or {})
+            prazo = requisicao.get("prazo", self.prazo_padrao)
+            prazo = None if prazo is None else float(prazo)
+            if prazo is not None and not math.isfinite(prazo):
+                raise ValueError("prazo deve ser finito")
+            conjunto = requisicao.get("conjunto")
+            if conjunto is None:
+                itens = requisicao["itens"]
+                instancia = InstanciaKnapsack(np.asarray(itens["importancia"], dtype=np.float64),
+                                              np.asarray(itens["valor"], dtype=np.float64))
+                if not (np.isfinite(instancia.importancia).all() and np.isfinite(instancia.valor).all()):
+                    raise ValueError("importância e valor dos itens devem ser finitos")
+        except (KeyError, TypeError, ValueError) as erro:
+            raise ErroServico(400, "Requisição inválida: {}.".format(erro))
+
+        if conjunto is not None:
+            if conjunto not in self.instancias:
+                raise ErroServico(404, "Conjunto de dados desconhecido: {!r}.".format(conjunto))
+            # Os conjuntos de dados não mudam durante a execução do serviço: o nome os identifica.
+            chave = json.dumps(["conjunto", conjunto, valor_disponivel, tipo, parametros], sort_keys=True,
+                               default=repr)
+            return self.instancias[conjunto], (conjunto, None, None, valor_disponivel, tipo, parametros), chave, prazo
+
+        chave = CacheSolucoes.chave(instancia, valor_disponivel, tipo, parametros)
+        descricao = (None, instancia.importancia, instancia.valor, valor_disponivel, tipo, parametros)
+        return instancia, descricao, chave, prazo
+
+    async def solucionar(self, requisicao: dict) -> dict:
+        """
+        Soluciona uma requisição. Também pode ser utilizado diretamente, sem HTTP, por aplicações asyncio.
+
+        :param requisicao: Dicionário com:
+
+            - "itens": itens do problema ({"importancia": [...], "valor": [...]}) ou "conjunto": nome de um conjunto
+              de dados do serviço;
+            - "valor_disponivel": valor do orçamento disponível;
+            - "tipo": tipo de *solver* (valor ou nome da constante da `KnapsackSolverFactory`). Padrão:
+              AUTO_KNAPSACK_SOLVER;
+            - "parametros": parâmetros do método `solucionar` do *solver* (opcional);
+            - "prazo": prazo da requisição, em segundos (opcional).
+        :return: Dicionário com a importância e o valor da solução, os índices originais dos itens selecionados, o
+            item fracionado e sua fração (algoritmo guloso fracionário), o limitante superior e os gaps, as
+            estatísticas do *solver*, a latência e se a requisição foi agrupada a uma computação em andamento.
+        :raises ErroServico: Se a requisição for inválida ou o *solver* falhar (400 ou 500), se a fila estiver cheia
+            (503) ou se o prazo for excedido (504).
+        """
+        laco = asyncio.get_running_loop()
+        inicio = laco.time()
+        self.metricas.registrar("recebidas")
+        try:
+            instancia, descricao, chave, prazo = self._interpretar(requisicao)
+            limite = None if prazo is None else inicio + float(prazo)
+
+            trabalho = self._em_andamento.get(chave)
+            agrupada = trabalho is not None
+            if agrupada:
+                self.metricas.registrar("agrupadas")
+                # A computação compartilhada dispõe do maior prazo entre as requisições agrupadas.
+                trabalho.prazo = None if limite is None or trabalho.prazo is None else max(trabalho.prazo, limite)
+            else:
+                # As computações em andamento (em execução ou na fila) ocupam os processos e, depois deles, as
+                # posições da fila: com processos ociosos, uma rajada de requisições não é rejeitada antes que os
+                # despachantes retirem as computações da fila.
+                if len(self._em_andamento) >= self.processos + self.tamanho_fila:
+                    raise ErroServico(503, "Fila de computações cheia; tente novamente mais tarde.")
+                trabalho = _Trabalho(chave, descricao, limite, laco.create_future())
+                self._fila.put_nowait(trabalho)
+                self._em_andamento[chave] = trabalho
+                trabalho.futuro.add_done_callback(lambda _, trabalho=trabalho: self._descartar(trabalho))
+
+            try:
+                espera = None if limite is None else max(limite - laco.time(), 0.0)
+                resultado = await asyncio.wait_for(asyncio.shield(trabalho.futuro), espera)
+            except asyncio.TimeoutError:
+                raise ErroServico(504, "Prazo da requisição excedido.")
+        except ErroServico as erro:
+            self.metricas.registrar({503: "rejeitadas", 504: "prazos_excedidos"}.get(erro.status, "erros"))
+            raise
+
+        selecionados, item_fracionado, fracao, limitante_superior, estatisticas = resultado
+        solucao = SolucaoKnapsack(instancia, selecionados, item_fracionado, fracao)
+        solucao.limitante_superior = limitante_superior
+        latencia = laco.time() - inicio
+        self.metricas.concluir(latencia)
+
+        return {"importancia": solucao.importancia, "valor": solucao.valor,
+                "selecionados": solucao.indices.tolist(),
+                "item_fracionado": None if item_fracionado < 0 else instancia.posicoes_originais[item_fracionado],
+                "fracao": fracao, "limitante_superior": solucao.limitante_superior, "gap": solucao.gap,
+                "gap_relativo": solucao.gap_relativo, "estatisticas": estatisticas, "agrupada": agrupada,
+                "latencia": latencia}
+
+    def _descartar(self, trabalho: _Trabalho):
+        if self._em_andamento.get(trabalho.chave) is trabalho:
+            del self._em_andamento[trabalho.chave]
+        # O erro é consultado para que não seja reportado como não tratado quando nenhuma requisição aguarda mais o
+        # resultado (todas excederam o prazo).
+        if not trabalho.futuro.cancelled():
+            trabalho.futuro.exception()
+
+    async def _despachar(self):
+        """
+        Retira as computações da fila e as executa nos processos auxiliares, uma de cada vez.
+        """
+        laco = asyncio.get_running_loop()
+        while True:
+            trabalho = await self._fila.get()
+            try:
+                tempo_limite = None
+                if trabalho.prazo is not None:
+                    tempo_limite = trabalho.prazo - laco.time() - MARGEM_PRAZO
+                    if tempo_limite <= 0:
+                        raise ErroServico(504, "Prazo da requisição excedido na fila.")
+                resultado = await laco.run_in_executor(self._executor, _executar_requisicao, trabalho.descricao,
+                                                       tempo_limite)
+            except ErroServico as erro:
+                self._falhar(trabalho, erro)
+            except (AssertionError, KeyError, TypeError, ValueError) as erro:
+                self._falhar(trabalho, ErroServico(400, "Parâmetros inválidos: {}.".format(erro)))
+            except TimeoutError as erro:
+                self._falhar(trabalho, ErroServico(504, str(erro)))
+            except asyncio.CancelledError:
+                self._falhar(trabalho, ErroServico(503, "Serviço encerrado."))
+                raise
+            except Exception as erro:
+                self._falhar(trabalho, ErroServico(500, "{}: {}".format(type(erro).__name__, erro)))
+            else:
+                if not trabalho.futuro.done():
+                    trabalho.futuro.set_result(resultado)
+            finally:
+                self._fila.task_done()
+
+    @staticmethod
+    def _falhar(trabalho: _Trabalho, erro: ErroServico):
+        if not trabalho.futuro.done():
+            trabalho.futuro.set_exception(erro)
+
+    def resumo_metricas(self) -> dict:
+        """
+        Obtém as métricas do serviço com o estado corrente da fila.
+
+        :return: Métricas (veja `MetricasServico.como_dict`), tamanho da fila, computações em andamento e quantidade
+            de processos.
+        """
+        return {**self.metricas.como_dict(), "fila": self._fila.qsize() if self._fila is not None else 0,
+                "em_andamento": len(self._em_andamento), "processos": self.processos}
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """
+        Atende uma conexão HTTP/1.1, com várias requisições enquanto a conexão for mantida (*keep-alive*).
+        """
+        try:
+            while True:
+                manter = False
+                try:
+                    requisicao = await self._ler(leitor)
+                    if requisicao is None:
+                        break
+                    metodo, caminho, versao, cabecalhos, corpo = requisicao
+                    manter = (cabecalhos.get("connection", "").lower() != "close" if versao == "HTTP/1.1"
+                              else cabecalhos.get("connection", "").lower() == "keep-alive")
+                    status, resposta = 200, await self._rotear(metodo, caminho, corpo)
+                except ErroServico as erro:
+                    status, resposta = erro.status, {"erro": str(erro)}
+                    # Após um erro de leitura, o restante da conexão não pode ser interpretado.
+                    manter = manter and erro.status not in (400, 413)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as erro:
+                    status, resposta = 500, {"erro": "{}: {}".format(type(erro).__name__, erro)}
+                self._responder(escritor, status, resposta, manter)
+                await escritor.drain()
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _ler(self, leitor: asyncio.StreamReader):
+        """
+        Lê uma requisição HTTP.
+
+        :return: Método, caminho, versão, cabeçalhos (nomes em minúsculas) e corpo, ou None ao fim da conexão.
+        :raises ErroServico: Se a requisição for malformada (400) ou o corpo exceder o tamanho máximo (413).
+        """
+        linha = await leitor.readline()
+        if not linha:
+            return None
+        try:
+            metodo, caminho, versao = linha.decode("latin-1").split()
+        except ValueError:
+            raise ErroServico(400, "Linha de requisição HTTP inválida.")
+
+        cabecalhos = {}
+        while True:
+            linha = await leitor.readline()
+            if linha in (b"\r\n", b"\n", b""):
+                break
+            nome, _, valor = linha.decode("latin-1").partition(":")
+            cabecalhos[nome.strip().lower()] = valor.strip()
+        try:
+            tamanho = int(cabecalhos.get("content-length", 0))
+        except ValueError:
+            raise ErroServico(400, "Cabeçalho Content-Length inválido.")
+        if tamanho > self.tamanho_maximo_corpo:
+            raise ErroServico(413, "O corpo da requisição excede {} bytes.".format(self.tamanho_maximo_corpo))
+
+        return metodo.upper(), caminho.split("?", 1)[0], versao.upper(), cabecalhos, await leitor.readexactly(tamanho)
+
+    async def _rotear(self, metodo: str, caminho: str, corpo: bytes) -> dict:
+        rotas = {"/solucionar": "POST", "/metricas": "GET"}
+        if caminho not in rotas:
+            raise ErroServico(404, "Rota desconhecida: {}.".format(caminho))
+        if metodo != rotas[caminho]:
+            raise ErroServico(405, "Método {} não permitido em {}.".format(metodo, caminho))
+        if caminho == "/metricas":
+            return self.resumo_metricas()
+
+        try:
+            requisicao = json.loads(corpo)
+        except ValueError as erro:
+            # A conexão continua utilizável: o corpo foi lido por completo.
+            raise ErroServico(422, "JSON inválido: {}.".format(erro))
+
+        return await self.solucionar(requisicao)
+
+    @staticmethod
+    def _responder(escritor: asyncio.StreamWriter, status: int, resposta: dict, manter: bool):
+        corpo = json.dumps(_serializavel(resposta), ensure_ascii=False).encode("utf-8")
+        cabecalhos = ["HTTP/1.1 {} {}".format(status, HTTPStatus(status).phrase),
+                      "Content-Type: application/json; charset=utf-8",
+                      "Content-Length: {}".format(len(corpo)),
+                      "Connection: {}".format("keep-alive" if manter else "close")]
+        if status == 503:
+            cabecalhos.append("Retry-After: 1")
+        escritor.write(("\r\n".join(cabecalhos) + "\r\n\r\n").encode("latin-1") + corpo)
+
+
+def _serializavel(objeto):
+    # Converte os tipos do NumPy em tipos nativos e os números não finitos (sem representação em JSON) em null.
+    if isinstance(objeto, dict):
+        return {str(chave): _serializavel(valor) for chave, valor in objeto.items()}
+    if isinstance(objeto, (list, tuple, np.ndarray)):
+        return [_serializavel(valor) for valor in objeto]
+    if isinstance(objeto, np.generic):
+        objeto = objeto.item()
+    if isinstance(objeto, float) and not math.isfinite(objeto):
+        return None
+
+    return objeto
+
+
+def _inicializar_processo_servico(descritores: dict):
+    """
+    Inicializa um processo auxiliar do serviço, anexando os conjuntos de dados publicados em memória compartilhada.
+    """
+    _estado_processo["conjuntos"] = {}
+    _estado_processo["memorias"] = []
+    for nome, descritor in descritores.items():
+        instancia, memoria = InstanciaCompartilhada.anexar(descritor)
+        _estado_processo["conjuntos"][nome] = instancia
+        _estado_processo["memorias"].append(memoria)
+
+
+def _executar_requisicao(descricao: tuple, tempo_limite: float) -> tuple:
+    """
+    Executa, em um processo auxiliar, o *solver* de uma requisição. O tempo limite é repassado aos *solvers* cujo método
+    `solucionar` aceita o parâmetro `timeout`, sem ampliar um tempo limite menor informado na requisição.
+
+    :return: Itens selecionados, item fracionado, fração, limitante superior e estatísticas do *solver*.
+    """
+    conjunto, importancia, valor, valor_disponivel, tipo, parametros = descricao
+    if conjunto is not None:
+        instancia = _estado_processo["conjuntos"][conjunto]
+    else:
+        instancia = InstanciaKnapsack(importancia, valor)
+    knapsack_solver = KnapsackSolverFactory.get_solver(tipo, valor_disponivel, instancia)
+    if tempo_limite is not None and "timeout" in inspect.signature(knapsack_solver.solucionar).parameters:
+        parametros = {**parametros, "timeout": min(parametros.get("timeout") or tempo_limite, tempo_limite)}
+    solucao = knapsack_solver.solucionar(**parametros)
+
+    return (solucao.selecionados, solucao.item_fracionado, solucao.fracao, solucao.limitante_superior,
+            knapsack_solver.estatisticas.como_dict())
+
+
+async def servir(conjuntos: dict = None, host: str = "127.0.0.1", porta: int = 8080, caminho_socket: str = None,
+                 **opcoes):
+    """
+    Executa o serviço até ser interrompido (SIGINT ou SIGTERM), liberando ao final a memória compartilhada.
+
+    :param conjuntos: Conjuntos de dados disponíveis às requisições, por nome.
+    :param host: Endereço em que o serviço aceita conexões TCP.
+    :param porta: Porta TCP.
+    :param caminho_socket: Caminho de um socket Unix. Se informado, é utilizado no lugar de TCP.
+    :param opcoes: Demais parâmetros do construtor de `ServicoKnapsack`.
+    """
+    async with ServicoKnapsack(conjuntos, **opcoes) as servico:
+        await servico.iniciar(host, porta, caminho_socket)
+        interrupcao = asyncio.Event()
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                asyncio.get_running_loop().add_signal_handler(sinal, interrupcao.set)
+            except NotImplementedError:
+                # Sem suporte a sinais no laço de eventos (Windows), o encerramento ocorre por KeyboardInterrupt.
+                pass
+        await interrupcao.wait()
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Serviço de solução do Problema da Mochila Binária.")
+    argumentos.add_argument("--host", default="127.0.0.1")
+    argumentos.add_argument("--porta", type=int, default=8080)
+    argumentos.add_argument("--socket", default=None, help="Caminho de um socket Unix, utilizado no lugar de TCP.")
+    argumentos.add_argument("--processos", type=int, default=None)
+    argumentos.add_argument("--fila", type=int, default=64, help="Quantidade máxima de computações na fila.")
+    argumentos.add_argument("--prazo", type=float, default=None, help="Prazo padrão das requisições, em segundos.")
+    argumentos.add_argument("--conjunto", action="append", default=[], metavar="NOME=PLANILHA",
+                            help="Planilha de proposições disponível às requisições pelo nome.")
+    opcoes = argumentos.parse_args()
+
+    try:
+        asyncio.run(servir(dict(conjunto.split("=", 1) for conjunto in opcoes.conjunto), opcoes.host, opcoes.porta,
+                           opcoes.socket, processos=opcoes.processos, tamanho_fila=opcoes.fila,
+                           prazo_padrao=opcoes.prazo))
+    except KeyboardInterrupt:
+        pass
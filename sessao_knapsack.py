@@ -0,0 +1,196 @@
+"""Sessão de edição incremental dos itens orçamentários, com nova solução aproveitando as execuções anteriores."""
+
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from instancia_knapsack import InstanciaKnapsack, SolucaoKnapsack
+from knapsack_utils import KnapsackSolverFactory
+
+
+class SessaoKnapsack:
+    """
+    Classe que mantém os itens orçamentários e o valor disponível de uma sessão de análise ("e se?"), em que poucos
+    itens são incluídos, retirados ou alterados entre uma solução e outra.
+
+    Cada nova solução aproveita o trabalho das anteriores:
+
+    - Programação Dinâmica Adaptativa: a tabela é retomada a partir do primeiro item alterado;
+    - Branch and Bound: a última solução, ajustada aos itens e ao orçamento atuais, é o limitante primal inicial;
+    - Busca Tabu: a última solução, ajustada da mesma forma, é a solução inicial da busca.
+
+    Se nada foi alterado desde a última solução de um mesmo *solver* (com os mesmos parâmetros), ela é retornada
+    sem nova execução.
+    """
+
+    def __init__(self, valor_disponivel: float, itens: Union[pd.DataFrame, InstanciaKnapsack]):
+        """
+        Método construtor.
+
+        :param valor_disponivel: Valor do orçamento disponível para distribuição (capacidade da mochila).
+        :param itens: Itens iniciais da sessão. Deve conter as colunas "importancia" e "valor". O DataFrame é copiado
+            e as alterações da sessão não o modificam.
+        """
+        if isinstance(itens, InstanciaKnapsack):
+            if itens.itens is not None:
+                itens = itens.itens
+            else:
+                itens = pd.DataFrame({"importancia": itens.importancia, "valor": itens.valor,
+                                      "importancia_por_valor": itens.importancia_por_valor})
+        self.valor_disponivel = valor_disponivel
+        """
+        Valor do orçamento disponível para distribuição (capacidade da mochila).
+        """
+        self.itens = itens.copy()
+        """
+        Itens orçamentários atuais da sessão.
+        """
+        self._versao = 0
+        self._primeira_alteracao = 0
+        self._estado_programacao_dinamica = None
+        self._ultima_selecao = None
+        self._ultimas_solucoes = {}
+
+    def _registrar_alteracao(self, linha: int):
+        self._versao += 1
+        self._primeira_alteracao = min(self._primeira_alteracao, linha)
+
+    def _atualizar_razao(self, chave):
+        if "importancia_por_valor" in self.itens.columns:
+            self.itens.loc[chave, "importancia_por_valor"] = \
+                self.itens.loc[chave, "importancia"] / self.itens.loc[chave, "valor"]
+
+    def adicionar(self, importancia: float, valor: float, chave=None, **colunas):
+        """
+        Inclui um item na sessão.
+
+        :param importancia: Importância do item.
+        :param valor: Valor do item.
+        :param chave: Índice do item no DataFrame. Se não informado, é utilizado o maior índice inteiro mais um.
+        :param colunas: Demais colunas do item (por exemplo, acao).
+        :return: Índice do item incluído.
+        :raises KeyError: Se já existir um item com o índice informado.
+        """
+        if chave is None:
+            chave = int(self.itens.index.max()) + 1 if len(self.itens) else 0
+        elif chave in self.itens.index:
+            raise KeyError("Já existe um item com o índice {}.".format(chave))
+
+        linha = dict(colunas, importancia=importancia, valor=valor)
+        if "proporcao" in self.itens.columns:
+            linha.setdefault("proporcao", 0)
+        self.itens.loc[chave] = pd.Series(linha)
+        self._atualizar_razao(chave)
+        self._registrar_alteracao(len(self.itens) - 1)
+
+        return chave
+
+    def remover(self, chave):
+        """
+        Retira um item da sessão.
+
+        :param chave: Índice do item no DataFrame.
+        :raises KeyError: Se não existir um item com o índice informado.
+        """
+        linha = self.itens.index.get_loc(chave)
+        self.itens = self.itens.drop(index=chave)
+        self._registrar_alteracao(linha)
+
+    def atualizar(self, chave, importancia: float = None, valor: float = None):
+        """
+        Altera a importância e/ou o valor de um item da sessão.
+
+        :param chave: Índice do item no DataFrame.
+        :param importancia: Nova importância do item. Se não informada, é mantida.
+        :param valor: Novo valor do item. Se não informado, é mantido.
+        :raises KeyError: Se não existir um item com o índice informado.
+        """
+        linha = self.itens.index.get_loc(chave)
+        if importancia is not None:
+            self.itens.loc[chave, "importancia"] = importancia
+        if valor is not None:
+            self.itens.loc[chave, "valor"] = valor
+        self._atualizar_razao(chave)
+        self._registrar_alteracao(linha)
+
+    def definir_orcamento(self, valor_disponivel: float):
+        """
+        Altera o valor do orçamento disponível para distribuição.
+
+        :param valor_disponivel: Novo valor disponível.
+        """
+        self.valor_disponivel = valor_disponivel
+
+    def _solucao_aquecida(self, instancia: InstanciaKnapsack) -> np.ndarray:
+        """
+        Ajusta a última solução da sessão aos itens e ao orçamento atuais: itens retirados deixam a solução, os itens
+        de menor razão importância/valor são retirados até que a solução caiba no orçamento e, por fim, os itens que
+        ainda couberem são incluídos em ordem decrescente da razão.
+
+        :return: Vetor de bytes com 1 nos itens selecionados e 0 nos demais.
+        """
+        indices = self.itens.index[instancia.posicoes_originais]
+        selecionados = indices.isin(self._ultima_selecao)[instancia.ordem]
+        valores = instancia.valor[instancia.ordem]
+
+        # Mantém o maior prefixo (na ordem da razão) dos itens selecionados que cabe no orçamento.
+        acumulado = np.cumsum(np.where(selecionados, valores, 0.0))
+        selecionados &= acumulado <= self.valor_disponivel
+        restante = self.valor_disponivel - valores[selecionados].sum()
+        for posicao in np.flatnonzero(~selecionados):
+            if valores[posicao] <= restante:
+                selecionados[posicao] = True
+                restante -= valores[posicao]
+
+        solucao = np.zeros(len(instancia), dtype=np.uint8)
+        solucao[instancia.ordem[selecionados]] = 1
+
+        return solucao
+
+    def solucionar(self, tipo: int = KnapsackSolverFactory.ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER,
+                   **kwargs) -> SolucaoKnapsack:
+        """
+        Soluciona o problema com os itens e o orçamento atuais, aproveitando as execuções anteriores da sessão.
+
+        :param tipo: Tipo de *solver* (constantes de `KnapsackSolverFactory`). Padrão: Programação Dinâmica
+            Adaptativa.
+        :param kwargs: Parâmetros repassados ao método `solucionar` do *solver* (ou `solucionar_incremental`, no caso
+            da Programação Dinâmica Adaptativa).
+        :return: Solução contendo os itens selecionados para compor o orçamento.
+        """
+        chave = (self._versao, self.valor_disponivel, repr(sorted(kwargs.items())))
+        anterior = self._ultimas_solucoes.get(tipo)
+        if anterior is not None and anterior[0] == chave:
+            return anterior[1]
+
+        # A instância recebe uma cópia dos itens: as alterações seguintes da sessão (feitas no próprio DataFrame) não
+        # podem modificar as soluções já retornadas.
+        instancia = InstanciaKnapsack.de_dataframe(self.itens.copy())
+        aquecida = None
+        if self._ultima_selecao is not None:
+            aquecida = self._solucao_aquecida(instancia)
+            instancia = InstanciaKnapsack(instancia.importancia, instancia.valor, instancia.itens,
+                                          instancia.posicoes_originais, aquecida)
+        knapsack_solver = KnapsackSolverFactory.get_solver(tipo, self.valor_disponivel, instancia)
+
+        if tipo == KnapsackSolverFactory.ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER:
+            # A posição da alteração no DataFrame é convertida para a posição na instância (sem as linhas inválidas).
+            primeiro_alterado = int(np.searchsorted(instancia.posicoes_originais, self._primeira_alteracao))
+            solucao, self._estado_programacao_dinamica = knapsack_solver.solucionar_incremental(
+                self._estado_programacao_dinamica, primeiro_alterado, **kwargs)
+            self._primeira_alteracao = len(self.itens)
+        elif tipo == KnapsackSolverFactory.BRANCH_AND_BOUND_KNAPSACK_SOLVER and aquecida is not None:
+            solucao = knapsack_solver.solucionar(solucao_inicial=SolucaoKnapsack(instancia, np.flatnonzero(aquecida)),
+                                                 **kwargs)
+        elif tipo == KnapsackSolverFactory.TABU_SEARCH_KNAPSACK_SOLVER and aquecida is not None:
+            # A solução aquecida é repassada na proporção da instância, que é a solução inicial da Busca Tabu quando
+            # a solução gulosa não é utilizada.
+            solucao = knapsack_solver.solucionar(**dict(kwargs, utilizar_solucao_algoritmo_guloso=False))
+        else:
+            solucao = knapsack_solver.solucionar(**kwargs)
+
+        self._ultima_selecao = solucao.indices
+        self._ultimas_solucoes[tipo] = (chave, solucao)
+
+        return solucao
@@ -0,0 +1,249 @@
+"""
+Testes dos solvers do Problema da Mochila Binária. Os solvers exatos são comparados com a Programação Dinâmica do
+OR-Tools em instâncias pequenas e aleatórias, com importâncias e valores inteiros (o OR-Tools arredonda as
+importâncias e considera os valores em centavos).
+
+Execução: python -m pytest -q
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from algoritmos_aproximados import TabuSearchKnapsackSolver
+from algoritmos_exatos import AdaptiveDynamicProgrammingKnapsackSolver, BranchAndBoundKnapsackSolver
+from fluxo_knapsack import BYTES_POR_CANDIDATO, solucionar_fluxo
+from instancia_knapsack import InstanciaKnapsack
+from knapsack_utils import KnapsackSolverFactory
+from servico_knapsack import ErroServico, ServicoKnapsack
+from sessao_knapsack import SessaoKnapsack
+
+ADP = AdaptiveDynamicProgrammingKnapsackSolver
+
+
+def _gerar_instancias(quantidade: int = 24, semente: int = 0) -> list:
+    """
+    Gera instâncias pequenas das famílias não correlacionada e fortemente correlacionada, com capacidades entre
+    zero e a soma dos valores (inclusive), e os casos de um único item e de itens sem importância.
+
+    :return: Lista de tuplas (importância, valor, valor disponível).
+    """
+    gerador = np.random.default_rng(semente)
+    instancias = [(np.array([5.0]), np.array([3.0]), 3.0), (np.array([5.0]), np.array([3.0]), 2.0),
+                  (np.zeros(4), np.array([1.0, 2.0, 3.0, 4.0]), 5.0)]
+    for indice in range(quantidade):
+        n = int(gerador.integers(2, 40))
+        valor = gerador.integers(1, 100, n).astype(np.float64)
+        if indice % 2:
+            importancia = valor + 10
+        else:
+            importancia = gerador.integers(0, 100, n).astype(np.float64)
+        instancias.append((importancia, valor, float(gerador.integers(0, valor.sum() + 2))))
+
+    return instancias
+
+
+INSTANCIAS = _gerar_instancias()
+
+
+def _otimo(importancia: np.ndarray, valor: np.ndarray, valor_disponivel: float) -> float:
+    """
+    Importância ótima calculada pela Programação Dinâmica do OR-Tools.
+    """
+    solver = KnapsackSolverFactory.get_solver(KnapsackSolverFactory.DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER,
+                                              valor_disponivel, InstanciaKnapsack(importancia, valor))
+    return solver.solucionar().importancia
+
+
+def _verificar_otima(solucao, importancia: np.ndarray, valor: np.ndarray, valor_disponivel: float):
+    """
+    Verifica que a solução é viável, ótima e certificada com gap zero.
+    """
+    selecionados = np.asarray(solucao.selecionados, dtype=np.intp)
+    assert len(set(selecionados.tolist())) == len(selecionados)
+    assert valor[selecionados].sum() <= valor_disponivel + 1e-9
+    assert solucao.importancia == pytest.approx(importancia[selecionados].sum())
+    assert solucao.importancia == pytest.approx(_otimo(importancia, valor, valor_disponivel))
+    assert solucao.limitante_superior == pytest.approx(solucao.importancia)
+    assert solucao.gap == pytest.approx(0)
+
+
+SOLVERS_EXATOS = {
+    "branch_and_bound": lambda v, i: BranchAndBoundKnapsackSolver(v, i).solucionar(),
+    "branch_and_bound_sem_presolve": lambda v, i: BranchAndBoundKnapsackSolver(v, i).solucionar(presolve=False),
+    "branch_and_bound_mergulho": lambda v, i: BranchAndBoundKnapsackSolver(v, i).solucionar(limite_nos=4),
+    "branch_and_bound_iterativo": lambda v, i: list(BranchAndBoundKnapsackSolver(v, i).solucionar_iterativo())[-1],
+    "adp_valor_tabela": lambda v, i: ADP(v, i).solucionar(ADP.DIMENSAO_VALOR, modo=ADP.MODO_TABELA),
+    "adp_valor_divisao": lambda v, i: ADP(v, i).solucionar(ADP.DIMENSAO_VALOR, modo=ADP.MODO_DIVISAO),
+    "adp_importancia_tabela": lambda v, i: ADP(v, i).solucionar(ADP.DIMENSAO_IMPORTANCIA, modo=ADP.MODO_TABELA),
+    "adp_importancia_divisao": lambda v, i: ADP(v, i).solucionar(ADP.DIMENSAO_IMPORTANCIA, modo=ADP.MODO_DIVISAO),
+    "adp_incremental": lambda v, i: ADP(v, i).solucionar_incremental()[0],
+    "auto": lambda v, i: KnapsackSolverFactory.get_solver(KnapsackSolverFactory.AUTO_KNAPSACK_SOLVER, v,
+                                                          i).solucionar(),
+}
+
+
+@pytest.mark.parametrize("nome", SOLVERS_EXATOS)
+@pytest.mark.parametrize("importancia, valor, valor_disponivel", INSTANCIAS)
+def test_solver_exato_coincide_com_programacao_dinamica(nome, importancia, valor, valor_disponivel):
+    solucao = SOLVERS_EXATOS[nome](valor_disponivel, InstanciaKnapsack(importancia, valor))
+    _verificar_otima(solucao, importancia, valor, valor_disponivel)
+
+
+@pytest.mark.parametrize("importancia, valor, valor_disponivel", INSTANCIAS[:8])
+def test_branch_and_bound_paralelo_coincide_com_programacao_dinamica(importancia, valor, valor_disponivel):
+    solucao = BranchAndBoundKnapsackSolver(valor_disponivel, InstanciaKnapsack(importancia, valor)).solucionar_paralelo(
+        processos=2)
+    _verificar_otima(solucao, importancia, valor, valor_disponivel)
+
+
+@pytest.mark.parametrize("importancia, valor, valor_disponivel", INSTANCIAS[3:6])
+def test_corrida_coincide_com_programacao_dinamica(importancia, valor, valor_disponivel):
+    solver = KnapsackSolverFactory.get_solver(KnapsackSolverFactory.RACING_KNAPSACK_SOLVER, valor_disponivel,
+                                              InstanciaKnapsack(importancia, valor))
+    _verificar_otima(solver.solucionar(timeout=30), importancia, valor, valor_disponivel)
+
+
+def _instancia_dificil(n: int = 60, semente: int = 2) -> tuple:
+    """
+    Instância fortemente correlacionada, em que o Branch and Bound não comprova a otimalidade rapidamente (mais de
+    10⁵ nós expandidos) e a solução gulosa não atende às tolerâncias testadas.
+    """
+    valor = np.random.default_rng(semente).integers(1, 101, n).astype(np.float64)
+    return valor + 10, valor, float(valor.sum() // 2)
+
+
+@pytest.mark.parametrize("criterio", [{"limite_expansoes": 2000}, {"tolerancia_gap_absoluta": 50},
+                                      {"tolerancia_gap": 0.025}])
+@pytest.mark.parametrize("paralelo", [False, True])
+def test_certificado_da_busca_interrompida(criterio, paralelo):
+    importancia, valor, valor_disponivel = _instancia_dificil()
+    solver = BranchAndBoundKnapsackSolver(valor_disponivel, InstanciaKnapsack(importancia, valor))
+    solucao = solver.solucionar_paralelo(processos=2, **criterio) if paralelo else solver.solucionar(**criterio)
+    otimo = _otimo(importancia, valor, valor_disponivel)
+
+    assert solver.estatisticas.contadores["motivo_parada"] in ("limite_expansoes", "gap")
+    assert valor[solucao.selecionados].sum() <= valor_disponivel
+    assert solucao.importancia <= otimo + 1e-9
+    assert solucao.limitante_superior >= otimo - 1e-9
+    if "tolerancia_gap_absoluta" in criterio:
+        assert solucao.gap <= criterio["tolerancia_gap_absoluta"]
+    if "tolerancia_gap" in criterio:
+        assert solucao.gap <= criterio["tolerancia_gap"] * solucao.importancia
+
+
+@pytest.mark.parametrize("tipo", [KnapsackSolverFactory.GREEDY_KNAPSACK_SOLVER,
+                                  KnapsackSolverFactory.FPTAS_KNAPSACK_SOLVER])
+@pytest.mark.parametrize("importancia, valor, valor_disponivel", INSTANCIAS[:8])
+def test_certificado_dos_solvers_aproximados(tipo, importancia, valor, valor_disponivel):
+    solucao = KnapsackSolverFactory.get_solver(tipo, valor_disponivel,
+                                               InstanciaKnapsack(importancia, valor)).solucionar()
+    otimo = _otimo(importancia, valor, valor_disponivel)
+
+    assert valor[solucao.selecionados].sum() <= valor_disponivel
+    assert solucao.importancia <= otimo + 1e-9
+    if solucao.limitante_superior is not None:
+        assert solucao.limitante_superior >= otimo - 1e-9
+
+
+@pytest.mark.parametrize("dimensao", [ADP.DIMENSAO_VALOR, ADP.DIMENSAO_IMPORTANCIA])
+@pytest.mark.parametrize("divisao", [False, True])
+def test_fronteira_coincide_com_programacao_dinamica(dimensao, divisao):
+    gerador = np.random.default_rng(3)
+    valor = gerador.integers(1, 50, 200).astype(np.float64)
+    importancia = gerador.integers(0, 50, 200).astype(np.float64)
+    valor_disponivel = 300.0
+    instancia = InstanciaKnapsack(importancia, valor)
+    orcamentos = [0.0, 17.0, 60.0, 150.0, 299.0, 300.0]
+
+    solver = ADP(valor_disponivel, instancia)
+    limite_memoria = 256 * 2 ** 20
+    if divisao:
+        # O limite comporta as três linhas da divisão e conquista, mas não a matriz de decisões.
+        solver.fronteira(orcamentos, dimensao=dimensao)
+        tamanho = solver.estatisticas.contadores["celulas_tabela"] // len(instancia)
+        limite_memoria = 30 * tamanho
+    fronteira = solver.fronteira(orcamentos, dimensao=dimensao, limite_memoria=limite_memoria)
+
+    assert solver.estatisticas.contadores["modo"] == (ADP.MODO_DIVISAO if divisao else ADP.MODO_TABELA)
+    for orcamento in orcamentos:
+        solucao = fronteira.solucao(orcamento)
+        otimo = _otimo(importancia, valor, orcamento)
+        assert fronteira.importancia_maxima(orcamento) == pytest.approx(otimo)
+        assert solucao.importancia == pytest.approx(otimo)
+        assert valor[solucao.selecionados].sum() <= orcamento
+
+
+def test_sessao_acompanha_as_alteracoes():
+    importancia, valor, valor_disponivel = INSTANCIAS[5]
+    sessao = SessaoKnapsack(valor_disponivel, InstanciaKnapsack(importancia, valor))
+    for tipo in (KnapsackSolverFactory.ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER,
+                 KnapsackSolverFactory.BRANCH_AND_BOUND_KNAPSACK_SOLVER):
+        sessao.solucionar(tipo)
+
+    sessao.adicionar(90.0, 5.0, chave=1000)
+    sessao.remover(0)
+    sessao.atualizar(1, importancia=1.0, valor=2.0)
+    sessao.definir_orcamento(valor_disponivel * 0.8)
+    importancia = sessao.itens.importancia.to_numpy(dtype=np.float64)
+    valor = sessao.itens.valor.to_numpy(dtype=np.float64)
+    for tipo in (KnapsackSolverFactory.ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER,
+                 KnapsackSolverFactory.BRANCH_AND_BOUND_KNAPSACK_SOLVER):
+        _verificar_otima(sessao.solucionar(tipo), importancia, valor, sessao.valor_disponivel)
+
+
+@pytest.mark.parametrize("limite_memoria", [64 * 2 ** 20, 40 * BYTES_POR_CANDIDATO])
+def test_fluxo_certifica_a_reducao(limite_memoria):
+    gerador = np.random.default_rng(7)
+    valor = gerador.integers(1, 100, 300).astype(np.float64)
+    importancia = gerador.integers(0, 100, 300).astype(np.float64)
+    valor_disponivel = 800.0
+    lotes = [(importancia[inicio:inicio + 50], valor[inicio:inicio + 50]) for inicio in range(0, 300, 50)]
+    solucao = solucionar_fluxo(iter(lotes), valor_disponivel, limite_memoria=limite_memoria)
+    otimo = _otimo(importancia, valor, valor_disponivel)
+
+    assert valor[solucao.indices].sum() <= valor_disponivel
+    assert solucao.importancia == pytest.approx(importancia[solucao.indices].sum())
+    assert solucao.importancia <= otimo + 1e-9 <= solucao.limitante_superior + 2e-9
+    if limite_memoria >= 300 * BYTES_POR_CANDIDATO:
+        assert solucao.importancia == pytest.approx(otimo)
+
+
+VAZIA = InstanciaKnapsack(np.zeros(0), np.zeros(0))
+
+SOLUCOES_VAZIAS = {
+    "tabu_paralela": lambda: TabuSearchKnapsackSolver(10.0, VAZIA).solucionar_paralelo(timeout=1),
+    "branch_and_bound_paralelo": lambda: BranchAndBoundKnapsackSolver(10.0, VAZIA).solucionar_paralelo(processos=2),
+    "fronteira": lambda: ADP(10.0, VAZIA).fronteira([5.0, 10.0]).solucao(10.0),
+    **{str(tipo): lambda tipo=tipo: KnapsackSolverFactory.get_solver(tipo, 10.0, VAZIA).solucionar()
+       for tipo in (KnapsackSolverFactory.DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER,
+                    KnapsackSolverFactory.BRANCH_AND_BOUND_KNAPSACK_SOLVER,
+                    KnapsackSolverFactory.GREEDY_KNAPSACK_SOLVER,
+                    KnapsackSolverFactory.ADAPTIVE_DYNAMIC_PROGRAMMING_KNAPSACK_SOLVER,
+                    KnapsackSolverFactory.AUTO_KNAPSACK_SOLVER,
+                    KnapsackSolverFactory.FPTAS_KNAPSACK_SOLVER)},
+}
+
+
+@pytest.mark.parametrize("nome", SOLUCOES_VAZIAS)
+def test_instancia_vazia(nome):
+    solucao = SOLUCOES_VAZIAS[nome]()
+
+    assert len(solucao) == 0
+    assert solucao.importancia == 0
+    assert solucao.valor == 0
+
+
+@pytest.mark.parametrize("requisicao", [
+    {"valor_disponivel": math.nan, "itens": {"importancia": [1.0], "valor": [1.0]}},
+    {"valor_disponivel": "inf", "itens": {"importancia": [1.0], "valor": [1.0]}},
+    {"valor_disponivel": 10.0, "itens": {"importancia": [math.nan], "valor": [1.0]}},
+    {"valor_disponivel": 10.0, "itens": {"importancia": [1.0], "valor": [math.inf]}},
+    {"valor_disponivel": 10.0, "prazo": math.nan, "itens": {"importancia": [1.0], "valor": [1.0]}},
+])
+def test_servico_rejeita_valores_nao_finitos(requisicao):
+    with pytest.raises(ErroServico) as erro:
+        ServicoKnapsack(processos=1)._interpretar(requisicao)
+
+    assert erro.value.status == 400